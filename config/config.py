@@ -3,6 +3,9 @@ import json
 # from google_flight_analysis.flight import Flight
 # from flight_tracker.tracked_flight import TrackedFlight
 
+# Repo root: files the scraper reads and writes are resolved from it, so it also runs from another working directory
+# (the Telegram bot runs from src/telegram_bot)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 if os.getenv("ENV", "local") == 'production' or os.getenv("GITHUB_ACTIONS") == "true":
     env = 'production'
@@ -66,6 +69,41 @@ class ExplorerConfig:
         self.COUNTRY_TRIP = False  # If True, return from any city in the country are considered
 
 
+class ScraperConfig:
+    def __init__(self):
+        self.ENV = env
+
+        self.POOL_SIZE = 3                  # How many Chrome instances (and parallel scraping workers) the driver pool keeps alive
+        self.MAX_PAGES_PER_DRIVER = 40      # Recycle a driver after this many scraped queries
+        self.WARM_UP_URL = 'https://www.google.com/travel/flights?hl=en&curr=EUR'
+
+        self.QUERY_TIMEOUT = 45             # Seconds before a page load is given up
+        self.WORKER_WAIT = (0.5, 2)         # Random wait (min, max seconds) of each worker between two queries
+        self.READY_TIMEOUT = 15             # Seconds to wait for a page to show its results, "No results" or the consent dialog
+        self.READY_QUIET = 0.3              # Seconds without DOM changes after which the results list counts as complete
+
+        self.NETWORK_CAPTURE = False        # Read results from the GetShoppingResults response instead of waiting for the DOM
+        self.NETWORK_TIMEOUT = 10           # Seconds to wait for that response before falling back to the DOM
+        self.PRICE_CALENDAR = False         # Pre-screen discovery days on the price calendar of each route, full scrapes only for cheap days
+        self.HTTP_FETCH = False             # Fetch the server-rendered result pages over HTTP first, Chrome only renders pages without results
+        self.PUSH_FILTERS = False           # Also push max price, max duration and hour windows into the query URLs (reverse-engineered tfs
+                                            # fields, not verified against live pages). Otherwise they are applied to the results
+
+        self.BLOCK_RESOURCES = True         # Block the resources below in every driver, pages are only read as text
+        self.BLOCKED_RESOURCES = [
+            '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',      # Images, logos
+            '*.woff', '*.woff2', '*.ttf', '*fonts.gstatic.com*',                   # Fonts
+            '*/maps/vt*', '*maps.googleapis.com*', '*khms*.google.com*',           # Map tiles of the explore page
+            '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*/gen_204*', '*play.google.com/log*',
+        ]
+        self.RESOURCE_ALLOWLIST = []        # URLs that must keep loading, blocked patterns matching them are not applied
+
+        self.HTML_BACKEND = 'auto'          # Parser of explore page sources: 'selectolax', 'lxml', 'bs4' or 'auto' (fastest installed)
+
+        self.CACHE_PATH = os.path.join(ROOT_DIR, 'data/cache/results_cache.sqlite')
+        self.CACHE_TTL_HOURS = 6            # Scraped results are reused for this long (0 disables the cache)
+
+
 class ReporterConfig:
     def __init__(self):
         self.ENV = env
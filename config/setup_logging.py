@@ -1,6 +1,11 @@
 import logging, logging.config, logging.handlers
+import os
 
-logging.config.fileConfig('config/logging.conf')
+from config.config import ROOT_DIR
+
+# Log files are written to <repo>/logging whatever the working directory
+logging.config.fileConfig(os.path.join(ROOT_DIR, 'config', 'logging.conf'),
+                          defaults={'log_dir': os.path.join(ROOT_DIR, 'logging').replace('\\', '/')})
 
 root = logging.getLogger()
 file_handler = next((h for h in root.handlers if isinstance(h, logging.FileHandler)), None)
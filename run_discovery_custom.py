@@ -3,15 +3,19 @@ This script runs a custom flight discovery and reporting workflow based on jobs
 It performs the following steps for each custom job:
 1. Loads configuration and initializes logging.
 2. Reads custom job definitions from 'config/custom_jobs.json'.
-3. For each job:
+3. For each job, calculates the search window in weeks and requests a search for every leg (outbound and return) and specified day.
+   The `QueryPlanner` merges the overlapping searches of all jobs into as few multi-airport queries as possible.
+4. Scrapes the planned queries in parallel on a shared driver pool (see `ScraperConfig`). With `PRICE_CALENDAR`, the days
+   of every route are first pre-screened on its price calendar and only the days under the job threshold are scraped.
+5. For each job:
     - Initializes a Discovery object and a CustomBargainReporter.
-    - Calculates the search window in weeks and iterates through each week.
-    - For each leg (outbound and return), scrapes flight data for specified days, filters results by price and trip duration, and aggregates candidates.
-    - Combines outbound and return flights to form round-trip combinations, filtering by total price.
-    - Creates Bargain objects for each valid combination and adds them to the discovery.
-    - Saves discovered bargains to a JSON file and sends a report via email.
-    - Waits a random interval between jobs to simulate human behavior.
-4. Logs the completion of all jobs.
+    - Tags the results of the job with their leg and week in a single vectorized pass (see `engine`).
+    - Filters them by price and trip duration.
+    - Combines outbound and return flights of every week into round trips within the price threshold, returning after
+      the outbound arrival and within the optional `min_stay_days`/`max_stay_days` of the job (see `combine_round_trips`).
+    - Adds the valid combinations to the bargains table of the discovery.
+    - Saves discovered bargains to the bargains store (`data/bargains.sqlite`) and sends a report via email.
+6. Logs the completion of all jobs.
 Modules used:
 - datetime, json, pandas
 - Custom modules for configuration, logging, scraping, discovery, and reporting
@@ -21,10 +25,12 @@ import datetime as dt
 import json
 import pandas as pd
 
-from config.config import BargainFinderConfig
+from config.config import BargainFinderConfig, ScraperConfig
 from config.setup_logging import init_logger
+from src.bargain_discovery.bargains_store import BargainsStore
 from src.bargain_discovery.discoverer import Discovery
-from src.bargain_discovery.bargain import Bargain
+from src.bargain_discovery.engine import assign_legs, bargain_records, find_bargains
+from src.bargain_discovery.planner import QueryPlanner
 from src.google_flight_analysis.human_simulations import *
 from src.google_flight_analysis.scrape import *
 from src.report.report import CustomBargainReporter
@@ -39,80 +45,50 @@ if conf.ENV == 'production':
 elif conf.ENV == 'local':
     logger.info('Running Discovery locally!')
 
+# Bargains used to be saved as data/bargains*.json files, move them to the store once (kept as *.json.migrated)
+BargainsStore().migrate_json()
+
 with open(f"config/custom_jobs.json", "r", encoding="utf-8") as f:
     custom_jobs = json.load(f)
 
+# Plan the searches of every job first, so overlapping searches are scraped once and in parallel
+today_date = dt.date.today()
+planner = QueryPlanner()
 for job in custom_jobs:
-    discovery = Discovery()
-    reporter = CustomBargainReporter(job)
-    logger.info(f'Starting job {job["name"]}...')
-
-    today_date = dt.date.today()
-    day_start = dt.date.fromisoformat(job["days_search"][0])
-    day_stop = dt.date.fromisoformat(job["days_search"][1])
-
-    start_isoweek = dt.date.isocalendar(day_start).week
-    stop_isoweek = dt.date.isocalendar(day_stop).week
-    weeks_search = stop_isoweek - start_isoweek + 1
-
-    start_weekday = dt.date.weekday(day_start)  # 0 is Monday, 6 is Sunday
-    delta_to_start = dt.timedelta(days=-start_weekday)
-    date_ref = day_start + delta_to_start  # Starts on a Monday
+    planner.add_custom_job(job, today_date)
 
-    airports_origin = job['airports'][0]
-    airports_dest = job['airports'][1]
-    days_search = job['days_availability']    
+with DriverPool(conf.ENV, headless=True) as pool:
+    if ScraperConfig().PRICE_CALENDAR:  # One calendar page per route, full scrapes only for the days that can be bargains
+        ScrapeObjects(planner.calendars(Scrape), conf.ENV, pool=pool)
+        planner.prescreen()
+    ScrapeObjects(planner.plan(Scrape), conf.ENV, pool=pool)
 
-    for week in range(weeks_search):
-        week_str = f'{date_ref.isoformat()} to {(date_ref + dt.timedelta(6)).isoformat()}'
-        logger.info(f'Checking week {week_str}')
+# Every scraped flight of all jobs in one frame, each job picks its legs and weeks from it
+results_df = planner.results()
 
-        candidates_df = [pd.DataFrame() for _ in range(2)]
-        for leg,days in enumerate(days_search): 
-            for day in days:
-                day_date = date_ref + dt.timedelta(days=day-1)
-                if day_date < today_date:
-                    logger.warning(f"Date {day_date.isoformat()} is in the past --> Skipping.")
-                    continue
-                if leg == 0:
-                    result = Scrape(airports_origin, airports_dest, day_date.isoformat())
-                elif leg == 1:
-                    result = Scrape(airports_dest, airports_origin, day_date.isoformat())
-                ScrapeObjects(result, conf.ENV, headless=True)
-                result_df = result.data
-                if result_df.empty:
-                    logger.warning(f"No results found for {day_date.isoformat()} --> Skipping.")
-                    continue
-                filter = ((result_df['Price'] < 0.9*job['price_threshold']) 
-                          & 
-                          (result_df['Arrival datetime'] - result_df['Departure datetime']
-                           < dt.timedelta(hours=job['max_trip_duration'])))
-                filtered_df = result_df [filter]
-                candidates_df[leg] = pd.concat([candidates_df[leg], filtered_df], axis=0)
-
-        if candidates_df[0].empty or candidates_df[1].empty:
-            logger.warning(f'  No candidates found for week {week_str} --> Skipping.')
-            date_ref += dt.timedelta(7)
-            continue
-        
-        combinations_df = candidates_df[0].merge(candidates_df[1], how='cross', suffixes=('_out', '_return'))
-        combinations_df['Total Price'] = combinations_df['Price_out'] + combinations_df['Price_return']
-
-        combinations_df = combinations_df[combinations_df['Total Price'] <= job['price_threshold']]
+for job in custom_jobs:
+    discovery = Discovery()
+    reporter = CustomBargainReporter(job)
+    logger.info(f'Starting job {job["name"]}...')
+    # Optional stay limits (in days) between the outbound arrival and the return departure
+    min_stay = dt.timedelta(days=job['min_stay_days']) if 'min_stay_days' in job else None
+    max_stay = dt.timedelta(days=job['max_stay_days']) if 'max_stay_days' in job else None
+
+    date_ref, weeks_search = QueryPlanner.custom_job_window(job)
+    legs_df = assign_legs(results_df, job['airports'], job['days_availability'], date_ref, weeks_search)
+    if legs_df.empty:
+        logger.warning(f'  No results found for job {job["name"]} --> Skipping.')
+    else:
+        combinations_df = find_bargains(legs_df.assign(Job=job['name']), job['price_threshold'],
+                                        job['max_trip_duration'], min_stay=min_stay, max_stay=max_stay)
+        for week_str, count in combinations_df.groupby('Week').size().items():
+            logger.info(f'  Found {count} combinations for week {week_str}')
+        discovery.add_bargains(bargain_records(combinations_df))
 
-        logger.info(f'  Found {len(combinations_df)} combinations for week {week_str}')
-        for idx in range(len(combinations_df)):
-            bargain = Bargain(combinations_df.iloc[idx,:], week_str, job['name'])
-            discovery.add_bargain(bargain)
-            
-        date_ref += dt.timedelta(7)
-        
     logger.info(f'Job {job["name"]} terminated successfully. Saving deals...')
-    discovery.save_bargains(file=f'bargains_{job["alias"]}.json')
+    discovery.save_bargains(alias=job['alias'])
     logger.info('Sending email...')
     reporter.send_report()
 
-    random_wait(min_sec=1, max_sec=5)
-
 logger.info('All custom jobs terminated successfully!')
 report_warnings(job = "Discovery Custom")
@@ -4,7 +4,7 @@ Workflow Steps:
 1. Initializes configuration, logger, tracker, and reporter.
 2. Logs the environment (production or local).
 3. Processes flights to track and remove, as specified in the configuration.
-4. Groups tracked flights and scrapes flight data for each group.
+4. Groups tracked flights and scrapes flight data for all groups in parallel, limited to their departure hours.
 5. Matches scraped flight data with tracked flights by departure time and updates tracking information.
 6. Saves the updated list of tracked flights.
 7. Sends a report of updated flights via email and notifies via Telegram.
@@ -27,7 +27,7 @@ from config.config import TrackerConfig
 from src.flight_tracker.tracker import Tracker
 from src.report.report import TrackerReporter
 from src.flight_tracker.tracked_flight import TrackedFlight
-from src.google_flight_analysis.scrape import Scrape, ScrapeObjects
+from src.google_flight_analysis.scrape import Scrape, DriverPool, iter_scrape
 from src.telegram_bot.utils import report_warnings
 
 conf = TrackerConfig()
@@ -56,6 +56,7 @@ for flight in conf.FLIGHTS_TO_REMOVE:
     tracker.delete_flight(tracked_flight)
 
 
+queries = {}
 for key, flights in tracker.group_flights().items():
     search_date = dt.date.fromisoformat(key[0])
     today = dt.date.today()
@@ -64,25 +65,30 @@ for key, flights in tracker.group_flights().items():
         for flight in flights:
             tracker.delete_flight(tracked_flight=flight)
         continue
+    # Only the departure hours of the tracked flights are kept (see Scrape.set_filters)
+    hours = [int(flight.time[:2]) for flight in flights]
+    result = Scrape(key[1], key[2], key[0]).set_filters(departure_window=(min(hours), min(max(hours) + 1, 24)))
+    queries[id(result)] = (key, flights, result)
+
+# Tracked flights are matched as each query completes, while the browsers load the next ones
+with DriverPool(conf.ENV, headless=False) as pool:
+    for result, result_df in iter_scrape([result for _, _, result in queries.values()], conf.ENV, pool=pool, release=True):
+        key, flights, _ = queries[id(result)]
+        logger.info(f'Checking {len(flights)} tracked flights for {key}')
+        if not result_df.shape[0]:
+            logger.warning(f"No results found for {key}")
+            continue
 
-    logger.info(f'Checking {len(flights)} tracked flights for {key}')
-    result = Scrape(key[1], key[2], key[0])
-    ScrapeObjects(result, conf.ENV, headless=False)
-    result_df = result.data
-    if not result_df.shape[0]:
-        logger.warning(f"No results found for {key}")
-        continue
-
-    for flight in flights:
-        match_df = result_df[result_df['Departure datetime'].dt.strftime('%H:%M') == flight.time]
-        if match_df.shape[0] == 1:
-            tracked_flight = TrackedFlight(match_df)
-            tracker.process_flight(tracked_flight=tracked_flight)
-
-        elif match_df.shape[0] == 0:
-            logger.warning(f"Could not find any matching flight for departure time {flight.time}")
-        else:
-            logger.warning(f"Two or more flights found for departure time {flight.time}")
+        for flight in flights:
+            match_df = result_df[result_df['Departure datetime'].dt.strftime('%H:%M') == flight.time]
+            if match_df.shape[0] == 1:
+                tracked_flight = TrackedFlight(match_df)
+                tracker.process_flight(tracked_flight=tracked_flight)
+
+            elif match_df.shape[0] == 0:
+                logger.warning(f"Could not find any matching flight for departure time {flight.time}")
+            else:
+                logger.warning(f"Two or more flights found for departure time {flight.time}")
 
 tracker.save_flights()
 logger.info('Tracker jobs terminated successfully!')
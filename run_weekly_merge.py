@@ -1,30 +1,83 @@
+import argparse
 import os
 import pandas as pd
 from config.setup_logging import init_logger
+from src.google_flight_analysis.dedup_index import DedupIndex
+from src.google_flight_analysis.master_dataset import MasterDataset
+from src.google_flight_analysis.results_store import ResultsStore
 
 logger = init_logger(__name__)
 
+RAW_PATH = "data/results/raw"
+PROCESSED_PATH = "data/results/processed"
+MASTER_INDEX = os.path.join(PROCESSED_PATH, "dedup_index.bin")
+
 
 def merge_weekly_data():
 
-    RAW_FILE = "data/results/raw/weekly_results.parquet"
-    PROCESSED_PATH = "data/results/processed"
-    MASTER_FILE = os.path.join(PROCESSED_PATH, "results.parquet")
+    store = ResultsStore(RAW_PATH)
+    master = MasterDataset(PROCESSED_PATH)
+    master_index = DedupIndex(MASTER_INDEX)
 
-    weekly_df = pd.read_parquet(RAW_FILE)
+    if master.migrate_legacy() or (not master_index.exists() and master.rows):  # One-off: results.parquet --> partitions
+        rebuild_master_index(master, master_index)
 
-    os.makedirs(PROCESSED_PATH, exist_ok=True)
+    raw_files = store.files()
+    if not raw_files:
+        logger.warning(f"No weekly results found in {RAW_PATH} --> Nothing to merge")
+        return True
+    weekly_df = store.read(raw_files)  # Partitioned files of the week (and the legacy single file if still present)
+
+    # Only fares the master dataset doesn't hold yet, written as new files (compacted once they pile up)
+    weekly_df = weekly_df[master_index.new_rows(weekly_df)]
+    master.append(weekly_df)
+    master_index.add(weekly_df)
+    master.wait()  # Compaction of the months that piled up small files
+    logger.info(f"Successfully merged {len(weekly_df)} new weekly results into {PROCESSED_PATH} ({master.rows} rows)")
+
+    store.clear(raw_files)
+    return True
+
+
+def rebuild_master_index(master, master_index):
+    master_df = master.read()
+    duplicated = pd.Series(DedupIndex.hash(master_df)).duplicated().to_numpy()
+    if duplicated.any():  # Drop duplicates already stored
+        logger.info(f"Dropping {duplicated.sum()} duplicated rows from {master.root}")
+        master_df = master_df[~duplicated]
+        master.rewrite(master_df)
+    master_index.rebuild(master_df)
 
-    if os.path.exists(MASTER_FILE):
-        master_df = pd.read_parquet(MASTER_FILE)
-        combined_df = pd.concat([master_df, weekly_df], ignore_index=True)
-    else:
-        combined_df = weekly_df
 
-    combined_df.to_parquet(MASTER_FILE, index=False)
-    logger.info(f"Successfully merged weekly database into {MASTER_FILE}")
+def rebuild_indexes():
+    store = ResultsStore(RAW_PATH)
+    if store.files():
+        store.rebuild_index()
+    master = MasterDataset(PROCESSED_PATH)
+    master.migrate_legacy()
+    rebuild_master_index(master, DedupIndex(MASTER_INDEX))
     return True
 
+
+def compact():
+    removed = MasterDataset(PROCESSED_PATH).compact(force=True)
+    logger.info(f"Compaction removed {removed} small files from {PROCESSED_PATH}")
+    return True
+
+
 if __name__ == "__main__":
-    if not merge_weekly_data():
+    parser = argparse.ArgumentParser(description="Merge the weekly scraped results into the master dataset.")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="Rebuild the dedup indexes of the weekly and master datasets (and drop master duplicates) instead of merging")
+    parser.add_argument("--compact", action="store_true",
+                        help="Compact the small files of every departure month instead of merging")
+    args = parser.parse_args()
+
+    if args.rebuild_index:
+        job = rebuild_indexes
+    elif args.compact:
+        job = compact
+    else:
+        job = merge_weekly_data
+    if not job():
         exit(1)
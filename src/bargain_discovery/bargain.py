@@ -1,6 +1,8 @@
 import pandas as pd
 
 from config.config import BargainFinderConfig
+from src.bargain_discovery.engine import BARGAIN_ATTRS
+from src.google_flight_analysis.flight import format_travel_time
 
 conf = BargainFinderConfig()
 
@@ -15,9 +17,20 @@ class Bargain():
         self.total_price = combination_df['Total Price']
 
 
+    def as_record(self) -> dict:
+        """Row of a Discovery bargains table (see engine.BARGAIN_SCHEMA)."""
+        record = {f'{attr}_{leg}': str(getattr(flight, attr))
+                  for leg, flight in (('out', self.ida), ('return', self.vuelta)) for attr in BARGAIN_ATTRS}
+        record['job'] = self.tocinillo
+        record['week'] = self.week
+        record['total_price'] = int(self.total_price)
+        record['new'] = self.new_bargain
+        record['price_change'] = self.price_change
+        return record
+
+
     def as_dict(self) -> dict:
-        attrs = ['date', 'origin', 'destination', 'time', 'travel_time', 'airline', 'stops', 'price']
-        bargain_dict = {attr: [str(getattr(self.ida, attr)), str(getattr(self.vuelta, attr))] for attr in attrs}
+        bargain_dict = {attr: [str(getattr(self.ida, attr)), str(getattr(self.vuelta, attr))] for attr in BARGAIN_ATTRS}
         bargain_dict['job'] = self.tocinillo
         bargain_dict['new'] = self.new_bargain
         bargain_dict['price_change'] = self.price_change
@@ -43,7 +56,7 @@ class BargainFlight():
         self.destination = flight_df[f'Destination_{leg}']
         self.date = flight_df[f'Departure datetime_{leg}'].strftime('%Y-%m-%d')
         self.time = flight_df[f'Departure datetime_{leg}'].strftime('%H:%M')
-        self.travel_time = flight_df[f'Travel_Time_{leg}']
+        self.travel_time = format_travel_time(flight_df[f'Travel_Time_{leg}'])
         self.airline = flight_df[f'Airline(s)_{leg}']
         self.stops = str(flight_df[f'Num_Stops_{leg}'])
         self.price = str(flight_df[f'Price_{leg}'])
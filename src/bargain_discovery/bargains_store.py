@@ -0,0 +1,165 @@
+import glob
+import json
+import os
+import sqlite3
+import uuid
+from contextlib import closing
+import pandas as pd
+
+from config.config import ROOT_DIR
+from config.setup_logging import init_logger
+from src.bargain_discovery.engine import BARGAIN_ATTRS, BARGAIN_SCHEMA
+
+__all__ = ['BargainsStore', 'MAIN_ALIAS']
+
+logger = init_logger(__name__)
+
+MAIN_ALIAS = 'main'  # Alias of the bargains of run_discovery (custom jobs use their own alias)
+
+_LEG_COLUMNS = [f'{attr}_{leg}' for leg in ('out', 'return') for attr in BARGAIN_ATTRS]
+# A bargain is the same round trip when all of these match, whatever its price
+_KEY_COLUMNS = ['alias', 'job', 'week', 'origin_out', 'destination_out', 'date_out', 'time_out',
+                'origin_return', 'destination_return', 'date_return', 'time_return']
+_COLUMNS = ['alias', 'job', 'week'] + _LEG_COLUMNS + ['total_price', 'new', 'price_change', 'run']
+
+_SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS bargains (
+    alias TEXT NOT NULL,
+    job TEXT NOT NULL,
+    week TEXT NOT NULL,
+    {', '.join(f'{col} TEXT NOT NULL' for col in _LEG_COLUMNS)},
+    total_price INTEGER NOT NULL,
+    new INTEGER NOT NULL DEFAULT 1,
+    price_change INTEGER NOT NULL DEFAULT 0,
+    run TEXT NOT NULL,
+    PRIMARY KEY ({', '.join(_KEY_COLUMNS)})
+);
+CREATE INDEX IF NOT EXISTS idx_bargains_alias_week_price ON bargains (alias, week, total_price);
+'''
+
+# New round trips are inserted as new, known ones get their price change against the stored price
+_UPSERT = f'''
+INSERT INTO bargains ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})
+ON CONFLICT ({', '.join(_KEY_COLUMNS)}) DO UPDATE SET
+    {', '.join(f'{col} = excluded.{col}' for col in _LEG_COLUMNS if col not in _KEY_COLUMNS)},
+    new = 0,
+    price_change = CASE
+        WHEN excluded.total_price < bargains.total_price THEN 1
+        WHEN excluded.total_price > bargains.total_price THEN 2
+        ELSE 0 END,
+    total_price = excluded.total_price,
+    run = excluded.run
+'''
+
+
+class BargainsStore:
+    """
+    SQLite store of the bargains of every discovery job, one row per round trip (see BARGAIN_SCHEMA).
+
+    Each job (`alias`) replaces its bargains with `upsert`: round trips already stored keep their row and get their
+    `price_change`, new ones are flagged as `new` and the ones not found anymore are deleted. Readers only load
+    the rows they ask for, through the (alias, week, total_price) index.
+
+    Usage:
+        store = BargainsStore()
+        store.upsert('psiista', bargains_df)
+        store.read('psiista', max_price=300, limit=30)
+    """
+    def __init__(self, path=os.path.join(ROOT_DIR, 'data/bargains.sqlite')):
+        self.path = path
+        self._ready = False
+
+
+    def __repr__(self):
+        return f"BargainsStore({self.path})"
+
+
+    def upsert(self, alias: str, bargains: pd.DataFrame) -> pd.DataFrame:
+        """Replace the bargains of `alias` by `bargains`. Returns them with the `new`/`price_change` flags of the store."""
+        run = uuid.uuid4().hex  # Rows not written by this run are expired
+        bargains = bargains[list(BARGAIN_SCHEMA)].astype(BARGAIN_SCHEMA)
+        # One row per round trip, the cheapest if it was found twice
+        bargains = bargains.sort_values('total_price', kind='stable').drop_duplicates(_KEY_COLUMNS[1:])
+
+        rows = bargains.assign(alias=alias, new=1, price_change=0, run=run)[_COLUMNS]
+        with closing(self._connect()) as con, con:
+            con.executemany(_UPSERT, rows.itertuples(index=False, name=None))
+            deleted = con.execute("DELETE FROM bargains WHERE alias = ? AND run <> ?", (alias, run)).rowcount
+        logger.info(f'Stored {len(rows)} bargains of {alias} ({deleted} expired)')
+        return self.read(alias)
+
+
+    def read(self, alias: str, week: str = None, max_price: int = None, limit: int = None, offset: int = 0) -> pd.DataFrame:
+        """Bargains of `alias` sorted by week, job and price, optionally filtered and paginated."""
+        query, params = "SELECT * FROM bargains WHERE alias = ?", [alias]
+        if week is not None:
+            query += " AND week = ?"
+            params.append(week)
+        if max_price is not None:
+            query += " AND total_price <= ?"
+            params.append(max_price)
+        query += " ORDER BY week, job, total_price"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+
+        with closing(self._connect()) as con:
+            df = pd.read_sql_query(query, con, params=params)
+        return df[list(BARGAIN_SCHEMA)].astype(BARGAIN_SCHEMA)
+
+
+    def aliases(self) -> list:
+        with closing(self._connect()) as con:
+            return [row[0] for row in con.execute("SELECT DISTINCT alias FROM bargains ORDER BY alias")]
+
+
+    def import_json(self, path: str, alias: str) -> int:
+        """Store the bargains of a legacy bargains JSON file as they were saved (keeping their flags). Returns the rows."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        rows = [{**combination, 'week': week['week']} for week in data for combination in week['combinations']]
+        if not rows:
+            return 0
+
+        df = pd.DataFrame(rows)
+        for attr in BARGAIN_ATTRS:
+            df[[f'{attr}_out', f'{attr}_return']] = pd.DataFrame(df.pop(attr).tolist(), index=df.index)
+        df = df[list(BARGAIN_SCHEMA)].astype(BARGAIN_SCHEMA).drop_duplicates(_KEY_COLUMNS[1:], keep='last')
+        rows = df.assign(alias=alias, run=uuid.uuid4().hex)[_COLUMNS]
+        rows = rows.astype({'new': int, 'price_change': int})
+
+        with closing(self._connect()) as con, con:
+            con.executemany(
+                f"INSERT OR REPLACE INTO bargains ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                rows.itertuples(index=False, name=None)
+            )
+        return len(rows)
+
+
+    def migrate_json(self, folder=os.path.join(ROOT_DIR, 'data')) -> int:
+        """
+        Move the legacy data/bargains*.json files into the store, once: each file is kept as `<file>.migrated`.
+        Files whose `.migrated` copy already exists are not imported again. Returns the files migrated.
+        """
+        migrated = 0
+        for path in sorted(glob.glob(os.path.join(folder, 'bargains*.json'))):
+            if os.path.exists(path + '.migrated'):
+                logger.warning(f'{path} was already migrated to {self.path}, skipping it')
+                continue
+            name = os.path.basename(path)[:-len('.json')]
+            alias = MAIN_ALIAS if name == 'bargains' else name[len('bargains_'):]
+            logger.info(f'Migrating {self.import_json(path, alias)} bargains of {path} to {self.path}')
+            os.rename(path, path + '.migrated')
+            migrated += 1
+        return migrated
+
+
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            with con:
+                con.executescript(_SCHEMA)
+            self._ready = True
+        return con
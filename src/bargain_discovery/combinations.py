@@ -0,0 +1,66 @@
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from config.setup_logging import init_logger
+
+__all__ = ['combine_round_trips']
+
+logger = init_logger(__name__)
+
+
+def combine_round_trips(out_df: pd.DataFrame, return_df: pd.DataFrame, max_price, min_stay: dt.timedelta = None,
+                        max_stay: dt.timedelta = None) -> pd.DataFrame:
+    """
+    Round trips (outbound + return flight) with a total price <= `max_price`, without building the full cross join.
+
+    Returns are sorted by price, so each outbound only looks at the returns within its remaining budget
+    (found with a binary search). Outbounds are visited from the cheapest, so that budget only shrinks and the
+    search stops at the first outbound that can't be combined with the cheapest return. Among those returns,
+    only the ones leaving after the outbound arrival, with a stay (return departure - outbound arrival) between
+    `min_stay` and `max_stay`, are kept.
+
+    The result has the columns of `out_df.merge(return_df, how='cross', suffixes=('_out', '_return'))`
+    plus 'Total Price'.
+    """
+    columns = [f'{col}_out' for col in out_df.columns] + [f'{col}_return' for col in return_df.columns] + ['Total Price']
+    if out_df.empty or return_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    out_order = np.argsort(out_df['Price'].to_numpy(), kind='stable')
+    return_order = np.argsort(return_df['Price'].to_numpy(), kind='stable')
+
+    out_prices = out_df['Price'].to_numpy()[out_order]
+    out_arrivals = out_df['Arrival datetime'].to_numpy()[out_order]
+    return_prices = return_df['Price'].to_numpy()[return_order]
+    return_departures = return_df['Departure datetime'].to_numpy()[return_order]
+
+    min_stay = np.timedelta64(min_stay or dt.timedelta(0))
+    max_stay = np.timedelta64(max_stay) if max_stay is not None else None
+
+    # Number of affordable returns for every outbound, non-increasing as outbounds get more expensive
+    budgets = np.searchsorted(return_prices, max_price - out_prices, side='right')
+
+    out_idx, return_idx = [], []
+    for i, k in enumerate(budgets):
+        if k == 0:
+            break
+        stay = return_departures[:k] - out_arrivals[i]
+        valid = stay >= min_stay
+        if max_stay is not None:
+            valid &= stay <= max_stay
+        matches = np.flatnonzero(valid)
+        out_idx.append(np.full(len(matches), out_order[i]))
+        return_idx.append(return_order[matches])
+
+    if not out_idx or not sum(len(idx) for idx in out_idx):
+        return pd.DataFrame(columns=columns)
+    out_idx, return_idx = np.concatenate(out_idx), np.concatenate(return_idx)
+
+    combinations_df = pd.concat([
+        out_df.iloc[out_idx].add_suffix('_out').reset_index(drop=True),
+        return_df.iloc[return_idx].add_suffix('_return').reset_index(drop=True),
+    ], axis=1)
+    combinations_df['Total Price'] = combinations_df['Price_out'] + combinations_df['Price_return']
+    logger.debug(f'{len(combinations_df)} round trips out of {len(out_df)}x{len(return_df)} flights')
+    return combinations_df
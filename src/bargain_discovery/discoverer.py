@@ -1,6 +1,5 @@
 import datetime as dt
 from itertools import groupby
-import json
 from matplotlib.dates import DateFormatter
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
@@ -10,93 +9,93 @@ import pandas as pd
 from config.config import BargainFinderConfig
 from config.setup_logging import init_logger
 from src.bargain_discovery.bargain import Bargain
+from src.bargain_discovery.bargains_store import BargainsStore, MAIN_ALIAS
+from src.bargain_discovery.engine import BARGAIN_ATTRS, BARGAIN_SCHEMA
 
 conf = BargainFinderConfig()
 logger = init_logger(__name__)
 
 class Discovery():
-    # TODO: Build a method to read barbains from JSON and convert appropriate attributes to int
+    """
+    Bargains found by a discovery run, kept as a single table with one row per round trip (see BARGAIN_SCHEMA).
 
-    def __init__(self):
-        self.bargains = []
+    Sorting and grouping by week are operations on that table, and the bargains are saved to (and read back from)
+    the BargainsStore, which flags the new bargains and the price changes against the previous run.
+    """
+    def __init__(self, store: BargainsStore = None):
+        self.bargains = self.empty_bargains()
+        self.store = store or BargainsStore()
+
+
+    @classmethod
+    def from_store(cls, alias: str = MAIN_ALIAS, store: BargainsStore = None, **filters):
+        """Discovery with the stored bargains of a job (filters as in BargainsStore.read)."""
+        discovery = cls(store)
+        discovery.bargains = discovery.store.read(alias, **filters)
+        return discovery
 
 
     # This defines which format the bargains are saved in
     def bargains_dict(self):
         bargains_dict = []
         for key, bargains in self.group_bargains().items():
-            combination_group = {
-                'week': key,
-                'combinations': []
-            }
-            for bargain in bargains:
-                combination_group['combinations'].append(bargain.as_dict())
-            bargains_dict.append(combination_group)
-
+            bargains_dict.append({'week': key, 'combinations': self.as_dicts(bargains)})
         return bargains_dict
 
 
     def add_bargain(self, bargain: Bargain):
-        self.bargains.append(bargain)
+        self.add_bargains(pd.DataFrame([bargain.as_record()]))
+
+
+    def add_bargains(self, records: pd.DataFrame):
+        """Add the bargains of a frame of engine.bargain_records."""
+        records = records[list(BARGAIN_SCHEMA)].astype(BARGAIN_SCHEMA)
+        self.bargains = pd.concat([self.bargains, records], ignore_index=True) if not self.bargains.empty else records
 
 
     def sort_bargains(self, custom_jobs=False):
-        if custom_jobs:
-            self.bargains = sorted(self.bargains, key=lambda f: (f.week, f.total_price))
-        else:
-            self.bargains = sorted(self.bargains, key=lambda f: (f.week, f.tocinillo, f.total_price))
+        by = ['week', 'total_price'] if custom_jobs else ['week', 'job', 'total_price']
+        self.bargains = self.bargains.sort_values(by, kind='stable', ignore_index=True)
 
 
     def group_bargains(self) -> dict:
         self.sort_bargains()
-        grouped_bargains = {key: list(group) 
-                           for key, group in groupby(self.bargains, key=lambda f: (f.week))}
-        return grouped_bargains
+        return {key: group for key, group in self.bargains.groupby('week', sort=True)}
     
 
     def group_bargains_by(self, bargain_list: list, by: str) -> dict:
         grouped_bargains = {key: list(group) 
                            for key, group in groupby(bargain_list, key=lambda f: (f[by]))}
         return grouped_bargains
-    
 
-    def check_new_bargains(self, file='bargains.json'):
-        path = 'data/' + file
-        if not os.path.exists(path):
-            with open(path, 'w') as f:
-                f.write('[]')
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        for key, new_bargains in self.group_bargains().items():  # every week
-            old_bargains = next((week['combinations'] for week in data if week['week'] == key), [])
-            old_bargain_prices = {}
-            for bargain in old_bargains:  # build compare price dictionary
-                k = Bargain.get_key(bargain)
-                old_bargain_prices[k] = int(bargain["total_price"])
-            for bargain in new_bargains:
-                k = Bargain.get_key(bargain)  # search each new bargain in the old-bargain price dictionary
-                if k not in old_bargain_prices:
-                    bargain.new_bargain = True
-                elif bargain.total_price < old_bargain_prices[k]:
-                    bargain.price_change = 1  # cheaper
-                elif bargain.total_price > old_bargain_prices[k]:
-                    bargain.price_change = 2  # more expensive
-                    
 
-    
-    def save_bargains(self, file='bargains.json'):
+    def save_bargains(self, alias: str = MAIN_ALIAS):
+        """Replace the stored bargains of the job, flagging the new ones and the price changes."""
         logger.info('Saving bargains...')
-        if file == 'bargains.json':
-            custom = False
-        else:
-            custom = True
-        self.sort_bargains(custom)
-        self.check_new_bargains(file)
-        with open(f"data/{file}", "w+") as file:
-            json.dump(self.bargains_dict(), file, indent=4)
+        self.bargains = self.store.upsert(alias, self.bargains)
+        self.sort_bargains(custom_jobs=alias != MAIN_ALIAS)
+
 
+    @staticmethod
+    def empty_bargains() -> pd.DataFrame:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in BARGAIN_SCHEMA.items()})
 
-    def generate_plot(self, from_json: bool = True, job=None):
+
+    @staticmethod
+    def as_dicts(bargains: pd.DataFrame) -> list:
+        """Bargains in the JSON format: one dict per round trip, with an [outbound, return] pair per flight field."""
+        out = pd.DataFrame({
+            attr: [list(pair) for pair in zip(bargains[f'{attr}_out'], bargains[f'{attr}_return'])]
+            for attr in BARGAIN_ATTRS
+        })
+        out['job'] = bargains['job'].to_numpy()
+        out['new'] = bargains['new'].to_numpy()
+        out['price_change'] = bargains['price_change'].to_numpy()
+        out['total_price'] = bargains['total_price'].astype(str).to_numpy()
+        return out.to_dict('records')
+
+
+    def generate_plot(self, job=None):
         out_folder = 'data/images/'
         weekday_abbreviations = ['L', 'M', 'X', 'J', 'V', 'S', 'D']
         if job:
@@ -108,11 +107,8 @@ class Discovery():
         
         out_path = os.path.join(out_folder, file_name + ".png")
 
-        if from_json:
-            path_json = os.path.join("data/", file_name + ".json")
-            with open(path_json, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
+        data = self.bargains_dict()
+        if data:
             fig, ax = plt.subplots()
 
             end_date = dt.datetime.today() + dt.timedelta(weeks=conf.WEEK_START)
@@ -207,4 +203,4 @@ class Discovery():
             return
         
         else:
-            logger.warning('Not implemented')
+            logger.warning('No bargains to plot')
@@ -0,0 +1,103 @@
+import datetime as dt
+import pandas as pd
+
+from config.setup_logging import init_logger
+from src.bargain_discovery.combinations import combine_round_trips
+
+__all__ = ['assign_legs', 'find_bargains', 'bargain_records', 'BARGAIN_ATTRS', 'BARGAIN_SCHEMA']
+
+logger = init_logger(__name__)
+
+# Per-leg fields of a bargain, as stored in the bargains JSON
+BARGAIN_ATTRS = ['date', 'origin', 'destination', 'time', 'travel_time', 'airline', 'stops', 'price']
+
+# Columns of a bargains table (one row per round trip), see Discovery
+BARGAIN_SCHEMA = {
+    **{f'{attr}_{leg}': str for leg in ('out', 'return') for attr in BARGAIN_ATTRS},
+    'job': str,
+    'week': str,
+    'total_price': 'int32',
+    'new': bool,
+    'price_change': 'int8',  # 0: same price, 1: cheaper, 2: more expensive
+}
+
+
+def assign_legs(results_df: pd.DataFrame, airports, days_search, date_ref: dt.date, weeks_search: int) -> pd.DataFrame:
+    """
+    Rows of `results_df` that belong to a search of `airports` on `days_search` (see BargainFinderConfig), tagged with
+    their 'Leg' (0 outbound, 1 return) and 'Week' ('YYYY-MM-DD to YYYY-MM-DD', weeks starting on `date_ref`).
+
+    Day numbers are relative to the Monday of the week (1 is Monday, 8 the next Monday). When the days of a leg span
+    a week or more, a date belongs to several weeks and its flights are tagged once for each of them.
+    """
+    if results_df.empty:
+        return results_df.assign(Leg=pd.Series(dtype='int8'), Week=pd.Series(dtype=str))
+
+    offset = (results_df['Departure datetime'].dt.normalize() - pd.Timestamp(date_ref)).dt.days
+    legs = []
+    for leg, (origins, dests) in enumerate([airports, airports[::-1]]):
+        route = results_df['Origin'].isin(origins) & results_df['Destination'].isin(dests)
+        for week in range(weeks_search):
+            mask = route & (offset - 7 * week + 1).isin(days_search[leg])
+            week_start = date_ref + dt.timedelta(7 * week)
+            legs.append(results_df[mask].assign(
+                Leg=leg,
+                Week=f'{week_start.isoformat()} to {(week_start + dt.timedelta(6)).isoformat()}',
+            ))
+    return pd.concat(legs, ignore_index=True)
+
+
+def find_bargains(legs_df: pd.DataFrame, price_threshold, max_travel_hours, min_stay: dt.timedelta = None,
+                  max_stay: dt.timedelta = None, by=('Job', 'Week')) -> pd.DataFrame:
+    """
+    Round trips of every group of `legs_df` (one group per traveller and week by default) within `price_threshold`.
+    Legs are pre-filtered on price and travel duration, then combined with combine_round_trips.
+    """
+    by = list(by)
+    eligible = legs_df[
+        (legs_df['Price'] < 0.9 * price_threshold)
+        & (legs_df['Arrival datetime'] - legs_df['Departure datetime'] < dt.timedelta(hours=max_travel_hours))
+    ]
+
+    combinations = []
+    for key, group in eligible.groupby(by, sort=True):
+        legs = [group[group['Leg'] == leg].drop(columns=by + ['Leg']) for leg in (0, 1)]
+        combinations_df = combine_round_trips(*legs, price_threshold, min_stay=min_stay, max_stay=max_stay)
+        if not combinations_df.empty:
+            combinations.append(combinations_df.assign(**dict(zip(by, key))))
+
+    if not combinations:
+        return pd.DataFrame(columns=by + ['Total Price'])
+    return pd.concat(combinations, ignore_index=True)
+
+
+def bargain_records(combinations_df: pd.DataFrame, job_col: str = 'Job', week_col: str = 'Week') -> pd.DataFrame:
+    """Bargain fields of every combination, formatted as in the bargains JSON ('{attr}_out', '{attr}_return', ...)."""
+    if combinations_df.empty:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in BARGAIN_SCHEMA.items()})
+
+    records = pd.DataFrame(index=combinations_df.index)
+    for leg in ('out', 'return'):
+        departure = combinations_df[f'Departure datetime_{leg}']
+        records[f'date_{leg}'] = departure.dt.strftime('%Y-%m-%d')
+        records[f'origin_{leg}'] = combinations_df[f'Origin_{leg}'].astype(str)
+        records[f'destination_{leg}'] = combinations_df[f'Destination_{leg}'].astype(str)
+        records[f'time_{leg}'] = departure.dt.strftime('%H:%M')
+        records[f'travel_time_{leg}'] = _format_travel_times(combinations_df[f'Travel_Time_{leg}'])
+        records[f'airline_{leg}'] = combinations_df[f'Airline(s)_{leg}'].astype(str)
+        records[f'stops_{leg}'] = combinations_df[f'Num_Stops_{leg}'].astype(str)
+        records[f'price_{leg}'] = combinations_df[f'Price_{leg}'].astype(str)
+    records['job'] = combinations_df[job_col].astype(str)
+    records['week'] = combinations_df[week_col].astype(str)
+    records['total_price'] = combinations_df['Total Price']
+    records['new'] = False
+    records['price_change'] = 0
+    return records.astype(BARGAIN_SCHEMA).reset_index(drop=True)
+
+
+def _format_travel_times(travel_times: pd.Series) -> pd.Series:
+    # Vectorised format_travel_time: '2 hr 35 min', '2 hr' or '35 min'
+    minutes = (pd.to_timedelta(travel_times).fillna(pd.Timedelta(0)).dt.total_seconds() // 60).astype(int)
+    hours, minutes = minutes // 60, minutes % 60
+    text = (hours.astype(str) + ' hr ').where(hours > 0, '') + (minutes.astype(str) + ' min').where(minutes > 0, '')
+    return text.str.strip()
@@ -0,0 +1,286 @@
+import datetime as dt
+import pandas as pd
+
+from config.setup_logging import init_logger
+
+logger = init_logger(__name__)
+
+MAX_AIRPORTS = 7  # Google Flights accepts at most this many airports per side of a query
+CALENDAR_DAYS = 56  # Days covered by one price calendar query (the date grid shows about two months)
+
+
+class QueryRequest:
+    """
+    A (origins, destinations, date) search needed by a job. Its `data` is fanned out from the planned query that covers it.
+    Its `filters` (see Scrape.set_filters) are pushed into the planned query, loosened to fit every request it covers.
+    """
+    def __init__(self, origins, dests, date: str, filters: dict = None):
+        self.origin = sorted(set(origins))
+        self.dest = sorted(set(dests))
+        self.date = [date]
+        self.filters = dict(filters or {})
+        self.planned = None
+
+
+    def __repr__(self):
+        return f"QueryRequest({self.date[0]}: {self.origin} --> {self.dest})"
+
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self.planned is None or self.planned.data.empty:
+            return pd.DataFrame()
+        df = self.planned.data
+        return df[df['Origin'].isin(self.origin) & df['Destination'].isin(self.dest)]
+
+
+class PlannedQuery:
+    """A multi-airport query scraped once on behalf of all the requests it covers."""
+    def __init__(self, origins, dests, date: str):
+        self.origins = frozenset(origins)
+        self.dests = frozenset(dests)
+        self.date = date
+        self.requests = []
+        self.filters = {}
+        self.query = None
+
+
+    def __repr__(self):
+        return f"PlannedQuery({self.date}: {sorted(self.origins)} --> {sorted(self.dests)}, {len(self.requests)} requests)"
+
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self.query is None:
+            return pd.DataFrame()
+        return self.query.data
+
+
+    def covers(self, request: QueryRequest) -> bool:
+        return request.date[0] == self.date and self.origins.issuperset(request.origin) and self.dests.issuperset(request.dest)
+
+
+class QueryPlanner:
+    """
+    Collects every search needed by the discovery jobs before scraping, merges them into the smallest set of
+    multi-airport queries and fans the results back out to each request.
+
+    Two searches on the same date are merged when one contains the other, or when they share the same origins
+    (or destinations), since the union then asks for exactly the same routes. Searches are never merged into a
+    query that would return routes nobody asked for.
+
+    Usage:
+        planner = QueryPlanner()
+        request = planner.add(['AGP'], ['HAM', 'BRE'], '2026-11-05')
+        ScrapeObjects(planner.plan(Scrape), conf.ENV, pool=pool)
+        request.data  # results of the planned query restricted to AGP --> HAM/BRE
+
+    With ScraperConfig.PRICE_CALENDAR, the days of every route are pre-screened on its price calendar first:
+        ScrapeObjects(planner.calendars(Scrape), conf.ENV, pool=pool)
+        planner.prescreen()  # drops the requests of days with no fare under their max_price
+    """
+    def __init__(self):
+        self.requests = []
+        self.planned = []
+        self.calendar_queries = {}
+
+
+    def add(self, origins, dests, date: str, **filters) -> QueryRequest:
+        request = QueryRequest(origins, dests, date, filters)
+        self.requests.append(request)
+        return request
+
+
+    def add_custom_job(self, job: dict, today_date: dt.date = None) -> dict:
+        """Requests of a job from config/custom_jobs.json, as {week_str: ([outbound requests], [return requests])}."""
+        date_ref, weeks_search = self.custom_job_window(job)
+        filters = self.search_filters(job['price_threshold'])
+        return self._add_weeks(job['airports'], job['days_availability'], date_ref, weeks_search, today_date, filters)
+
+
+    def add_bargain_finder(self, conf, today_date: dt.date = None) -> dict:
+        """Requests of the BargainFinderConfig travellers, as {(week_str, traveller): ([outbound requests], [return requests])}."""
+        date_ref = self.bargain_finder_window(conf, today_date)
+
+        requests = {}
+        for tocinillo, airports, days_search in self.bargain_finder_travellers(conf):
+            weeks = self._add_weeks(airports, days_search, date_ref, conf.WEEKS_SEARCH, today_date,
+                                    self.search_filters(conf.PRICE_THRESHOLD))
+            requests.update({(week_str, tocinillo): legs for week_str, legs in weeks.items()})
+        return requests
+
+
+    @staticmethod
+    def custom_job_window(job: dict) -> tuple:
+        """(first Monday, number of weeks) searched by a custom job."""
+        day_start = dt.date.fromisoformat(job["days_search"][0])
+        day_stop = dt.date.fromisoformat(job["days_search"][1])
+        date_ref = day_start - dt.timedelta(days=dt.date.weekday(day_start))  # Starts on a Monday
+        return date_ref, (day_stop - date_ref).days // 7 + 1
+
+
+    @staticmethod
+    def bargain_finder_window(conf, today_date: dt.date = None) -> dt.date:
+        """First Monday searched by the BargainFinderConfig travellers."""
+        today_date = today_date or dt.date.today()
+        return today_date + dt.timedelta(days=(-dt.date.weekday(today_date) + 7*(conf.WEEK_START + 1)))
+
+
+    @staticmethod
+    def search_filters(price_threshold) -> dict:
+        """
+        Filters of a leg search: the price filter of engine.find_bargains (see Scrape.set_filters).
+        The travel duration is left to find_bargains, which compares local arrival and departure times while
+        Google filters on the true flight duration (they differ by the time zone change of the route).
+        """
+        return {'max_price': int(0.9 * price_threshold)}
+
+
+    @staticmethod
+    def bargain_finder_travellers(conf) -> list:
+        return [('Pilar', conf.AIRPORTS_PILAR, conf.DAYS_PILAR), ('David', conf.AIRPORTS_DAVID, conf.DAYS_DAVID)]
+
+
+    def plan(self, make_query) -> list:
+        """Merge the collected requests and build one query per planned search with `make_query(origins, dests, date)`."""
+        self.planned = []
+        by_date = {}
+        for request in self.requests:
+            by_date.setdefault(request.date[0], []).append(request)
+
+        for date, requests in sorted(by_date.items()):
+            for origins, dests in self._merge({(frozenset(r.origin), frozenset(r.dest)) for r in requests}):
+                self.planned.append(PlannedQuery(origins, dests, date))
+
+        for request in self.requests:
+            planned = next(p for p in self.planned if p.covers(request))
+            planned.requests.append(request)
+            request.planned = planned
+
+        for planned in self.planned:
+            planned.filters = self._loosest([request.filters for request in planned.requests])
+            planned.query = make_query(sorted(planned.origins), sorted(planned.dests), planned.date)
+            if planned.filters:
+                planned.query.set_filters(**planned.filters)
+
+        logger.info(f'Planned {len(self.planned)} queries for {len(self.requests)} requested searches')
+        return [planned.query for planned in self.planned]
+
+
+    def calendars(self, make_query) -> list:
+        """
+        One price calendar query per route and CALENDAR_DAYS of requested dates, built with
+        `make_query(origins, dests, date).calendar(date_to)`. Filters are not pushed, so the calendar price of
+        a day is never above the cheapest flight its requests could find.
+        """
+        by_route = {}
+        for request in self.requests:
+            by_route.setdefault((tuple(request.origin), tuple(request.dest)), set()).add(request.date[0])
+
+        self.calendar_queries = {}
+        for (origins, dests), dates in sorted(by_route.items()):
+            dates = sorted(dates)
+            while dates:
+                date_to = (dt.date.fromisoformat(dates[0]) + dt.timedelta(days=CALENDAR_DAYS - 1)).isoformat()
+                query = make_query(list(origins), list(dests), dates[0]).calendar(date_to)
+                self.calendar_queries.setdefault((origins, dests), []).append(query)
+                dates = [date for date in dates if date > date_to]
+
+        logger.info(f'Planned {sum(map(len, self.calendar_queries.values()))} price calendar queries for {len(by_route)} routes')
+        return [query for queries in self.calendar_queries.values() for query in queries]
+
+
+    def prescreen(self) -> int:
+        """
+        Drop the requests of days whose calendar price is above their `max_price` filter, before `plan`.
+        Days missing from the calendars (or requests without max_price) are kept. Returns the requests dropped.
+        """
+        prices = {}
+        for route, queries in self.calendar_queries.items():
+            for query in queries:
+                if not query.data.empty:
+                    prices.update({(route, date): price for date, price in zip(query.data['Date'], query.data['Price'])})
+
+        kept = []
+        for request in self.requests:
+            price = prices.get(((tuple(request.origin), tuple(request.dest)), request.date[0]))
+            max_price = request.filters.get('max_price')
+            if price is None or max_price is None or price <= max_price:
+                kept.append(request)
+
+        dropped = len(self.requests) - len(kept)
+        self.requests = kept
+        logger.info(f'Price calendars pre-screened out {dropped} of {dropped + len(kept)} requested searches')
+        return dropped
+
+
+    def results(self) -> pd.DataFrame:
+        """Results of all the planned queries in one frame (each scraped flight once)."""
+        frames = [planned.data for planned in self.planned if not planned.data.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+    def _add_weeks(self, airports, days_search, date_ref, weeks_search, today_date=None, filters=None) -> dict:
+        today_date = today_date or dt.date.today()
+        requests = {}
+        for week in range(weeks_search):
+            week_str = f'{date_ref.isoformat()} to {(date_ref + dt.timedelta(6)).isoformat()}'
+            requests[week_str] = ([], [])
+            for leg, days in enumerate(days_search):
+                for day in days:
+                    day_date = date_ref + dt.timedelta(days=day-1)
+                    if day_date < today_date:
+                        logger.warning(f"Date {day_date.isoformat()} is in the past --> Skipping.")
+                        continue
+                    if leg == 0:
+                        request = self.add(airports[0], airports[1], day_date.isoformat(), **(filters or {}))
+                    elif leg == 1:
+                        request = self.add(airports[1], airports[0], day_date.isoformat(), **(filters or {}))
+                    requests[week_str][leg].append(request)
+            date_ref += dt.timedelta(7)
+        return requests
+
+
+    @staticmethod
+    def _loosest(filters: list) -> dict:
+        # Filters of a query shared by several requests: only the ones all of them set, relaxed to let every result through
+        keys = set.intersection(*(set(f) for f in filters)) if filters else set()
+        loosest = {}
+        for key in keys:
+            values = [f[key] for f in filters]
+            if key in ('departure_window', 'arrival_window'):
+                loosest[key] = (min(v[0] for v in values), max(v[1] for v in values))
+            elif key == 'airlines':
+                loosest[key] = sorted(set().union(*values))
+            else:
+                loosest[key] = max(values)
+        return loosest
+
+
+    @staticmethod
+    def _merge(searches: set) -> list:
+        searches = set(searches)
+        merged = True
+        while merged:
+            merged = False
+            # Drop searches that are contained in another one
+            for a in list(searches):
+                if any(b != a and b[0] >= a[0] and b[1] >= a[1] for b in searches):
+                    searches.discard(a)
+                    merged = True
+
+            # Merge searches sharing one side, the union asks for exactly the same routes
+            for a in sorted(searches, key=lambda s: (sorted(s[0]), sorted(s[1]))):
+                for b in sorted(searches, key=lambda s: (sorted(s[0]), sorted(s[1]))):
+                    if a == b or a not in searches or b not in searches:
+                        continue
+                    if a[0] == b[0] and len(a[1] | b[1]) <= MAX_AIRPORTS:
+                        union = (a[0], a[1] | b[1])
+                    elif a[1] == b[1] and len(a[0] | b[0]) <= MAX_AIRPORTS:
+                        union = (a[0] | b[0], a[1])
+                    else:
+                        continue
+                    searches -= {a, b}
+                    searches.add(union)
+                    merged = True
+        return sorted(searches, key=lambda s: (sorted(s[0]), sorted(s[1])))
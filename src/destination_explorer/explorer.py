@@ -1,7 +1,6 @@
 import datetime as dt
 import json
 import pandas as pd
-import re
 
 from config.setup_logging import init_logger
 from src.google_flight_analysis.airport import Airport
@@ -93,24 +92,8 @@ class Explorer:
                 'Num_Stops': 'Stops',
             }
             cols_select = ['City', 'Price', 'Travel_Time', 'Num_Stops']
-            def parse_flight_time(time_str):
-                hours = 0
-                minutes = 0
-                if time_str:
-                    match = re.search(r"(?:(\d+)\s*hr)?\s*(?:(\d+)\s*min)?", time_str)
-                    if match:
-                        if match.group(1):
-                            hours = int(match.group(1))
-                        if match.group(2):
-                            minutes = int(match.group(2))
-                    return dt.timedelta(hours=hours, minutes=minutes)
-                else:
-                    return None
-
             results_david['City'] = results_david['Origin'].apply(airp_helper.city_from_iata)
             results_pilar['City'] = results_pilar['Origin'].apply(airp_helper.city_from_iata)
-            results_david['Travel_Time'] = results_david['Travel_Time'].apply(parse_flight_time)
-            results_pilar['Travel_Time'] = results_pilar['Travel_Time'].apply(parse_flight_time)
 
             df_david = results_david[cols_select].rename(columns=rename_dict)
             df_pilar = results_pilar[cols_select].rename(columns=rename_dict)
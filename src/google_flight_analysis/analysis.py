@@ -1,12 +1,15 @@
 import numpy as np
 import os
 import pandas as pd
-import re
 import datetime as dt
 
 from config.setup_logging import init_logger
+from src.google_flight_analysis.results_store import ResultsStore
 
 logger = init_logger(__name__)
+results_store = ResultsStore()  # Thread-safe, scraper workers save concurrently
+# Columns a saved result needs, rows missing any of them are not saved
+KEY_COLUMNS = ['Departure datetime', 'Origin', 'Destination', 'Airline(s)', 'Travel_Time', 'Price', 'Num_Stops', 'Search Date']
 
 def save_results(flights_df: pd.DataFrame):
     # Remove unnecessary columns
@@ -14,24 +17,14 @@ def save_results(flights_df: pd.DataFrame):
     cols_to_delete = ['Layover', 'CO2 Emission (kg)', 'Emission Diff (%)', 'Arrival datetime']
     col_list = [col for col in col_list if col not in cols_to_delete]
     df = flights_df[col_list].copy()  # <-- .copy() to avoid SettingWithCopyWarning
-    df.dropna(inplace=True)
+    # Only rows missing a stored field, the converted prices (Price (€), Price ($)) are only set for some flights
+    df.dropna(subset=[col for col in KEY_COLUMNS if col in df.columns], inplace=True)
 
-    # Parse travel time to minutes
-    for i in range(len(df)):
-        hours = 0
-        minutes = 0
-        match = re.search(r"(?:(\d+)\s*hr)?\s*(?:(\d+)\s*min)?", df['Travel_Time'].iloc[i])
-        if match:
-            if match.group(1):
-                hours = int(match.group(1))
-            if match.group(2):
-                minutes = int(match.group(2))
-        df.at[df.index[i], 'travel_time_minutes'] = dt.timedelta(hours=hours, minutes=minutes).seconds // 60
-    df['travel_time_minutes'] = df['travel_time_minutes'].astype(int)
+    df['travel_time_minutes'] = (df['Travel_Time'].dt.total_seconds() // 60).astype(int)
 
     # Calculate days left until departure
     df['days_left'] = (pd.to_datetime(df.loc[:, 'Departure datetime']) - pd.to_datetime(df.loc[:, 'Search Date'])).dt.days
-    df.drop(columns=['Search Date', 'Travel_Time'], inplace=True)
+    df.drop(columns=['Travel_Time'], inplace=True)
 
     # Rename columns to snake_case
     rename_dict = {
@@ -44,42 +37,6 @@ def save_results(flights_df: pd.DataFrame):
     }
     df.rename(columns=rename_dict, inplace=True)
 
-    # Ensure output directories exist
-    parquet_dir = 'data/results/raw'
-    preview_csv_path = os.path.join(parquet_dir, 'preview.csv')
-    parquet_path = os.path.join(parquet_dir, 'weekly_results.parquet')
-    os.makedirs(parquet_dir, exist_ok=True)
-
-    # Save result df to database
-    try:
-        existing_df = pd.read_parquet(parquet_path)
-        # Filter out rows where all columns except 'price_eur' are already present in existing_df
-        compare_cols = [col for col in df.columns if col != 'price_eur']
-        if not existing_df.empty:
-            # Only keep rows in df that are not duplicated in existing_df (excluding price_eur)
-            merged = df.merge(
-                existing_df[compare_cols],
-                on=compare_cols,
-                how='left',
-                indicator=True
-            )
-            df = merged.loc[merged['_merge'] == 'left_only', df.columns].copy()
-    except FileNotFoundError:
-        existing_df = pd.DataFrame()
-
-    updated_df = pd.concat([existing_df, df], ignore_index=True)
-    updated_df.to_parquet(parquet_path, index=False)
-    logger.debug(f"Saved {len(df)} new results to database (total: {len(updated_df)})")
-    logger.debug(f"Database size: {updated_df.memory_usage(deep=True).sum() / 1024**2:.4f} MB")
-    logger.debug(f"New results:\n{df.head(5)}")
-
-    # Save one random row from the new results to a CSV sample file
-    if not df.empty:
-        sample_row = df.sample(n=1, random_state=42)
-        if os.path.exists(preview_csv_path):
-            sample_df = pd.read_csv(preview_csv_path)
-        else:
-            sample_df = pd.DataFrame()
-
-        sample_df = pd.concat([sample_df, sample_row], ignore_index=True)
-        sample_df.to_csv(preview_csv_path, index=False)
+    # Save the new rows to the results store, partitioned by search date and route
+    for search_date, search_df in df.groupby('Search Date'):
+        results_store.append(search_df, search_date=search_date)
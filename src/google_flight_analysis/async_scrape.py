@@ -0,0 +1,114 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import ScraperConfig
+from config.setup_logging import init_logger
+from src.google_flight_analysis.driver_pool import DriverPool
+from src.google_flight_analysis.executor import scrape_object
+
+__all__ = ['AsyncScraper']
+
+conf = ScraperConfig()
+logger = init_logger(__name__)
+
+
+class AsyncScraper:
+    """
+    asyncio facade over the blocking scrapers, for callers that run on an event loop (the Telegram bot).
+
+    Queries are scraped on a thread pool with a driver borrowed from a DriverPool, after trying the result cache
+    (skipped by live queries, see Scrape.live) and (with HTTP_FETCH) the server-rendered page, like iter_scrape. At most `limit` queries are scraped at once,
+    the others wait without blocking the loop. Identical queries (same URLs) awaited at the same time are scraped
+    once and every caller gets the same results.
+
+    The pool is created on the first query and its drivers on demand, so an idle scraper costs no browser.
+
+    Usage:
+        async with AsyncScraper(conf.ENV, headless=True) as scraper:
+            df = await scraper.scrape(Scrape('MAD', 'BCN', '2026-11-05'))
+    """
+    def __init__(self, env=None, headless=True, limit=None, pool=None, query_timeout=None):
+        self.env = env or conf.ENV
+        self.headless = headless
+        self.limit = limit or (pool.size if pool is not None else conf.POOL_SIZE)
+        self.query_timeout = query_timeout or conf.QUERY_TIMEOUT
+        self._pool = pool
+        self._owns_pool = pool is None
+        self._executor = ThreadPoolExecutor(max_workers=self.limit, thread_name_prefix='async-scraper')
+        self._semaphore = None  # Created on the running loop
+        self._in_flight = {}
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+    def __repr__(self):
+        return f"AsyncScraper(limit={self.limit}, in_flight={len(self._in_flight)})"
+
+
+    @property
+    def pool(self) -> DriverPool:
+        if self._pool is None:
+            self._pool = DriverPool(self.env, headless=self.headless, size=self.limit, warm_up=False)
+        return self._pool
+
+
+    async def scrape(self, obj):
+        """
+        Scrape a _Scrape object without blocking the loop and return its results frame (also set as `obj.data`).
+        Cancelling the caller does not cancel the scrape, other callers of the same query still get it.
+        """
+        key = self._key(obj)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(obj))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            logger.debug(f'Joining the scrape in flight for {obj!r}')
+
+        data = await asyncio.shield(task)
+        obj.data = data
+        return data
+
+
+    async def scrape_many(self, objs) -> list:
+        """Results frames of all the objects, scraped concurrently within the limit."""
+        return list(await asyncio.gather(*(self.scrape(obj) for obj in objs)))
+
+
+    async def aclose(self):
+        """Wait for the queries in flight, then quit the drivers."""
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        if self._owns_pool and self._pool is not None:
+            await loop.run_in_executor(self._executor, self._pool.close)
+            self._pool = None
+        self._executor.shutdown(wait=False)
+
+
+    async def _run(self, obj):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._scrape, obj, self.pool)
+
+
+    def _scrape(self, obj, pool):
+        # Blocking, runs on the executor threads
+        if not (obj._scrape_cached() or (conf.HTTP_FETCH and obj._scrape_http())):
+            scrape_object(obj, pool, self.query_timeout)
+        return obj.data
+
+
+    @staticmethod
+    def _key(obj) -> tuple:
+        # Calendar queries load the same URLs as the flight queries of their first day
+        return tuple(obj.url), getattr(obj, '_calendar', None)
@@ -7,10 +7,20 @@ import pandas as pd
 from tqdm import tqdm
 from datetime import date, datetime, timedelta
 from sqlalchemy import create_engine, insert, delete
+from contextlib import closing
+import io
 import json
 import os
+import sqlite3
+import time
 
-__all__ = ['CacheControl']
+from config.config import ScraperConfig
+from config.setup_logging import init_logger
+
+__all__ = ['CacheControl', 'ResultCache']
+
+conf = ScraperConfig()
+logger = init_logger(__name__)
 
 class _CacheControl:
 
@@ -103,4 +113,68 @@ class _CacheControl:
 
 
 
-CacheControl = _CacheControl()
\ No newline at end of file
+CacheControl = _CacheControl()
+
+
+class ResultCache:
+	'''
+		On-disk cache of scraped result pages, keyed on the query URL (which encodes origin, destination,
+		date and search mode through the TFS payload). Entries older than `ttl` hours are ignored, so a
+		second job on the same day reuses the results of the first one without opening a browser.
+	'''
+
+	def __init__(self, path = None, ttl = None):
+		self.path = path or conf.CACHE_PATH
+		self.ttl = conf.CACHE_TTL_HOURS if ttl is None else ttl
+		self._ready = False
+
+	def __repr__(self):
+		return "<ResultCache: {path} (TTL {ttl}h)>".format(path = self.path, ttl = self.ttl)
+
+	@property
+	def enabled(self):
+		return self.ttl > 0
+
+	def get(self, url):
+		if not self.enabled:
+			return None
+
+		with closing(self._connect()) as con:
+			row = con.execute(
+				"SELECT data FROM results WHERE url = ? AND created > ?", (url, time.time() - self.ttl * 3600)
+			).fetchone()
+		if row is None:
+			return None
+
+		logger.debug(f"Cache hit for {url}")
+		return pd.read_parquet(io.BytesIO(row[0]))
+
+	def put(self, url, df):
+		if not self.enabled or not isinstance(df, pd.DataFrame) or df.empty:
+			return
+
+		buffer = io.BytesIO()
+		df.to_parquet(buffer, index = False)
+		with closing(self._connect()) as con, con:
+			con.execute(
+				"INSERT OR REPLACE INTO results (url, created, data) VALUES (?, ?, ?)",
+				(url, time.time(), buffer.getvalue())
+			)
+
+	def purge(self):
+		'''
+			Remove expired entries
+		'''
+		with closing(self._connect()) as con, con:
+			deleted = con.execute("DELETE FROM results WHERE created <= ?", (time.time() - self.ttl * 3600,)).rowcount
+		logger.debug(f"Purged {deleted} expired entries from the result cache")
+
+	def _connect(self):
+		if not self._ready:
+			os.makedirs(os.path.dirname(self.path) or '.', exist_ok = True)
+		con = sqlite3.connect(self.path, timeout = 30)
+		if not self._ready:
+			with con:
+				con.execute("CREATE TABLE IF NOT EXISTS results (url TEXT PRIMARY KEY, created REAL NOT NULL, data BLOB NOT NULL)")
+			self._ready = True
+		return con
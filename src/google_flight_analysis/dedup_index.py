@@ -0,0 +1,99 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+from config.setup_logging import init_logger
+
+__all__ = ['DedupIndex', 'DEDUP_COLUMNS']
+
+logger = init_logger(__name__)
+
+# A fare is the same result when all of these match, whatever its price
+DEDUP_COLUMNS = ['origin', 'destination', 'departure_datetime', 'airline', 'num_stops', 'days_left']
+_NORMALIZED = {
+    'origin': str,
+    'destination': str,
+    'departure_datetime': 'datetime64[ns]',
+    'airline': str,
+    'num_stops': 'int64',
+    'days_left': 'int64',
+}
+
+
+class DedupIndex:
+    """
+    Persistent set of row hashes (pd.util.hash_pandas_object over DEDUP_COLUMNS) of the results already stored.
+
+    The hashes live in a flat file of uint64 next to the data they index. The file is only read on the first
+    lookup, new hashes are appended to it, and membership is checked against an in-memory set.
+
+    Usage:
+        index = DedupIndex('data/results/raw/_dedup_index.bin')
+        new_df = df[index.new_rows(df)]
+        index.add(new_df)
+    """
+    def __init__(self, path):
+        self.path = path
+        self._hashes = None
+        self._lock = threading.RLock()
+
+
+    def __len__(self):
+        return len(self.hashes)
+
+
+    def __repr__(self):
+        return f"DedupIndex({self.path}, {len(self) if self._hashes is not None else 'not loaded'})"
+
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+
+    @property
+    def hashes(self) -> set:
+        if self._hashes is None:
+            with self._lock:
+                if self._hashes is None:
+                    stored = np.fromfile(self.path, dtype='<u8') if self.exists() else []
+                    self._hashes = set(stored.tolist() if len(stored) else [])
+                    logger.debug(f'Loaded {len(self._hashes)} hashes from {self.path}')
+        return self._hashes
+
+
+    @staticmethod
+    def hash(df: pd.DataFrame) -> np.ndarray:
+        normalized = df[DEDUP_COLUMNS].astype(_NORMALIZED)
+        return pd.util.hash_pandas_object(normalized, index=False).to_numpy(dtype='<u8')
+
+
+    def new_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """Boolean mask of the rows of `df` that are not indexed yet (keeping the first of any repeated rows)."""
+        if df.empty:
+            return np.zeros(0, dtype=bool)
+        hashes = self.hash(df)
+        known = self.hashes
+        return np.fromiter((h not in known for h in hashes.tolist()), dtype=bool, count=len(hashes)) & ~pd.Series(hashes).duplicated().to_numpy()
+
+
+    def add(self, df: pd.DataFrame):
+        """Index the rows of `df` (which must be new, see new_rows) and persist their hashes."""
+        if df.empty:
+            return
+        hashes = self.hash(df)
+        with self._lock:
+            self.hashes.update(hashes.tolist())
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'ab') as f:
+                hashes.tofile(f)
+
+
+    def rebuild(self, df: pd.DataFrame):
+        """Replace the index by the hashes of `df`, e.g. when the indexed data was changed by hand."""
+        hashes = np.unique(self.hash(df)) if not df.empty else np.zeros(0, dtype='<u8')
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            hashes.tofile(self.path)
+            self._hashes = set(hashes.tolist())
+        logger.info(f'Rebuilt {self.path} with {len(hashes)} hashes')
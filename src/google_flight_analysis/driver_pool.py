@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+import chromedriver_autoinstaller
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+from config.config import ROOT_DIR, ScraperConfig
+from config.setup_logging import init_logger
+from src.google_flight_analysis.human_simulations import get_user_agent, random_wait
+from src.google_flight_analysis.resource_policy import resource_policy
+
+__all__ = ['DriverPool', 'new_driver']
+
+conf = ScraperConfig()
+logger = init_logger(__name__)
+
+
+def chrome_options(env, headless=False):
+    # Loading some browser options to bypass anti-bot systems
+    options = Options()
+    options.add_argument('--log-level=3')
+    options.add_argument("--disable-gpu")
+
+    user_agent = get_user_agent()
+    options.add_argument(f"user-agent={user_agent}")
+    logger.debug(f'User agent chosen: {user_agent}')
+
+    if headless or env == 'production':  # Necessary for Github Actions
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+
+    if conf.NETWORK_CAPTURE or conf.PRICE_CALENDAR:  # Network events in the performance log, read by network_capture
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+@lru_cache(maxsize=None)
+def install_chromedriver():
+    # Once per process, before the first Chrome starts: importing the scraper doesn't need a browser
+    chromedriver_autoinstaller.install()  # Check if chromedriver is installed correctly and on path
+
+
+def new_driver(env, headless=False, add_cookies=False):
+    install_chromedriver()
+    driver = webdriver.Chrome(options=chrome_options(env, headless))
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    resource_policy.apply(driver)
+
+    if add_cookies:  # Load and add cookies to Selenium driver
+        with open(os.path.join(ROOT_DIR, 'data/cookies.json'), 'r') as f:
+            cookies = json.load(f)
+        for cookie in cookies:
+            driver.add_cookie(cookie)
+        driver.refresh()
+
+    driver.set_window_size(1920, 1080)
+    random_wait(0.01, 0.03)
+    # simulate_mouse_movement(driver, 3, 10)
+    # simulate_scroll(driver, 1, 2)
+    return driver
+
+
+class DriverPool:
+    """
+    Pool of Chrome drivers that lives for a whole job, so Chrome is not started and quit for every query.
+
+    Drivers are created lazily (or up front with `start()`), checked for health before being handed out
+    and recycled after `max_pages` queries or as soon as they raise a WebDriverException.
+
+    Usage:
+        with DriverPool(conf.ENV, headless=True) as pool:
+            ScrapeObjects(objs, conf.ENV, pool=pool)
+
+            with pool.driver() as driver:
+                driver.get(url)
+    """
+    def __init__(self, env, headless=False, size=None, max_pages=None, add_cookies=False, warm_up=True):
+        self.env = env
+        self.headless = headless
+        self.size = size or conf.POOL_SIZE
+        self.max_pages = max_pages or conf.MAX_PAGES_PER_DRIVER
+        self.add_cookies = add_cookies
+        self.warm_up = warm_up
+
+        self._idle = []
+        self._pages = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def __repr__(self):
+        return f"DriverPool(size={self.size}, alive={self._created}, idle={len(self._idle)})"
+
+
+    def start(self):
+        """Spawn and warm up every driver of the pool before the first query."""
+        while True:
+            with self._cond:
+                if self._closed or self._created >= self.size:
+                    return self
+                self._created += 1
+            self._release(self._spawn_reserved())
+
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            drivers, self._idle = self._idle, []
+            self._cond.notify_all()  # Waiters raise instead of spawning a driver for a closed pool
+        for driver in drivers:
+            self._discard(driver)
+
+        stats = resource_policy.summary(reset=True)
+        if stats['pages']:
+            # Transferred bytes only, savings are measured by comparing with a run with BLOCK_RESOURCES off
+            logger.info(f"Pages transferred {stats['mean_bytes'] / 1024:.0f} kB and loaded in {stats['mean_load_ms']} ms "
+                        f"on average ({stats['pages']} pages, resource blocking "
+                        f"{'on, ' + str(len(resource_policy.patterns)) + ' patterns' if resource_policy.enabled else 'off'})")
+        logger.debug('Driver pool closed')
+
+
+    @contextmanager
+    def driver(self):
+        """Borrow a healthy driver from the pool. Drivers that crash while borrowed are replaced."""
+        driver = self._acquire()
+        try:
+            yield driver
+        except WebDriverException:
+            logger.warning('Driver crashed while scraping --> Recycling it')
+            self._discard(driver)
+            raise
+        except BaseException:
+            self._release(driver)
+            raise
+        else:
+            with self._cond:
+                self._pages[driver] = pages = self._pages.get(driver, 0) + 1
+            if pages >= self.max_pages:
+                logger.debug(f'Driver reached {self.max_pages} pages --> Recycling it')
+                self._discard(driver)
+            else:
+                self._release(driver)
+
+
+    def _acquire(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._idle and self._created >= self.size:
+                    self._cond.wait()
+                if self._closed:
+                    raise RuntimeError('Driver pool is already closed')
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._created += 1
+
+            if driver is None:
+                return self._spawn_reserved()
+
+            if self._is_healthy(driver):
+                return driver
+            logger.warning('Unhealthy driver found in pool --> Replacing it')
+            self._discard(driver)
+
+
+    def _release(self, driver):
+        with self._cond:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._idle.append(driver)
+                self._cond.notify()
+        if closed:
+            self._discard(driver)
+
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f'Error while quitting driver: {e}')
+        with self._cond:
+            self._pages.pop(driver, None)
+            self._created -= 1
+            self._cond.notify()
+
+
+    def _spawn_reserved(self):
+        # Spawn a driver for a slot already counted in _created, giving the slot back if Chrome fails to start
+        try:
+            return self._spawn()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+
+    def _spawn(self):
+        driver = new_driver(self.env, headless=self.headless, add_cookies=self.add_cookies)
+        with self._cond:
+            self._pages[driver] = 0
+        if self.warm_up:
+            try:
+                driver.get(conf.WARM_UP_URL)
+            except WebDriverException as e:
+                logger.warning(f'Could not warm up driver: {e}')
+        logger.debug('New driver added to pool')
+        return driver
+
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
@@ -0,0 +1,95 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from selenium.common.exceptions import WebDriverException
+from tqdm import tqdm
+
+from config.config import ScraperConfig
+from config.setup_logging import init_logger
+from src.google_flight_analysis.human_simulations import random_wait
+
+__all__ = ['ScrapeExecutor', 'scrape_object']
+
+conf = ScraperConfig()
+logger = init_logger(__name__)
+
+
+def scrape_object(obj, pool, query_timeout=None):
+    """Scrape one _Scrape object in-place on a driver borrowed from the pool, retrying once if the driver crashes."""
+    for attempt in range(2):
+        try:
+            with pool.driver() as driver:
+                if query_timeout:
+                    driver.set_page_load_timeout(query_timeout)
+                obj._scrape_data(driver)
+            return obj
+        except WebDriverException as e:
+            if attempt:
+                raise
+            logger.warning(f'Driver crashed on {obj!r} ({e.msg}) --> Retrying with a fresh driver')
+
+
+class ScrapeExecutor:
+    """
+    Scrapes a batch of _Scrape objects concurrently, one worker thread per driver of a DriverPool.
+
+    Every object gets its `.data` filled in-place. Each worker waits `random_wait(*wait)` between two of
+    its queries, so the request rate per browser stays the same as in a sequential run, and every page
+    load is bounded by `query_timeout` seconds (a timed-out query ends up with empty data).
+
+    `run` scrapes a whole batch, `iter` yields every object as soon as it is scraped.
+    """
+    def __init__(self, pool, workers=None, query_timeout=None, wait=None):
+        self.pool = pool
+        self.workers = workers or pool.size
+        self.query_timeout = query_timeout or conf.QUERY_TIMEOUT
+        self.wait = wait or conf.WORKER_WAIT
+
+
+    def run(self, objs, progress=False):
+        done = self.iter(objs)
+        if progress:
+            done = tqdm(done, total=len(objs), desc="Scraping Objects")
+        for _ in done:
+            pass
+        return objs
+
+
+    def iter(self, objs, without_browser=None):
+        """
+        Yield the objects in completion order, while the next ones are being scraped. `objs` may be lazy: only
+        twice as many objects as workers are in flight. Objects for which `without_browser(obj)` returns True were
+        filled without a driver (e.g. from the result cache) and don't count for the worker wait. Failed objects
+        are yielded with their data empty. Closing the generator cancels the objects not started yet.
+        """
+        objs = iter(objs)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scraper') as executor:
+            futures = {}
+
+            def submit(n):
+                for obj in islice(objs, n):
+                    futures[executor.submit(self._work, obj, without_browser)] = obj
+
+            try:
+                submit(2 * self.workers)
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        obj = futures.pop(future)
+                        try:
+                            future.result()
+                        except Exception as e:
+                            logger.error(f'Scraping failed for {obj!r}: {e}')
+                        yield obj
+                    submit(len(done))
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+    def _work(self, obj, without_browser=None):
+        if without_browser is not None and without_browser(obj):
+            return obj
+        try:
+            return scrape_object(obj, self.pool, self.query_timeout)
+        finally:
+            random_wait(*self.wait)  # per-worker rate limiting
@@ -0,0 +1,136 @@
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from config.config import ScraperConfig
+from config.setup_logging import init_logger
+from src.google_flight_analysis.flight import parse_travel_time
+
+try:  # Optional C-accelerated HTML backends, BeautifulSoup is used when neither is installed
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    lxml_html = None
+
+__all__ = ['explore_records', 'explore_dataframe', 'available_backends', 'EXPLORE_COLUMNS']
+
+conf = ScraperConfig()
+logger = init_logger(__name__)
+
+EXPLORE_COLUMNS = ['City', 'Price', 'Stops', 'Travel_Time']
+
+# Fields of a destination card (div.tsAU4e), read the same way by the in-page extractor (EXPLORE_RECORDS_JS in scrape)
+CARD_SELECTOR = 'div.tsAU4e'
+TRAVEL_INFO_SELECTOR = 'div.o9JBjb.sSHqwe'
+CARD_FIELDS = {
+    'city': 'h3.W6bZuc.YMlIz',
+    'price': 'div.MJg7fb.QB2Jof span',
+    'stops': 'span.nx0jzf',
+    'flight_time': 'span.Xq1DAb',
+}
+
+
+def _xpath(selector: str) -> str:
+    # 'div.a.b span' --> div[a and b classes]//span, for the tag.class selectors above
+    steps = []
+    for step in selector.split():
+        tag, *classes = step.split('.')
+        steps.append(tag + ''.join(f'[contains(concat(" ", normalize-space(@class), " "), " {c} ")]' for c in classes))
+    return '//'.join(steps)
+
+
+if lxml_html is not None:  # Compiled once, the Explorer parses a page per country, day and traveller
+    _CARDS = etree.XPath(f'//{_xpath(CARD_SELECTOR)}')
+    _TRAVEL_INFO_SPANS = etree.XPath(f'count((.//{_xpath(TRAVEL_INFO_SELECTOR)})[1]//span)')
+    _FIELDS = {key: etree.XPath(f'(.//{_xpath(selector)})[1]') for key, selector in CARD_FIELDS.items()}
+
+
+def _records_bs4(html: str) -> list:
+    soup = BeautifulSoup(html, 'html.parser')
+    records = []
+    for card in soup.select(CARD_SELECTOR):
+        record = {}
+        for key, selector in CARD_FIELDS.items():
+            element = card.select_one(selector)
+            record[key] = element.get_text(strip=True) if element else None
+        travel_info = card.select_one(TRAVEL_INFO_SELECTOR)
+        record['spans'] = len(travel_info.find_all('span')) if travel_info else 0
+        records.append(record)
+    return records
+
+
+def _records_lxml(html: str) -> list:
+    records = []
+    for card in _CARDS(lxml_html.fromstring(html)):
+        record = {}
+        for key, xpath in _FIELDS.items():
+            elements = xpath(card)
+            record[key] = ''.join(text.strip() for text in elements[0].itertext()) if elements else None
+        record['spans'] = int(_TRAVEL_INFO_SPANS(card))
+        records.append(record)
+    return records
+
+
+def _records_selectolax(html: str) -> list:
+    records = []
+    for card in HTMLParser(html).css(CARD_SELECTOR):
+        record = {}
+        for key, selector in CARD_FIELDS.items():
+            element = card.css_first(selector)
+            record[key] = element.text(deep=True, separator='', strip=True) if element else None
+        travel_info = card.css_first(TRAVEL_INFO_SELECTOR)
+        record['spans'] = len(travel_info.css('span')) if travel_info else 0
+        records.append(record)
+    return records
+
+
+BACKENDS = {'selectolax': _records_selectolax, 'lxml': _records_lxml, 'bs4': _records_bs4}  # Fastest first
+
+
+def available_backends() -> list:
+    installed = {'selectolax': HTMLParser is not None, 'lxml': lxml_html is not None, 'bs4': True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def explore_records(html: str, backend: str = None) -> list:
+    """
+    Records of every destination card of an explore page source, as EXPLORE_RECORDS_JS returns them.
+    `backend` is one of BACKENDS ('auto' or None: ScraperConfig.HTML_BACKEND, the fastest installed one for 'auto').
+    A backend that fails or is not installed falls back to BeautifulSoup.
+    """
+    backend = backend or conf.HTML_BACKEND
+    if backend == 'auto':
+        backend = available_backends()[0]
+    if backend not in available_backends():
+        logger.warning(f'HTML backend {backend} is not available --> Using bs4')
+        backend = 'bs4'
+
+    try:
+        return BACKENDS[backend](html)
+    except Exception as e:
+        if backend == 'bs4':
+            raise
+        logger.warning(f'Could not parse explore page with {backend} ({e}) --> Using bs4')
+        return _records_bs4(html)
+
+
+def explore_dataframe(records: list) -> pd.DataFrame:
+    """City/Price/Stops/Travel_Time frame of the destination cards that can be reached by plane and have a price."""
+    data = []
+    for record in records:
+        try:
+            # Destinations reached by car list the distance in extra spans
+            if record['spans'] > 3 or not record['price']:
+                continue
+            data.append({
+                'City': record['city'],
+                'Price': int(record['price'][1:].replace(',', '')),
+                'Stops': record['stops'],
+                'Travel_Time': parse_travel_time(record['flight_time']),
+            })
+        except Exception as e:
+            logger.error(f"Error parsing an exploration entry: {e}")
+            continue
+    return pd.DataFrame(data)
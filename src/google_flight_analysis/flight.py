@@ -1,20 +1,81 @@
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 import re
 from tqdm import tqdm
 
-__all__ = ['Flight']
+__all__ = ['Flight', 'parse_travel_time', 'format_travel_time']
+
+TRAVEL_TIME_PATTERN = re.compile(r"(?:(\d+)\s*hr)?\s*(?:(\d+)\s*min)?")
+# '6:05 AM', '6:05AM' (the narrow no-break space may be stripped), '1:30 AM+1' for an arrival a day ahead
+CLOCK_PATTERN = re.compile(r'(\d{1,2}):(\d{2})\W*([AP]M)(?:\+(\d))?')
+PRICE_PATTERN = re.compile(r'\d+')
+STOPS_PATTERN = re.compile(r'\d+ stop')
+# Card lines that are not flight fields (the line is skipped)
+IGNORED_PATTERN = re.compile('|'.join(map(re.escape, [
+	'View price history',
+	'Avoids as much CO2e',
+	'Prices are currently',
+	'Price insights',
+	'round trip',  # Price label of the bundled round-trip pages
+])))
+
+
+def parse_travel_time(text):
+	'''Parse '2 hr 30 min', '2 hr' or '30 min' into a timedelta, None if there is no text.'''
+	if not text:
+		return None
+	match = TRAVEL_TIME_PATTERN.search(text)
+	return timedelta(hours = int(match.group(1) or 0), minutes = int(match.group(2) or 0))
+
+
+@lru_cache(maxsize = None)
+def _day_start(date):
+	# Midnight of a 'YYYY-MM-DD' date, parsed once per date of the run
+	return datetime.strptime(date, '%Y-%m-%d')
+
+
+def _today():
+	return datetime.combine(date.today(), datetime.min.time())
+
+
+@lru_cache(maxsize = 4096)
+def _clock(text):
+	# Offset of a time string from midnight of its date, None if it is not one. A page repeats the same few times.
+	match = CLOCK_PATTERN.search(text)
+	if not match:
+		return None
+	hour, minute, period, days_ahead = int(match.group(1)) % 12, int(match.group(2)), match.group(3), match.group(4)
+	return timedelta(days = int(days_ahead or 0), hours = hour + (12 if period == 'PM' else 0), minutes = minute)
+
+
+def format_travel_time(value):
+	'''Format a timedelta (or minutes) the way Google Flights displays it, e.g. '2 hr 30 min'.'''
+	if value is None or pd.isna(value):
+		return None
+	minutes = int(value.total_seconds() // 60) if isinstance(value, timedelta) else int(value)
+	hours, minutes = divmod(minutes, 60)
+	return ' '.join(part for part in [f'{hours} hr' if hours else '', f'{minutes} min' if minutes else ''] if part)
 
 
 class Flight:
+	'''
+		A flight of a result page. Built from the text lines of its card (each line is classified by the rules of
+		CLASSIFY_RULES) or from a record of the structured extractors (see from_record / from_records).
+	'''
+
+	__slots__ = (
+		'_id', '_origin', '_dest', '_date', '_dow', '_airline', '_travel_time', '_num_stops', '_stops', '_co2',
+		'_emissions', '_price', '_price_eur', '_price_usd', '_times', '_time_leave', '_time_arrive', '_search_date',
+	)
 
 	def __init__(self, date, *args):
 		self._id = 1
 		self._origin = None
 		self._dest = None
 		self._date = date
-		self._dow = datetime.strptime(date, '%Y-%m-%d').isoweekday() # day of week
+		self._dow = _day_start(date).isoweekday() # day of week
 		self._airline = None
 		self._travel_time = None
 		self._num_stops = None
@@ -27,10 +88,10 @@ class Flight:
 		self._times = []
 		self._time_leave = None
 		self._time_arrive = None
-		self._search_date = None
-		self._trash = []
+		self._search_date = _today()
 
-		self._parse_args(*args)
+		if args:
+			self._parse_args(*args)
 
 	def __repr__(self):
 		return "Flight(id:{id}, {org}-->{dest} on {date})".format(
@@ -120,131 +181,122 @@ class Flight:
 	def time_arrive(self):
 		return self._time_arrive
 
+	@classmethod
+	def from_record(cls, date, record):
+		'''
+			Build a Flight from a record of the structured page extractor (see _Scrape._get_flight_records).
+			Returns None if the record misses the departure/arrival times or the price.
+		'''
+		times = [cls._parse_time(date, record.get(key), record.get('days_ahead') if key == 'arrival' else None)
+				 for key in ('departure', 'arrival')]
+		price_val = ''.join(PRICE_PATTERN.findall(record.get('price') or ''))
+		if None in times or not price_val:
+			return None
+
+		flight = cls(date)
+		flight._time_leave, flight._time_arrive = times
+		flight._times = times
+		flight._origin = record.get('origin')
+		flight._dest = record.get('dest')
+		flight._travel_time = record.get('travel_time')
+		flight._stops = record.get('layover')
+
+		airline = record.get('airline')
+		if airline:
+			flight._airline = ','.join(elem.split('Operated')[0] for elem in airline.split(','))
+
+		stops = record.get('stops') or ''
+		if stops == 'Nonstop':
+			flight._num_stops = 0
+		elif STOPS_PATTERN.match(stops):
+			flight._num_stops = int(stops.split()[0])
+
+		co2 = record.get('co2')
+		if co2:
+			flight._co2 = int(co2.split()[0].replace(',', ''))
+
+		emissions = record.get('emissions')
+		if emissions:
+			emission_val = emissions.split()[0]
+			flight._emissions = 0 if emission_val == 'Avg' else int(emission_val[:-1])
+
+		flight._price = price_val  # Same frame as the text path, which sees the price without its currency sign
+		return flight
+
+	@classmethod
+	def from_records(cls, date, records):
+		'''
+			Flights of a whole result page in one pass. Records the structured extractor could not read completely
+			are classified from their own text lines, like the text path does for the whole page.
+		'''
+		flights = []
+		for record in records:
+			flight = cls.from_record(date, record)
+			if flight is None:
+				flight = cls(date, [x.encode("ascii", "ignore").decode().strip() for x in record['lines']])
+			flights.append(flight)
+		return flights
+
+	@staticmethod
+	def _parse_time(date, value, days_ahead=None):
+		# '6:05 AM' (Google separates AM/PM with a narrow no-break space), arrival may be '+1' day ahead
+		offset = _clock(value) if value else None
+		if offset is None:
+			return None
+		delta = timedelta(days = int(''.join(PRICE_PATTERN.findall(days_ahead)) or 0) if days_ahead else 0)
+		return _day_start(date) + offset + delta
+
 	def _classify_arg(self, arg):
-		if ('AM' in arg or 'PM' in arg) and len(self._times) < 2 and ':' in arg:
-			# arrival or departure time
-			delta = timedelta(days = 0)
-			if arg[-2] == '+':
-				delta = timedelta(days = int(arg[-1]))
-				arg = arg[:-2]
-
-			date_format = "%Y-%m-%d %I:%M %p"
-			self._times += [datetime.strptime(self._date + " " + arg, date_format) + delta]
-
-		elif ('hr' in arg or 'min'in arg) and self._travel_time is None:
-			# flight time
-			self._travel_time = arg
-		elif 'stop' in arg and self._num_stops is None:
-			# Num_Stops
-			self._num_stops = 0 if arg == 'Nonstop' else int(arg.split()[0])
-
-		elif arg.endswith('CO2e') and self._co2 is None:
-			# co2
-			self._co2 = int(arg.split()[0].replace(',', ''))
-		elif arg.endswith('emissions') and self._emissions is None:
-			# emmision
-			emission_val = arg.split()[0]
-			self._emissions = 0 if emission_val == 'Avg' else int(emission_val[:-1])
-		elif re.fullmatch(r"\d+", arg):
-			# price
-			self._price = arg
-		elif '€' in arg and self._price_eur is None:
-			# price (€)
-			self._price_eur = int(arg[1:].replace(',',''))
-		elif '$' in arg and self._price_usd is None:
-			# price ($)
-			self._price_usd = int(arg[1:].replace(',',''))
-		elif len(arg) == 6 and arg.isupper() and self._origin is None and self._dest is None:
-			# origin/dest
-			self._origin = arg[:3]
-			self._dest = arg[3:]
-		elif (('hr' in arg or 'min' in arg) and arg[-3:].isupper()) or (len(arg.split(', ')) > 1 and arg.isupper()):
-			# 1 stop + time at stop
-			# or multiple stops
-			self._stops = arg
-		elif len(arg) > 0 and arg != 'Separate tickets booked together' and arg != 'Change of airport':
-			val = arg.split(',')
-			val = [elem.split('Operated')[0] for elem in val]
-			self._airline = ','.join(val)
-		else:
-			self._trash += [arg]
-			# airline and other stuff idk
+		# The first rule whose test passes sets its field, lines matching no rule (e.g. 'Change of airport') are dropped
+		for test, parse in CLASSIFY_RULES:
+			if test(self, arg):
+				parse(self, arg)
+				break
 
 		if len(self._times) == 2:
 			self._time_leave = self._times[0]
 			self._time_arrive = self._times[1]
 
 	def _parse_args(self, args):
-		ignore = False
 		for arg in args:
-			ignored_args = [
-				'View price history', 
-				'Avoids as much CO2e', 
-				'Prices are currently', 
-				'Price insights',
-				   ]
-			for ignored_arg in ignored_args:
-				if ignored_arg in arg:
-					ignore = True
-			if ignore:
-				ignore = False
-				continue
-
-			self._classify_arg(arg)
-
-		self._search_date = datetime.today().replace(hour = 0, minute = 0, second = 0, microsecond = 0)
+			if not IGNORED_PATTERN.search(arg):
+				self._classify_arg(arg)
+
 		if not self.price:
 			if self.price_eur and not self.price_usd:
-				self.price = self.price_eur
+				self._price = self.price_eur
 			elif not self.price_eur and self.price_usd:
-				self.price = self.price_usd
+				self._price = self.price_usd
 
 	@staticmethod
 	def dataframe(flights):
+		'''
+			Typed results frame: datetime64 times, categorical airports/airlines, int32 prices and a timedelta Travel_Time
+			(use format_travel_time to display it).
+		'''
+		flights = [flight for flight in flights if flight.price]
+
+		def column(attr):
+			return [getattr(flight, attr) for flight in flights]
+
 		data = {
-			'Departure datetime': [],
-			'Arrival datetime': [],
-			'Origin' : [],
-			'Destination' : [],
-			'Airline(s)' : [],
-			'Travel_Time' : [],
-			'Price' : [],
-			'Num_Stops' : [],
-			'Layover' : [],
-			#'Stop Location' : [],
-			'CO2 Emission (kg)' : [],
-			'Emission Diff (%)' : [],
-			'Search Date' : []
+			'Departure datetime': pd.to_datetime(column('time_leave')).astype('datetime64[ns]'),
+			'Arrival datetime': pd.to_datetime(column('time_arrive')).astype('datetime64[ns]'),
+			'Origin': pd.Categorical(column('origin')),
+			'Destination': pd.Categorical(column('dest')),
+			'Airline(s)': pd.Categorical(column('airline')),
+			'Travel_Time': pd.to_timedelta([parse_travel_time(flight.Travel_Time) for flight in flights]).astype('timedelta64[ns]'),
+			'Price': pd.array([int(price) for price in column('price')], dtype='int32'),
+			'Num_Stops': pd.array(column('num_stops'), dtype='Int8'),
+			'Layover': column('stops'),
+			'CO2 Emission (kg)': pd.array(column('co2'), dtype='Int32'),
+			'Emission Diff (%)': pd.array(column('emissions'), dtype='Int16'),
+			'Search Date': column('search_date'),
 		}
-
-		for flight in flights:
-			if not flight.price:
-				continue
-			data['Departure datetime'] += [flight.time_leave]
-			data['Arrival datetime'] += [flight.time_arrive]
-
-			data['Airline(s)'] += [flight.airline]
-			data['Travel_Time'] += [flight.Travel_Time]
-			data['Origin'] += [flight.origin]
-			data['Destination'] += [flight.dest]
-
-			data['Num_Stops'] += [flight.num_stops]
-			data['Layover'] += [flight.stops]
-			#data['Stop Location'] += [flight.stops]
-			data['CO2 Emission (kg)'] += [flight.co2]
-			data['Emission Diff (%)'] += [flight.emissions]
-			data['Price'] += [int(flight.price)]
-			if flight.price_eur:
-				try:
-					data['Price (€)'] += [flight.price_eur]
-				except KeyError:
-					data['Price (€)'] = [flight.price_eur]
-			if flight.price_usd:
-				try:
-					data['Price ($)'] += [flight.price_usd]
-				except KeyError:
-					data['Price ($)'] = [flight.price_usd]
-			data['Search Date'] += [flight.search_date]
+		if any(flight.price_eur for flight in flights):
+			data['Price (€)'] = pd.array(column('price_eur'), dtype='Int32')
+		if any(flight.price_usd for flight in flights):
+			data['Price ($)'] = pd.array(column('price_usd'), dtype='Int32')
 
 		return pd.DataFrame(data)
 
@@ -262,3 +314,56 @@ class Flight:
 			"Parsing Arg 8 as emissions elem is incorrect.",
 			"Parsing Arg 9 as price elem is incorrect."
 		][x] + ": " + arg
+
+
+def _set_time(flight, arg):
+	flight._times.append(_day_start(flight._date) + _clock(arg))
+
+def _set_travel_time(flight, arg):
+	flight._travel_time = arg
+
+def _set_num_stops(flight, arg):
+	flight._num_stops = 0 if arg == 'Nonstop' else int(arg.split()[0])
+
+def _set_co2(flight, arg):
+	flight._co2 = int(arg.split()[0].replace(',', ''))
+
+def _set_emissions(flight, arg):
+	emission_val = arg.split()[0]
+	flight._emissions = 0 if emission_val == 'Avg' else int(emission_val[:-1])
+
+def _set_price(flight, arg):
+	flight._price = arg
+
+def _set_price_eur(flight, arg):
+	flight._price_eur = int(arg[1:].replace(',', ''))
+
+def _set_price_usd(flight, arg):
+	flight._price_usd = int(arg[1:].replace(',', ''))
+
+def _set_route(flight, arg):
+	flight._origin, flight._dest = arg[:3], arg[3:]
+
+def _set_stops(flight, arg):
+	flight._stops = arg
+
+def _set_airline(flight, arg):
+	flight._airline = ','.join(elem.split('Operated')[0] for elem in arg.split(','))
+
+
+# (test, parser) of every field of the text lines of a card, tried in order: a field is only set once
+CLASSIFY_RULES = (
+	# departure and arrival times, arrival may be '+1' day ahead
+	(lambda f, arg: len(f._times) < 2 and ':' in arg and ('AM' in arg or 'PM' in arg) and _clock(arg) is not None, _set_time),
+	(lambda f, arg: f._travel_time is None and ('hr' in arg or 'min' in arg), _set_travel_time),
+	(lambda f, arg: f._num_stops is None and 'stop' in arg, _set_num_stops),
+	(lambda f, arg: f._co2 is None and arg.endswith('CO2e'), _set_co2),
+	(lambda f, arg: f._emissions is None and arg.endswith('emissions'), _set_emissions),
+	(lambda f, arg: PRICE_PATTERN.fullmatch(arg) is not None, _set_price),
+	(lambda f, arg: f._price_eur is None and '€' in arg, _set_price_eur),
+	(lambda f, arg: f._price_usd is None and '$' in arg, _set_price_usd),
+	(lambda f, arg: f._origin is None and f._dest is None and len(arg) == 6 and arg.isupper(), _set_route),
+	# 1 stop + time at stop, or multiple stops
+	(lambda f, arg: (('hr' in arg or 'min' in arg) and arg[-3:].isupper()) or (len(arg.split(', ')) > 1 and arg.isupper()), _set_stops),
+	(lambda f, arg: len(arg) > 0 and arg not in ('Separate tickets booked together', 'Change of airport'), _set_airline),
+)
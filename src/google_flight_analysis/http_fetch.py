@@ -0,0 +1,147 @@
+import re
+import threading
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.config import ScraperConfig
+from config.setup_logging import init_logger
+from src.google_flight_analysis.human_simulations import get_user_agent
+
+__all__ = ['HttpFetcher', 'parse_results_html']
+
+conf = ScraperConfig()
+logger = init_logger(__name__)
+
+HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+# Answer of "Reject all" on the consent page, without it EU requests are redirected to consent.google.com
+CONSENT_COOKIES = {'SOCS': 'CAESEwgDEgk0ODE3Nzk3MjQaAmVuIAEaBgiA_LyaBg'}
+
+# Same patterns as the in-page extractor (see FLIGHT_RECORDS_JS in scrape)
+ROUTE = re.compile(r'^([A-Z]{3})\W+([A-Z]{3})$')
+LAYOVER = re.compile(r'^(?=.*(hr|min)).*[A-Z]{3}$|^[A-Z]{3}(, [A-Z]{3})+$')
+CO2 = re.compile(r'^[\d,]+ kg CO2e$')
+EMISSIONS = re.compile(r'^([+-]?\d+%|Avg) emissions$')
+
+
+class HttpFetcher:
+    """
+    Fetches the server-rendered result page of a query URL over HTTP, without a browser.
+
+    A single keep-alive session is shared by all the queries of a job (one connection per worker, retried on
+    rate limits and server errors). The flight cards of the page are parsed into the records of the in-page
+    extractor, so an empty list means the page has to be rendered by Selenium.
+
+    Usage:
+        with HttpFetcher() as fetcher:
+            records = fetcher.records(url)  # [] --> scrape the URL with a driver
+    """
+    def __init__(self, timeout=None, pool_size=None):
+        self.timeout = timeout or conf.QUERY_TIMEOUT
+        self.pool_size = pool_size or conf.POOL_SIZE
+        self._session = None
+        self._lock = threading.Lock()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def __repr__(self):
+        return f"HttpFetcher(timeout={self.timeout}, pool_size={self.pool_size})"
+
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                self._session = self._new_session()
+            return self._session
+
+
+    def get(self, url: str):
+        """HTML of the page, or None if it can't be fetched."""
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f'HTTP fetch of {url} failed: {e}')
+            return None
+        if response.status_code != 200:
+            logger.warning(f'HTTP fetch of {url} returned {response.status_code}')
+            return None
+        if 'charset' not in response.headers.get('Content-Type', ''):
+            response.encoding = 'utf-8'  # requests would default to ISO-8859-1 and garble the '–' of the routes
+        return response.text
+
+
+    def records(self, url: str) -> list:
+        """Flight records of the result page of `url` (see Flight.from_record), empty if it has none."""
+        html = self.get(url)
+        if html is None:
+            return []
+        records = parse_results_html(html)
+        if not records:
+            logger.debug(f'No flight results in the HTML of {url}')
+        return records
+
+
+    def close(self):
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        retries = Retry(total=2, backoff_factor=1, status_forcelist=(429, 500, 502, 503), allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({**HEADERS, 'User-Agent': get_user_agent()})
+        session.cookies.update(CONSENT_COOKIES)
+        return session
+
+
+def parse_results_html(html: str) -> list:
+    """Records of every flight card (li.pIav2d) of a result page, as FLIGHT_RECORDS_JS reads them in the browser."""
+    soup = BeautifulSoup(html, 'html.parser')
+    return [_card_record(card) for card in soup.select('li.pIav2d')]
+
+
+def _card_record(card) -> dict:
+    def text(selector):
+        element = card.select_one(selector)
+        return element.get_text(strip=True) if element else None
+
+    def find(pattern):
+        return next((match for match in map(pattern.match, lines) if match), None)
+
+    # Text of the innermost divs: the lines innerText would give for the card
+    lines = [div.get_text(' ', strip=True) for div in card.find_all('div') if not div.find('div')]
+    lines = [line for line in lines if line]
+    times = [div.get_text(strip=True) for div in card.select('span.mv1WYe div')]
+    route, layover, co2, emissions = find(ROUTE), find(LAYOVER), find(CO2), find(EMISSIONS)
+    return {
+        'departure': times[0] if times else None,
+        'arrival': times[1] if len(times) > 1 else None,
+        'days_ahead': text('span.bOzv6'),
+        'origin': route.group(1) if route else None,
+        'dest': route.group(2) if route else None,
+        'airline': text('div.sSHqwe.tPgKwe.ogfYpf span'),
+        'travel_time': text('div.Ak5kof div'),
+        'stops': text('div.BbR8Ec .ogfYpf'),
+        'layover': layover.group(0) if layover else None,
+        'price': text('div.YMlIz.FpEdX'),
+        'co2': co2.group(0) if co2 else None,
+        'emissions': emissions.group(0) if emissions else None,
+        'lines': lines,
+    }
@@ -0,0 +1,228 @@
+import datetime as dt
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+import pandas as pd
+import pyarrow.dataset as ds
+
+from config.config import ROOT_DIR
+from config.setup_logging import init_logger
+from src.google_flight_analysis.results_store import RESULTS_SCHEMA
+
+__all__ = ['MasterDataset']
+
+logger = init_logger(__name__)
+
+
+class MasterDataset:
+    """
+    Master results dataset, partitioned by departure month as `<root>/departure_month=YYYY-MM/part-<id>.parquet`.
+
+    A merge only writes new files, one per departure month of the merged rows. Every file is listed in
+    `<root>/manifest.json` with its row count, departure range and routes, so readers only open the files
+    they need. Once a partition holds `compact_threshold` small files (< `small_rows` rows), they are
+    compacted into one on a background thread, so appends return as soon as their files are written.
+    Readers keep using the small files until the compacted one replaces them in the manifest.
+
+    Usage:
+        master = MasterDataset()  # data/results/processed
+        master.append(weekly_df)
+        master.read(origins=['AGP'], departure_from='2026-11-01')
+        master.wait()  # Background compactions
+    """
+    MANIFEST_FILE = 'manifest.json'
+    LEGACY_FILE = 'results.parquet'
+
+    def __init__(self, root=os.path.join(ROOT_DIR, 'data/results/processed'), compact_threshold=8, small_rows=50_000):
+        self.root = root
+        self.compact_threshold = compact_threshold
+        self.small_rows = small_rows
+        self.manifest_path = os.path.join(root, self.MANIFEST_FILE)
+        self._manifest = None
+        self._lock = threading.RLock()  # Manifest and file removals, shared with the compaction thread
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='compaction')
+        self._pending = []
+
+
+    def __repr__(self):
+        return f"MasterDataset({self.root}, {len(self.manifest['files'])} files, {self.rows} rows)"
+
+
+    @property
+    def manifest(self) -> dict:
+        with self._lock:
+            if self._manifest is None:
+                if os.path.exists(self.manifest_path):
+                    with open(self.manifest_path, 'r') as f:
+                        self._manifest = json.load(f)
+                else:
+                    self._manifest = {'files': {}}
+            return self._manifest
+
+
+    @property
+    def rows(self) -> int:
+        with self._lock:
+            return sum(entry['rows'] for entry in self.manifest['files'].values())
+
+
+    def append(self, df: pd.DataFrame) -> list:
+        """
+        Write `df` as new files (one per departure month) and register them in the manifest. Returns their paths.
+        The partitions that reach the compaction threshold are compacted in the background (see wait).
+        """
+        if df.empty:
+            return []
+        df = df[list(RESULTS_SCHEMA)].astype(RESULTS_SCHEMA)
+
+        paths, months = [], []
+        for month, month_df in df.groupby(df['departure_datetime'].dt.strftime('%Y-%m'), sort=True):
+            path, entry = self._write(month, month_df)
+            with self._lock:
+                self.manifest['files'][path] = entry
+            paths.append(path)
+            months.append(month)
+        with self._lock:
+            self._save_manifest()
+
+        self._pending = [future for future in self._pending if not future.done()]
+        self._pending.append(self._compactor.submit(self._compact_months, months))
+        return paths
+
+
+    def wait(self):
+        """Block until the background compactions are done, raising their errors."""
+        pending, self._pending = self._pending, []
+        for future in wait(pending).done:
+            future.result()
+
+
+    def read(self, origins=None, destinations=None, departure_from=None, departure_to=None, columns=None) -> pd.DataFrame:
+        """Read the results, opening only the files whose manifest entry can match the filters."""
+        departure_from = pd.Timestamp(departure_from) if departure_from is not None else None
+        departure_to = pd.Timestamp(departure_to) if departure_to is not None else None
+
+        files = []
+        with self._lock:
+            entries = list(self.manifest['files'].items())
+        for path, entry in entries:
+            if departure_from is not None and pd.Timestamp(entry['departure_max']) < departure_from:
+                continue
+            if departure_to is not None and pd.Timestamp(entry['departure_min']) > departure_to:
+                continue
+            routes = [route.split('-') for route in entry['routes']]
+            if origins is not None and not any(org in origins for org, _ in routes):
+                continue
+            if destinations is not None and not any(dest in destinations for _, dest in routes):
+                continue
+            files.append(os.path.join(self.root, path))
+
+        if not files:
+            df = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in RESULTS_SCHEMA.items()})
+        else:
+            with self._lock:  # A compaction may remove the small files once its compacted file is registered
+                df = ds.dataset(files, format='parquet').to_table().to_pandas()
+            df = df[list(RESULTS_SCHEMA)].astype(RESULTS_SCHEMA)
+
+        mask = pd.Series(True, index=df.index)
+        if origins is not None:
+            mask &= df['origin'].isin(origins)
+        if destinations is not None:
+            mask &= df['destination'].isin(destinations)
+        if departure_from is not None:
+            mask &= df['departure_datetime'] >= departure_from
+        if departure_to is not None:
+            mask &= df['departure_datetime'] <= departure_to
+        df = df[mask].reset_index(drop=True)
+        return df[columns] if columns is not None else df
+
+
+    def compact(self, month: str = None, force: bool = False) -> int:
+        """
+        Compact the small files of a partition (of every partition if no month is given) now, after the background
+        compactions. Returns the files removed.
+        """
+        self.wait()
+        if month:
+            months = [month]
+        else:
+            with self._lock:
+                months = sorted({entry['partition'] for entry in self.manifest['files'].values()})
+        return self._compactor.submit(self._compact_months, months, force).result()  # One compaction at a time
+
+
+    def rewrite(self, df: pd.DataFrame):
+        """Replace the whole dataset by `df`."""
+        self.wait()
+        with self._lock:
+            old = list(self.manifest['files'])
+            self.manifest['files'] = {}
+        self.append(df)
+        with self._lock:
+            for path in old:
+                os.remove(os.path.join(self.root, path))
+            self._save_manifest()
+
+
+    def migrate_legacy(self) -> bool:
+        """Move the single-file master (results.parquet) into the partitioned layout. Returns True if there was one."""
+        legacy = os.path.join(self.root, self.LEGACY_FILE)
+        if not os.path.exists(legacy):
+            return False
+        df = pd.read_parquet(legacy)
+        logger.info(f'Migrating {len(df)} rows of {legacy} to partitions')
+        self.append(df)
+        self.compact(force=True)
+        os.remove(legacy)
+        return True
+
+
+    def _compact_months(self, months, force=False) -> int:
+        removed = 0
+        for month in months:
+            with self._lock:
+                small = [path for path, entry in self.manifest['files'].items()
+                         if entry['partition'] == month and entry['rows'] < self.small_rows]
+            if len(small) < 2 or (len(small) < self.compact_threshold and not force):
+                continue
+
+            # Appends and reads go on while the compacted file is written, they only wait for the manifest swap
+            df = ds.dataset([os.path.join(self.root, path) for path in small], format='parquet').to_table().to_pandas()
+            path, entry = self._write(month, df.sort_values('departure_datetime', ignore_index=True))
+            with self._lock:
+                self.manifest['files'][path] = entry
+                for small_path in small:
+                    self.manifest['files'].pop(small_path)
+                self._save_manifest()  # Readers switch to the compacted file before the small ones disappear
+                for small_path in small:
+                    os.remove(os.path.join(self.root, small_path))
+            removed += len(small)
+            logger.info(f'Compacted {len(small)} files of departure month {month} ({len(df)} rows)')
+        return removed
+
+
+    def _write(self, month: str, df: pd.DataFrame) -> tuple:
+        # Writes the file, the caller registers its manifest entry
+        path = f'departure_month={month}/part-{uuid.uuid4().hex[:12]}.parquet'
+        os.makedirs(os.path.join(self.root, os.path.dirname(path)), exist_ok=True)
+        df.to_parquet(os.path.join(self.root, path), index=False)
+
+        entry = {
+            'partition': month,
+            'rows': len(df),
+            'departure_min': df['departure_datetime'].min().isoformat(),
+            'departure_max': df['departure_datetime'].max().isoformat(),
+            'routes': sorted((df['origin'] + '-' + df['destination']).unique().tolist()),
+            'created': dt.datetime.now().isoformat(timespec='seconds'),
+        }
+        return path, entry
+
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)  # Atomic, readers never see a half-written manifest
@@ -0,0 +1,194 @@
+import datetime as dt
+import json
+import time
+from selenium.common.exceptions import WebDriverException
+
+from config.setup_logging import init_logger
+from src.google_flight_analysis.flight import format_travel_time
+
+__all__ = ['drain_log', 'wait_for_response', 'parse_shopping_results', 'parse_calendar_prices']
+
+logger = init_logger(__name__)
+
+SHOPPING_RESULTS = 'GetShoppingResults'
+CALENDAR_PRICES = 'GetCalendar'  # GetCalendarPicker (date grid) and GetCalendarGraph (price graph)
+
+
+def drain_log(driver):
+    """Discard the performance log entries left by previous pages of this driver."""
+    try:
+        driver.get_log('performance')
+    except WebDriverException as e:
+        logger.debug(f'Could not drain performance log: {e.msg}')
+
+
+def wait_for_response(driver, url_fragment=SHOPPING_RESULTS, timeout=10, poll=0.2):
+    """
+    Poll the Chrome performance log until the response of a request whose URL contains `url_fragment` has
+    finished loading, and return its body through CDP `Network.getResponseBody`. Returns None on timeout.
+    """
+    request_ids = set()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            params = message.get('params', {})
+            if message['method'] == 'Network.responseReceived' and url_fragment in params['response']['url']:
+                request_ids.add(params['requestId'])
+            elif message['method'] == 'Network.loadingFinished' and params['requestId'] in request_ids:
+                try:
+                    return driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})['body']
+                except WebDriverException as e:
+                    logger.warning(f'Could not read {url_fragment} response body: {e.msg}')
+                    request_ids.discard(params['requestId'])
+        time.sleep(poll)
+
+    logger.debug(f'No {url_fragment} response captured within {timeout} seconds')
+    return None
+
+
+def parse_shopping_results(body: str) -> list:
+    """
+    Parse a GetShoppingResults response into flight records, in the format of the in-page extractor
+    (see Flight.from_record). Returns an empty list if the payload can't be read.
+
+    The payload is a batchexecute envelope: `)]}'` followed by (optionally length-prefixed) JSON chunks of
+    ["wrb.fr", null, "<json>"] entries. In the inner JSON, data[2][0] (top flights) and data[3][0] (other flights)
+    list the itineraries: itinerary[1][0][-1] is the price and itinerary[0][2] its legs.
+
+    Airlines are stored by name, like the DOM extractors read them. Legs that only carry their IATA code are
+    named after the other itineraries of the same response (see _airline_names), the code is kept as a last resort.
+    """
+    try:
+        data = _unwrap(body)
+    except (ValueError, TypeError, IndexError) as e:
+        logger.warning(f'Could not decode {SHOPPING_RESULTS} payload: {e}')
+        return []
+
+    itineraries = []
+    for i in (2, 3):
+        if len(data) <= i or not isinstance(data[i], list) or not data[i] or not isinstance(data[i][0], list):
+            continue
+        itineraries.extend(data[i][0])
+
+    names = _airline_names(itineraries)
+    records = []
+    for itinerary in itineraries:
+        try:
+            records.append(_itinerary_record(itinerary, names))
+        except (TypeError, IndexError, ValueError) as e:
+            logger.debug(f'Skipping unreadable itinerary: {e}')
+    return records
+
+
+def parse_calendar_prices(body: str) -> dict:
+    """
+    Parse a GetCalendarPicker/GetCalendarGraph response into the cheapest price of every day, as {'YYYY-MM-DD': price}.
+    Returns an empty dict if the payload can't be read.
+
+    The calendar is streamed as several wrb.fr entries, in each inner JSON data[-1] lists the days:
+    day[0] is the date and day[2][0][1] its cheapest price (days without flights have no price).
+    """
+    prices = {}
+    try:
+        for data in _entries(body):
+            for day in data[-1] if data and isinstance(data[-1], list) else []:
+                try:
+                    price = day[2][0][1]
+                    date = dt.date.fromisoformat(day[0]).isoformat()
+                except (TypeError, IndexError, ValueError):
+                    continue
+                if isinstance(price, (int, float)):
+                    prices[date] = min(int(price), prices.get(date, int(price)))
+    except (ValueError, TypeError) as e:
+        logger.warning(f'Could not decode {CALENDAR_PRICES} payload: {e}')
+    return prices
+
+
+def _unwrap(body: str) -> list:
+    for data in _entries(body):
+        return data
+    raise ValueError('no wrb.fr entry found')
+
+
+def _entries(body: str):
+    # Inner JSON of every wrb.fr entry of a batchexecute envelope
+    body = body.lstrip()
+    if body.startswith(")]}'"):
+        body = body[4:]
+
+    for line in body.splitlines():
+        line = line.strip()
+        if not line.startswith('['):
+            continue  # chunk length prefixes
+        for entry in json.loads(line):
+            if isinstance(entry, list) and len(entry) > 2 and entry[0] == 'wrb.fr' and isinstance(entry[2], str):
+                yield json.loads(entry[2])
+
+
+def _airline_names(itineraries: list) -> dict:
+    # {IATA code: name} of the carriers of the response: leg[22] is [code, flight number, None, name] when Google
+    # sends the name, and itineraries flown by a single carrier pair its code with their airline name list
+    names = {}
+    for itinerary in itineraries:
+        try:
+            legs = itinerary[0][2]
+            for leg in legs:
+                if len(leg[22]) > 3 and isinstance(leg[22][3], str):
+                    names.setdefault(leg[22][0], leg[22][3])
+            codes, airlines = {leg[22][0] for leg in legs}, itinerary[0][1]
+            if len(codes) == 1 and isinstance(airlines, list) and len(airlines) == 1:
+                names.setdefault(codes.pop(), airlines[0])
+        except (TypeError, IndexError):
+            continue
+    return names
+
+
+def _itinerary_record(itinerary: list, names: dict = None) -> dict:
+    # Leg fields: 3 departure airport, 6 arrival airport, 8/10 departure/arrival time [h, m],
+    # 11 duration (min), 20/21 departure/arrival date [y, m, d], 22 [airline code, flight number, None, airline name]
+    legs = itinerary[0][2]
+    first, last = legs[0], legs[-1]
+    departure_date = dt.date(*first[20])
+    days_ahead = (dt.date(*last[21]) - departure_date).days
+
+    if isinstance(itinerary[0][1], list) and itinerary[0][1]:
+        airlines = itinerary[0][1]
+    else:
+        airlines = [(names or {}).get(leg[22][0], leg[22][0]) for leg in legs]
+    stops = len(legs) - 1
+
+    layovers = []
+    for leg, next_leg in zip(legs, legs[1:]):
+        arrival = dt.datetime.combine(dt.date(*leg[21]), _time(leg[10]))
+        departure = dt.datetime.combine(dt.date(*next_leg[20]), _time(next_leg[8]))
+        layovers.append((int((departure - arrival).total_seconds() // 60), leg[6]))
+    if stops == 1:
+        layover = f'{format_travel_time(layovers[0][0]) or "0 min"} {layovers[0][1]}'
+    else:
+        layover = ', '.join(airport for _, airport in layovers) or None
+
+    travel_time = itinerary[0][9] if len(itinerary[0]) > 9 and itinerary[0][9] else sum(leg[11] for leg in legs) + sum(m for m, _ in layovers)
+
+    return {
+        'departure': _time(first[8]).strftime('%I:%M %p').lstrip('0'),
+        'arrival': _time(last[10]).strftime('%I:%M %p').lstrip('0'),
+        'days_ahead': f'+{days_ahead}' if days_ahead else None,
+        'origin': first[3],
+        'dest': last[6],
+        'airline': ', '.join(dict.fromkeys(airlines)),
+        'travel_time': format_travel_time(travel_time),
+        'stops': 'Nonstop' if not stops else f'{stops} stop' + ('s' if stops > 1 else ''),
+        'layover': layover,
+        'price': str(itinerary[1][0][-1]),
+        'co2': None,
+        'emissions': None,
+        'lines': [],
+    }
+
+
+def _time(value) -> dt.time:
+    # Zero fields are dropped from the payload: 9:00 is [9], 0:30 is [None, 30]
+    value = list(value or []) + [None, None]
+    return dt.time(value[0] or 0, value[1] or 0)
+
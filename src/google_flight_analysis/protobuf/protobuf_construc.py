@@ -1,6 +1,6 @@
 import base64
 import src.google_flight_analysis.protobuf.schema_pb2 as PB
-from typing import Any, List, Optional, TYPE_CHECKING, Literal
+from typing import Any, List, Optional, Tuple, TYPE_CHECKING, Literal
 import re
 
 if TYPE_CHECKING:
@@ -15,13 +15,22 @@ class FlightData:
         from_airport (str): Departure (airport). Where from?
         to_airport (str): Arrival (airport). Where to?
         max_stops (int, optional): Maximum number of stops. Default is None.
+        airlines (list[str], optional): Only these airlines (IATA codes or alliances). Default is None.
+        max_duration (int, optional): Maximum travel time in minutes. Default is None.
+        departure_window (tuple[int, int], optional): Earliest and latest departure hour (0-24). Default is None.
+        arrival_window (tuple[int, int], optional): Earliest and latest arrival hour (0-24). Default is None.
     """
 
-    __slots__ = ("date", "from_airport", "to_airport", "max_stops")
+    __slots__ = ("date", "from_airport", "to_airport", "max_stops", "airlines", "max_duration",
+                 "departure_window", "arrival_window")
     date: str
     from_airport: List[str]
     to_airport: List[str]
     max_stops: Optional[int]
+    airlines: Optional[List[str]]
+    max_duration: Optional[int]
+    departure_window: Optional[Tuple[int, int]]
+    arrival_window: Optional[Tuple[int, int]]
 
     def __init__(
         self,
@@ -30,11 +39,19 @@ class FlightData:
         from_airport: List[str],
         to_airport: List[str],
         max_stops: Optional[int] = None,
+        airlines: Optional[List[str]] = None,
+        max_duration: Optional[int] = None,
+        departure_window: Optional[Tuple[int, int]] = None,
+        arrival_window: Optional[Tuple[int, int]] = None,
     ):
         self.date = date
         self.from_airport = from_airport
         self.to_airport = to_airport
         self.max_stops = max_stops
+        self.airlines = airlines
+        self.max_duration = max_duration
+        self.departure_window = departure_window
+        self.arrival_window = arrival_window
 
     def attach(self, info: PB.Info) -> None:  # type: ignore
         data = info.data.add()
@@ -62,12 +79,28 @@ class FlightData:
         if self.max_stops is not None:
             data.max_stops = self.max_stops
 
+        if self.airlines:
+            data.airlines.extend(self.airlines)
+
+        if self.max_duration is not None:
+            data.max_duration = self.max_duration
+
+        if self.departure_window is not None:
+            data.time_window.earliest_departure, data.time_window.latest_departure = self.departure_window
+
+        if self.arrival_window is not None:
+            data.time_window.earliest_arrival, data.time_window.latest_arrival = self.arrival_window
+
     def __repr__(self) -> str:
         return (
             f"FlightData(date={self.date!r}, "
             f"from_airport={self.from_airport}, "
             f"to_airport={self.to_airport}, "
-            f"max_stops={self.max_stops})"
+            f"max_stops={self.max_stops}, "
+            f"airlines={self.airlines}, "
+            f"max_duration={self.max_duration}, "
+            f"departure_window={self.departure_window}, "
+            f"arrival_window={self.arrival_window})"
         )
 
 
@@ -112,12 +145,14 @@ class TFSData:
         trip: PB.Trip,  # type: ignore
         passengers: Passengers,
         max_stops: Optional[int] = None,  # Add max_stops to the constructor
+        max_price: Optional[int] = None,
     ):
         self.flight_data = flight_data
         self.seat = seat
         self.trip = trip
         self.passengers = passengers
         self.max_stops = max_stops  # Store max_stops
+        self.max_price = max_price
         self.search_mode = search_mode
 
     def pb(self) -> PB.Info:  # type: ignore
@@ -143,6 +178,9 @@ class TFSData:
             for flight in info.data:
                 flight.max_stops = self.max_stops
 
+        if self.max_price is not None:
+            info.price_limit.max_price = self.max_price
+
         return info
 
     def to_string(self) -> bytes:
@@ -160,6 +198,7 @@ class TFSData:
         passengers: Passengers,
         seat: Literal["economy", "premium-economy", "business", "first"],
         max_stops: Optional[int] = None,  # Add max_stops to the method signature
+        max_price: Optional[int] = None,
     ):
         """Use ``?tfs=`` from an interface.
 
@@ -169,6 +208,7 @@ class TFSData:
             passengers (Passengers): Passengers.
             seat ("economy" | "premium-economy" | "business" | "first"): Seat.
             max_stops (int, optional): Maximum number of stops.
+            max_price (int, optional): Maximum price of a flight, in the currency of the URL.
         """
         trip_t = {
             "round-trip": PB.Trip.ROUND_TRIP,
@@ -191,9 +231,10 @@ class TFSData:
             seat=seat_t,
             trip=trip_t,
             passengers=passengers,
-            max_stops=max_stops  # Pass max_stops into TFSData
+            max_stops=max_stops,  # Pass max_stops into TFSData
+            max_price=max_price,
         )
 
     def __repr__(self) -> str:
-        return f"TFSData(flight_data={self.flight_data!r}, max_stops={self.max_stops!r})"
+        return f"TFSData(flight_data={self.flight_data!r}, max_stops={self.max_stops!r}, max_price={self.max_price!r})"
 
@@ -13,23 +13,27 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0cschema.proto\"(\n\x07\x41irport\x12\x0c\n\x04TYPE\x18\x01 \x01(\x05\x12\x0f\n\x07\x61irport\x18\x02 \x01(\t\"|\n\nFlightData\x12\x0c\n\x04\x64\x61te\x18\x02 \x01(\t\x12\x1d\n\x0b\x66rom_flight\x18\r \x03(\x0b\x32\x08.Airport\x12\x1b\n\tto_flight\x18\x0e \x03(\x0b\x32\x08.Airport\x12\x16\n\tmax_stops\x18\x05 \x01(\x05H\x00\x88\x01\x01\x42\x0c\n\n_max_stops\"\xa8\x01\n\x04Info\x12\x19\n\x04\x64\x61ta\x18\x03 \x03(\x0b\x32\x0b.FlightData\x12\x13\n\x04seat\x18\t \x01(\x0e\x32\x05.Seat\x12\x1e\n\npassengers\x18\x08 \x01(\x0e\x32\n.Passenger\x12\x13\n\x04trip\x18\x13 \x01(\x0e\x32\x05.Trip\x12\x12\n\nmetadata_1\x18\x01 \x01(\x05\x12\x12\n\nmetadata_2\x18\x02 \x01(\x05\x12\x13\n\x0bsearch_mode\x18\x0e \x01(\x05*S\n\x04Seat\x12\x10\n\x0cUNKNOWN_SEAT\x10\x00\x12\x0b\n\x07\x45\x43ONOMY\x10\x01\x12\x13\n\x0fPREMIUM_ECONOMY\x10\x02\x12\x0c\n\x08\x42USINESS\x10\x03\x12\t\n\x05\x46IRST\x10\x04*E\n\x04Trip\x12\x10\n\x0cUNKNOWN_TRIP\x10\x00\x12\x0e\n\nROUND_TRIP\x10\x01\x12\x0b\n\x07ONE_WAY\x10\x02\x12\x0e\n\nMULTI_CITY\x10\x03*_\n\tPassenger\x12\x15\n\x11UNKNOWN_PASSENGER\x10\x00\x12\t\n\x05\x41\x44ULT\x10\x01\x12\t\n\x05\x43HILD\x10\x02\x12\x12\n\x0eINFANT_IN_SEAT\x10\x03\x12\x11\n\rINFANT_ON_LAP\x10\x04\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0cschema.proto\"(\n\x07\x41irport\x12\x0c\n\x04TYPE\x18\x01 \x01(\x05\x12\x0f\n\x07\x61irport\x18\x02 \x01(\t\"t\n\nTimeWindow\x12\x1a\n\x12\x65\x61rliest_departure\x18\x01 \x01(\x05\x12\x18\n\x10latest_departure\x18\x02 \x01(\x05\x12\x18\n\x10\x65\x61rliest_arrival\x18\x03 \x01(\x05\x12\x16\n\x0elatest_arrival\x18\x04 \x01(\x05\"\xf1\x01\n\nFlightData\x12\x0c\n\x04\x64\x61te\x18\x02 \x01(\t\x12\x1d\n\x0b\x66rom_flight\x18\r \x03(\x0b\x32\x08.Airport\x12\x1b\n\tto_flight\x18\x0e \x03(\x0b\x32\x08.Airport\x12\x16\n\tmax_stops\x18\x05 \x01(\x05H\x00\x88\x01\x01\x12\x10\n\x08\x61irlines\x18\x06 \x03(\t\x12%\n\x0btime_window\x18\x08 \x01(\x0b\x32\x0b.TimeWindowH\x01\x88\x01\x01\x12\x19\n\x0cmax_duration\x18\x0c \x01(\x05H\x02\x88\x01\x01\x42\x0c\n\n_max_stopsB\x0e\n\x0c_time_windowB\x0f\n\r_max_duration\"\x1f\n\nPriceLimit\x12\x11\n\tmax_price\x18\x01 \x01(\x05\"\xdf\x01\n\x04Info\x12\x19\n\x04\x64\x61ta\x18\x03 \x03(\x0b\x32\x0b.FlightData\x12\x13\n\x04seat\x18\t \x01(\x0e\x32\x05.Seat\x12\x1e\n\npassengers\x18\x08 \x01(\x0e\x32\n.Passenger\x12\x13\n\x04trip\x18\x13 \x01(\x0e\x32\x05.Trip\x12\x12\n\nmetadata_1\x18\x01 \x01(\x05\x12\x12\n\nmetadata_2\x18\x02 \x01(\x05\x12\x13\n\x0bsearch_mode\x18\x0e \x01(\x05\x12%\n\x0bprice_limit\x18\x10 \x01(\x0b\x32\x0b.PriceLimitH\x00\x88\x01\x01\x42\x0e\n\x0c_price_limit*S\n\x04Seat\x12\x10\n\x0cUNKNOWN_SEAT\x10\x00\x12\x0b\n\x07\x45\x43ONOMY\x10\x01\x12\x13\n\x0fPREMIUM_ECONOMY\x10\x02\x12\x0c\n\x08\x42USINESS\x10\x03\x12\t\n\x05\x46IRST\x10\x04*E\n\x04Trip\x12\x10\n\x0cUNKNOWN_TRIP\x10\x00\x12\x0e\n\nROUND_TRIP\x10\x01\x12\x0b\n\x07ONE_WAY\x10\x02\x12\x0e\n\nMULTI_CITY\x10\x03*_\n\tPassenger\x12\x15\n\x11UNKNOWN_PASSENGER\x10\x00\x12\t\n\x05\x41\x44ULT\x10\x01\x12\t\n\x05\x43HILD\x10\x02\x12\x12\n\x0eINFANT_IN_SEAT\x10\x03\x12\x11\n\rINFANT_ON_LAP\x10\x04\x62\x06proto3')
 
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'schema_pb2', globals())
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
-  _SEAT._serialized_start=355
-  _SEAT._serialized_end=438
-  _TRIP._serialized_start=440
-  _TRIP._serialized_end=509
-  _PASSENGER._serialized_start=511
-  _PASSENGER._serialized_end=606
+  _SEAT._serialized_start=679
+  _SEAT._serialized_end=762
+  _TRIP._serialized_start=764
+  _TRIP._serialized_end=833
+  _PASSENGER._serialized_start=835
+  _PASSENGER._serialized_end=930
   _AIRPORT._serialized_start=16
   _AIRPORT._serialized_end=56
-  _FLIGHTDATA._serialized_start=58
-  _FLIGHTDATA._serialized_end=182
-  _INFO._serialized_start=185
-  _INFO._serialized_end=353
+  _TIMEWINDOW._serialized_start=58
+  _TIMEWINDOW._serialized_end=174
+  _FLIGHTDATA._serialized_start=177
+  _FLIGHTDATA._serialized_end=418
+  _PRICELIMIT._serialized_start=420
+  _PRICELIMIT._serialized_end=451
+  _INFO._serialized_start=454
+  _INFO._serialized_end=677
 # @@protoc_insertion_point(module_scope)
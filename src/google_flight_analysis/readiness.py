@@ -0,0 +1,63 @@
+from selenium.common.exceptions import WebDriverException
+
+from config.setup_logging import init_logger
+
+__all__ = ['wait_until_ready', 'CONSENT', 'RESULTS', 'NO_RESULTS', 'TIMEOUT']
+
+logger = init_logger(__name__)
+
+CONSENT = 'consent'         # "Before you continue to Google" dialog
+RESULTS = 'results'         # Result elements rendered and stable
+NO_RESULTS = 'no_results'   # "No results returned" rendered
+TIMEOUT = 'timeout'
+
+# Resolves as soon as the page reaches one of the states above. Mutations are checked at most every 50 ms,
+# and results only count once no mutation happened for `quiet` ms (the list stopped growing).
+READY_JS = '''
+const [selector, timeout, quiet] = arguments;
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+let finished = false, pending = false, settle = null;
+
+const finish = state => {
+	if (finished) return;
+	finished = true;
+	observer.disconnect();
+	clearTimeout(timer);
+	clearTimeout(settle);
+	done({state: state, ms: Math.round(performance.now() - start), count: document.querySelectorAll(selector).length});
+};
+const check = () => {
+	pending = false;
+	if (document.querySelector(selector)) {
+		clearTimeout(settle);
+		settle = setTimeout(() => finish('results'), quiet);
+		return;
+	}
+	const text = document.body ? document.body.innerText : '';
+	if (text.includes('Before you continue to Google')) finish('consent');
+	else if (text.includes('No results returned')) finish('no_results');
+};
+const schedule = () => { if (!pending) { pending = true; setTimeout(check, 50); } };
+
+const observer = new MutationObserver(schedule);
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+const timer = setTimeout(() => finish('timeout'), timeout);
+check();
+'''
+
+
+def wait_until_ready(driver, selector: str, timeout=10, quiet=0.3) -> dict:
+    """
+    Wait in a single `execute_async_script` call until the page shows the consent dialog, stable `selector`
+    results or "No results returned" (or `timeout` seconds went by).
+
+    Returns {'state': ..., 'ms': milliseconds waited, 'count': elements matching `selector`}, with a None state if the
+    script could not run (the caller then falls back to polling).
+    """
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return driver.execute_async_script(READY_JS, selector, int(timeout * 1000), int(quiet * 1000))
+    except WebDriverException as e:
+        logger.warning(f'Readiness script failed, falling back to polling: {e.msg}')
+        return {'state': None, 'ms': None, 'count': None}
@@ -0,0 +1,112 @@
+import threading
+from fnmatch import fnmatch
+from selenium.common.exceptions import WebDriverException
+
+from config.config import ScraperConfig
+from config.setup_logging import init_logger
+
+__all__ = ['ResourcePolicy', 'resource_policy']
+
+conf = ScraperConfig()
+logger = init_logger(__name__)
+
+# Bytes transferred by the current page (document + sub-resources) and its load time, from the Performance API
+PAGE_STATS_JS = '''
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+	bytes: (nav ? nav.transferSize : 0) + resources.reduce((total, r) => total + (r.transferSize || 0), 0),
+	requests: resources.length + 1,
+	load_ms: Math.round(nav && nav.loadEventEnd ? nav.loadEventEnd : performance.now()),
+};
+'''
+
+
+class ResourcePolicy:
+    """
+    Blocks the resources a scraping session never reads (images, map tiles, fonts, analytics) in every driver,
+    with CDP `Network.setBlockedURLs`, and records what each page still transferred.
+
+    `blocked` are URL patterns with `*` wildcards. `allowed` are URLs (or patterns) that must keep loading:
+    the blocked patterns that would catch one of them are not applied.
+
+    Blocked resources are never requested, so their size is unknown: the per-page stats (bytes transferred,
+    requests, load time) are what the savings are measured with, against a run with BLOCK_RESOURCES off.
+
+    Usage:
+        resource_policy.apply(driver)           # once per driver (see new_driver)
+        resource_policy.measure(driver, url)    # after each page load
+        resource_policy.summary()
+    """
+    def __init__(self, blocked=None, allowed=None, enabled=True):
+        self.blocked = list(blocked or [])
+        self.allowed = list(allowed or [])
+        self.enabled = enabled
+        self.stats = []
+        self._lock = threading.Lock()
+
+
+    def __repr__(self):
+        return f"ResourcePolicy({len(self.patterns)} blocked patterns, enabled={self.enabled})"
+
+
+    @classmethod
+    def from_config(cls, conf=conf):
+        return cls(conf.BLOCKED_RESOURCES, conf.RESOURCE_ALLOWLIST, enabled=conf.BLOCK_RESOURCES)
+
+
+    @property
+    def patterns(self) -> list:
+        return [pattern for pattern in self.blocked if not any(fnmatch(url, pattern) for url in self.allowed)]
+
+
+    def apply(self, driver) -> bool:
+        """Block the policy patterns in `driver` for all its next page loads. Returns False if CDP is unavailable."""
+        if not self.enabled or not self.patterns:
+            return False
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+        except WebDriverException as e:
+            logger.warning(f'Could not apply resource policy: {e.msg}')
+            return False
+        return True
+
+
+    def measure(self, driver, url: str = None):
+        """
+        Record the bytes, requests and load time of the page loaded in `driver`. Returns the record (None if it can't
+        be read). Pages are also measured with the policy disabled, as the baseline of the savings.
+        """
+        try:
+            record = dict(driver.execute_script(PAGE_STATS_JS) or {})
+        except WebDriverException as e:
+            logger.debug(f'Could not measure page resources: {e.msg}')
+            return None
+
+        record['url'] = url
+        with self._lock:
+            self.stats.append(record)
+        logger.debug(f"Page loaded {record.get('bytes', 0) / 1024:.0f} kB in {record.get('requests')} requests "
+                     f"and {record.get('load_ms')} ms with {len(self.patterns) if self.enabled else 0} blocked patterns")
+        return record
+
+
+    def summary(self, reset=False) -> dict:
+        """Pages measured, with their total and mean bytes transferred and their mean load time."""
+        with self._lock:
+            stats = self.stats
+            if reset:
+                self.stats = []
+        if not stats:
+            return {'pages': 0, 'bytes': 0, 'mean_bytes': 0, 'mean_load_ms': 0}
+        total = sum(record.get('bytes', 0) for record in stats)
+        return {
+            'pages': len(stats),
+            'bytes': total,
+            'mean_bytes': total // len(stats),
+            'mean_load_ms': sum(record.get('load_ms', 0) for record in stats) // len(stats),
+        }
+
+
+resource_policy = ResourcePolicy.from_config()
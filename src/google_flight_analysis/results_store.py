@@ -0,0 +1,125 @@
+import datetime as dt
+import glob
+import os
+import threading
+import uuid
+import pandas as pd
+import pyarrow.dataset as ds
+
+from config.config import ROOT_DIR
+from config.setup_logging import init_logger
+from src.google_flight_analysis.dedup_index import DedupIndex
+
+__all__ = ['ResultsStore', 'RESULTS_SCHEMA']
+
+logger = init_logger(__name__)
+
+# Column types of the stored results, shared with the legacy weekly_results.parquet
+RESULTS_SCHEMA = {
+    'departure_datetime': 'datetime64[ns]',
+    'origin': str,
+    'destination': str,
+    'airline': str,
+    'price_eur': 'int64',
+    'num_stops': 'int64',
+    'travel_time_minutes': 'int64',
+    'days_left': 'int64',
+}
+
+
+class ResultsStore:
+    """
+    Append-only store of the scraped results, partitioned on disk as
+    `<root>/search_date=YYYY-MM-DD/route=ORG-DST/part-<id>.parquet`.
+
+    Every append only writes its new rows: rows already stored are skipped through the DedupIndex kept next to the
+    partitions, so the cost of an append no longer grows with the size of the store.
+
+    Usage:
+        store = ResultsStore()
+        store.append(df, search_date='2026-10-18')
+        store.read()  # All stored results
+    """
+    PREVIEW_FILE = 'preview.csv'
+    LEGACY_FILE = 'weekly_results.parquet'
+    INDEX_FILE = '_dedup_index.bin'
+
+    def __init__(self, root=os.path.join(ROOT_DIR, 'data/results/raw')):
+        self.root = root
+        self.index = DedupIndex(os.path.join(root, self.INDEX_FILE))
+        self._lock = threading.Lock()
+
+
+    def __repr__(self):
+        return f"ResultsStore({self.root}, {len(self.files())} files)"
+
+
+    def append(self, df: pd.DataFrame, search_date: str = None) -> pd.DataFrame:
+        """Store the rows of `df` that are not stored yet. Returns the rows that were written."""
+        search_date = search_date or dt.date.today().isoformat()
+        df = df[list(RESULTS_SCHEMA)].astype(RESULTS_SCHEMA)
+
+        with self._lock:
+            if not self.index.exists() and self.files():
+                self.rebuild_index()
+            df = df[self.index.new_rows(df)]
+            if df.empty:
+                return df
+
+            for (origin, destination), route_df in df.groupby(['origin', 'destination'], sort=False):
+                partition = os.path.join(self.root, f'search_date={search_date}', f'route={origin}-{destination}')
+                os.makedirs(partition, exist_ok=True)
+                route_df.to_parquet(os.path.join(partition, f'part-{uuid.uuid4().hex[:12]}.parquet'), index=False)
+            self.index.add(df)
+
+            self._append_preview(df)
+
+        logger.debug(f"Saved {len(df)} new results to {self.root}/search_date={search_date}")
+        logger.debug(f"New results:\n{df.head(5)}")
+        return df
+
+
+    def files(self, search_date: str = None) -> list:
+        """Parquet files of the store (of one search date only if given), including the legacy single file."""
+        pattern = os.path.join(self.root, f'search_date={search_date or "*"}', 'route=*', '*.parquet')
+        files = sorted(glob.glob(pattern))
+        legacy = os.path.join(self.root, self.LEGACY_FILE)
+        if search_date is None and os.path.exists(legacy):
+            files.insert(0, legacy)
+        return files
+
+
+    def read(self, files: list = None) -> pd.DataFrame:
+        files = self.files() if files is None else files
+        if not files:
+            return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in RESULTS_SCHEMA.items()})
+        df = ds.dataset(files, format='parquet').to_table().to_pandas()
+        return df[list(RESULTS_SCHEMA)].astype(RESULTS_SCHEMA)
+
+
+    def clear(self, files: list = None):
+        """Delete stored files (all of them by default), e.g. once they are merged into the master dataset."""
+        with self._lock:
+            files = self.files() if files is None else files
+            for path in files:
+                os.remove(path)
+                partition = os.path.dirname(path)
+                if partition != self.root and not os.listdir(partition):
+                    os.removedirs(partition)  # Also removes the emptied search_date directory
+            if not self.files():
+                for name in (self.INDEX_FILE, self.PREVIEW_FILE):
+                    if os.path.exists(os.path.join(self.root, name)):
+                        os.remove(os.path.join(self.root, name))
+                self.index = DedupIndex(os.path.join(self.root, self.INDEX_FILE))
+
+
+    def rebuild_index(self):
+        """Rebuild the dedup index from the stored files."""
+        self.index.rebuild(self.read())
+
+
+    def _append_preview(self, df: pd.DataFrame):
+        # One random row of every append, to eyeball the stored results
+        preview_path = os.path.join(self.root, self.PREVIEW_FILE)
+        header = not os.path.exists(preview_path)
+        df.sample(n=1, random_state=42).to_csv(preview_path, mode='a', header=header, index=False)
@@ -5,38 +5,90 @@
 from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
-import chromedriver_autoinstaller
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
 import json
 import numpy as np
 import pandas as pd
 import re
+import time
 from tqdm import tqdm
 
+from config.config import ScraperConfig
 from config.setup_logging import init_logger
 from src.google_flight_analysis.analysis import save_results
+from src.google_flight_analysis.cache import ResultCache
+from src.google_flight_analysis.driver_pool import DriverPool
+from src.google_flight_analysis.executor import ScrapeExecutor, scrape_object
+from src.google_flight_analysis.explore_parser import explore_dataframe, explore_records
 from src.google_flight_analysis.flight import *
+from src.google_flight_analysis.http_fetch import HttpFetcher
 from src.google_flight_analysis.human_simulations import *
+from src.google_flight_analysis.network_capture import drain_log, wait_for_response, parse_shopping_results, parse_calendar_prices, CALENDAR_PRICES
+from src.google_flight_analysis.readiness import wait_until_ready, CONSENT, RESULTS
+from src.google_flight_analysis.resource_policy import resource_policy
 from src.google_flight_analysis.protobuf.protobuf_construc import FlightData, Passengers, TFSData
 
-__all__ = ['Scrape', '_Scrape', 'ScrapeObjects']
-chromedriver_autoinstaller.install() # Check if chromedriver is installed correctly and on path
+__all__ = ['Scrape', '_Scrape', 'ScrapeObjects', 'iter_scrape', 'DriverPool', 'ScrapeExecutor']
 logger = init_logger(__name__)
+conf = ScraperConfig()
 
 date_format = "%Y-%m-%d"
+VERIFIED_FILTERS = ('max_stops', 'airlines')  # tfs fields known to work, the others are only pushed with PUSH_FILTERS
+result_cache = ResultCache()
+http_fetcher = HttpFetcher()
+
+# Reads every flight card (li.pIav2d) of the results page in a single round-trip to the browser
+FLIGHT_RECORDS_JS = '''
+const text = (el, sel) => { const e = el.querySelector(sel); return e ? e.innerText.trim() : null; };
+return Array.from(document.querySelectorAll('li.pIav2d'), li => {
+	const lines = li.innerText.split('\\n').map(l => l.trim()).filter(l => l);
+	const find = re => { for (const l of lines) { const m = l.match(re); if (m) return m; } return null; };
+	const times = Array.from(li.querySelectorAll('span.mv1WYe div'), e => e.innerText.trim());
+	const route = find(/^([A-Z]{3})\\W+([A-Z]{3})$/);
+	const layover = find(/^(?=.*(hr|min)).*[A-Z]{3}$|^[A-Z]{3}(, [A-Z]{3})+$/);
+	const co2 = find(/^[\\d,]+ kg CO2e$/);
+	const emissions = find(/^([+-]?\\d+%|Avg) emissions$/);
+	return {
+		departure: times[0] || null,
+		arrival: times[1] || null,
+		days_ahead: text(li, 'span.bOzv6'),
+		origin: route ? route[1] : null,
+		dest: route ? route[2] : null,
+		airline: text(li, 'div.sSHqwe.tPgKwe.ogfYpf span'),
+		travel_time: text(li, 'div.Ak5kof div'),
+		stops: text(li, 'div.BbR8Ec .ogfYpf'),
+		layover: layover ? layover[0] : null,
+		price: text(li, 'div.YMlIz.FpEdX'),
+		co2: co2 ? co2[0] : null,
+		emissions: emissions ? emissions[0] : null,
+		lines: lines,
+	};
+});
+'''
 
-# Loading some browser options to bypass anti-bot systems
+# Reads every destination card (div.tsAU4e) of an explore page, instead of shipping its whole page source
+EXPLORE_RECORDS_JS = '''
+const text = (el, sel) => { const e = el.querySelector(sel); return e ? e.innerText.trim() : null; };
+return Array.from(document.querySelectorAll('div.tsAU4e'), card => {
+	const travel = card.querySelector('div.o9JBjb.sSHqwe');
+	return {
+		city: text(card, 'h3.W6bZuc.YMlIz'),
+		price: text(card, 'div.MJg7fb.QB2Jof span'),
+		stops: text(card, 'span.nx0jzf'),
+		flight_time: text(card, 'span.Xq1DAb'),
+		spans: travel ? travel.querySelectorAll('span').length : 0,
+	};
+});
+'''
 
-options = Options()
-options.add_argument('--log-level=3')
-options.add_argument("--disable-gpu")
-caps = DesiredCapabilities.CHROME.copy()
-caps["goog:loggingPrefs"] = {"performance": "ALL"}
+# Reads the (date, text) of every day cell of the open date grid, the text holds its cheapest price
+CALENDAR_CELLS_JS = '''
+return Array.from(document.querySelectorAll('[data-iso]'), el => [el.getAttribute('data-iso'), el.innerText]);
+'''
 
 '''
 TODO:
@@ -46,46 +98,57 @@ TODO:
 '''
 
 
-def ScrapeObjects(objs, env, headless=False, add_cookies=False, deep_copy=False):
+def ScrapeObjects(objs, env, headless=False, add_cookies=False, deep_copy=False, pool=None):
 	if type(objs) is _Scrape:
 		objs = [objs]
 
-	user_agent = get_user_agent()
-	options.add_argument(f"user-agent={user_agent}")
-	logger.debug(f'User agent chosen: {user_agent}')
-	if headless or env == 'production':	# Necessary for Github Actions
-		options.add_argument("--headless")
-		options.add_argument("--no-sandbox")
-		options.add_argument("--disable-dev-shm-usage")
-		options.add_argument("--disable-blink-features=AutomationControlled") 
-
-	driver = webdriver.Chrome(options=options)
-	driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-
-	if add_cookies:  # Load and add cookies to Selenium driver
-		with open('data/cookies.json', 'r') as f:
-			cookies = json.load(f)
-		for cookie in cookies:
-			driver.add_cookie(cookie)
-		driver.refresh()
-
-	driver.set_window_size(1920, 1080)
-	random_wait(0.01, 0.03)
-	# simulate_mouse_movement(driver, 3, 10)
-	# simulate_scroll(driver, 1, 2)
-
-	# modifies the objects in-place
-	if env == 'local':
-		debug = [obj._scrape_data(driver) for obj in tqdm(objs, desc="Scraping Objects")]
-	elif env == 'production':
-		for obj in objs:
-			obj._scrape_data(driver)
-	
-	driver.quit()
+	if pool is None:  # One-off driver, prefer sharing a DriverPool for the whole job
+		with DriverPool(env, headless=headless, size=1, add_cookies=add_cookies, warm_up=False) as pool:
+			return ScrapeObjects(objs, env, deep_copy=deep_copy, pool=pool)
+
+	# modifies the objects in-place, cached queries don't need a browser
+	objs_scrape = [obj for obj in objs if not obj._scrape_cached()]
+	if len(objs_scrape) < len(objs):
+		logger.info(f'{len(objs) - len(objs_scrape)}/{len(objs)} queries served from the result cache')
+
+	if conf.HTTP_FETCH and objs_scrape:  # Server-rendered pages first, only the ones without results need a browser
+		with ThreadPoolExecutor(max_workers = pool.size) as executor:
+			fetched = list(executor.map(lambda obj: obj._scrape_http(), objs_scrape))
+		logger.info(f'{sum(fetched)}/{len(objs_scrape)} queries fetched over HTTP')
+		objs_scrape = [obj for obj, done in zip(objs_scrape, fetched) if not done]
+
+	if pool.size > 1 and len(objs_scrape) > 1:
+		ScrapeExecutor(pool).run(objs_scrape, progress=(env == 'local'))
+	elif objs_scrape and env == 'local':
+		debug = [scrape_object(obj, pool) for obj in tqdm(objs_scrape, desc="Scraping Objects")]
+	elif objs_scrape and env == 'production':
+		for obj in objs_scrape:
+			scrape_object(obj, pool)
 
 	if deep_copy:
 		return objs # returns objs as copy
 
+
+def iter_scrape(objs, env, headless=False, pool=None, release=False):
+	'''
+		Scrape the queries and yield (query, results frame) as each one completes, so downstream work runs while
+		the browsers wait for the next pages. Queries are served from the result cache or over HTTP (HTTP_FETCH)
+		when possible, like ScrapeObjects. `objs` may be a generator.
+		With release, the data of a query is dropped once the consumer moves on, to bound memory on long runs.
+	'''
+	if pool is None:  # One-off driver, prefer sharing a DriverPool for the whole job
+		with DriverPool(env, headless=headless, size=1, warm_up=False) as pool:
+			yield from iter_scrape(objs, env, pool=pool, release=release)
+		return
+
+	def without_browser(obj):
+		return obj._scrape_cached() or (conf.HTTP_FETCH and obj._scrape_http())
+
+	for obj in ScrapeExecutor(pool).iter(objs, without_browser=without_browser):
+		yield obj, obj.data
+		if release:
+			obj.data = pd.DataFrame()
+
 class _Scrape:
 
 	def __init__(self):
@@ -96,6 +159,11 @@ class _Scrape:
 		self._url = None
 		self._type = None
 		self._explore = False
+		self._filters = {}
+		self._bundled = False
+		self._calendar = None
+		self._live = False
+		self._timings = []
 		self.pattern_iata = re.compile(r'^[A-Z]{3}$')
 
 	# if date leave and date return, return 2 objects?
@@ -433,6 +501,87 @@ class _Scrape:
 	def url(self):
 		return self._url
 
+	@property
+	def filters(self):
+		return self._filters
+
+	def set_filters(self, max_price = None, max_duration = None, max_stops = None, airlines = None,
+					departure_window = None, arrival_window = None):
+		'''
+			Filter the results of the query. max_stops and airlines are pushed into the query URL (tfs), so Google
+			Flights only returns the flights that pass them. The other filters are applied to the scraped results,
+			they are only pushed too with ScraperConfig.PUSH_FILTERS. Only one-way queries on a single date are
+			encoded as tfs, other queries apply all their filters to the results.
+			max_price in EUR, max_duration in minutes, windows as (earliest hour, latest hour), both included.
+			Pages scraped with filters in their URL are not saved to the results store, it only keeps complete pages.
+		'''
+		assert self._data.shape[0] == 0, "Can't set filters after query has been completed."
+		filters = {
+			'max_price': max_price, 'max_duration': max_duration, 'max_stops': max_stops, 'airlines': airlines,
+			'departure_window': departure_window, 'arrival_window': arrival_window,
+		}
+		self._filters = {key: value for key, value in filters.items() if value is not None}
+
+		if self._bundled or (self._type == 'one-way' and len(self._date) == 1 and self._url_filters()):
+			self._url = self._make_url(tfs = True)
+		elif self._url_filters():
+			logger.debug(f"Filters are only pushed into one-way or bundled queries, {self._type} query left unfiltered")
+		return self
+
+	@property
+	def bundled(self):
+		return self._bundled
+
+	def bundle(self):
+		'''
+			Scrape a round-trip or chain query with one round-trip/multi-city TFS URL instead of one URL per leg.
+			Its results are the flights of the first leg, each with the 'Price' of the cheapest whole trip that starts
+			with it (the page prices trips, not legs) and the 'Trip' type. They are not saved to the results store.
+		'''
+		assert self._type in ('round-trip', 'chain-trip', 'perfect-chain'), "Only round-trip and chain queries can be bundled."
+		assert self._data.shape[0] == 0, "Can't bundle a query after it has been completed."
+		self._bundled = True
+		self._url = self._make_url(tfs = True)
+		return self
+
+	@property
+	def is_live(self):
+		return self._live
+
+	def live(self):
+		'''
+			Scrape the query for a live answer (the bot's /precio): its pages are always loaded, never read from the
+			result cache, and its results are not saved to the results store, only the scheduled jobs feed it.
+		'''
+		assert self._data.shape[0] == 0, "Can't make a live query after it has been completed."
+		self._live = True
+		return self
+
+	@property
+	def timings(self):
+		'''
+			Latency (ms) of the stages of every page load of the query: load, consent (if the dialog showed up),
+			ready (until results, "No results" or timeout) and extract.
+		'''
+		return self._timings
+
+	@property
+	def calendar_end(self):
+		return self._calendar
+
+	def calendar(self, date_to):
+		'''
+			Scrape the price calendar (date grid) of a one-way query instead of its flights: a single page load gives
+			the cheapest price of every day from the query date to date_to, as a 'Date'/'Price' frame.
+			The date grid shows about two months, days it doesn't show are left out of the frame.
+		'''
+		assert self._type == 'one-way' and len(self._date) == 1, "Only one-way queries have a price calendar."
+		assert self._data.shape[0] == 0, "Can't make a calendar query after it has been completed."
+		assert self._date[0] <= date_to, "Dates are not in order. Make sure to provide them in increasing order in YYYY-MM-DD format."
+		self._calendar = date_to
+		self._url = self._make_url(tfs = True)
+		return self
+
 	@property
 	def type(self):
 		return self._type
@@ -442,34 +591,117 @@ class _Scrape:
 		Scrape the object. Add support for multiple queries, iterative.
 	'''
 	def _scrape_data(self, driver):
+		if self._calendar:
+			self._data = self._get_calendar(self._url[0], driver)
+			return
+
 		results = [self._get_results(url, self._date[i], driver) for i, url in enumerate(self._url)]
 		results = [res for res in results if isinstance(res, pd.DataFrame)]  # Filter out timeouts
 		if results:
-			self._data = pd.concat(results, ignore_index=True)
+			self._data = self._apply_filters(pd.concat(results, ignore_index=True))
 		else:
 			logger.warning("No results found for the given query.")
 			self._data = pd.DataFrame()
-			
 
+	def _scrape_cached(self):
+		'''
+			Fill the object from the result cache. Returns False if any of its URLs still has to be scraped.
+		'''
+		if self._live:
+			return False
+		if self._calendar:
+			results = [result_cache.get(self._calendar_key(url)) for url in self._url]
+		else:
+			results = [result_cache.get(url) for url in self._url]
+		if any(res is None for res in results):
+			return False
+		self._data = pd.concat(results, ignore_index=True)
+		if not self._calendar:
+			self._data = self._apply_filters(self._data)
+		return True
+
+
+
+	def _scrape_http(self):
+		'''
+			Fill the object from its server-rendered result pages, without a browser (see HttpFetcher).
+			Returns False if any of its pages has no flight results, the object is then left to the driver.
+		'''
+		if self._explore or self._calendar or any(dt.date.fromisoformat(date) < dt.date.today() for date in self._date):
+			return False
+
+		results = []
+		for i, url in enumerate(self._url):
+			records = http_fetcher.records(url)
+			flights = self._clean_records(records, self._date[i]) if records else []
+			if not flights:
+				return False
+			results.append(self._store_results(url, Flight.dataframe(flights)))
+		self._data = self._apply_filters(pd.concat(results, ignore_index=True))
+		return True
+
+	def _url_filters(self):
+		# Filters encoded in tfs URLs, the reverse-engineered fields only with PUSH_FILTERS
+		return {key: value for key, value in self._filters.items() if key in VERIFIED_FILTERS or conf.PUSH_FILTERS}
+
+	def _pushed_filters(self):
+		# Filters actually in the query URLs, plain (q=) URLs carry none
+		return self._url_filters() if any('tfs=' in url for url in self._url) else {}
+
+	def _apply_filters(self, flights_df):
+		'''
+			Apply the filters that are not in the query URLs to the results. Pages are cached and stored unfiltered,
+			so queries of different jobs on the same route and day share their URL.
+		'''
+		pending = {key: value for key, value in self._filters.items() if key not in self._pushed_filters()}
+		if flights_df.empty or not pending or self._explore:
+			return flights_df
+
+		mask = pd.Series(True, index=flights_df.index)
+		if 'max_price' in pending:
+			mask &= flights_df['Price'] <= pending['max_price']
+		if 'max_duration' in pending:
+			mask &= flights_df['Travel_Time'] <= pd.Timedelta(minutes=pending['max_duration'])
+		if 'max_stops' in pending:
+			mask &= (flights_df['Num_Stops'] <= pending['max_stops']).fillna(True)
+		for key, column in (('departure_window', 'Departure datetime'), ('arrival_window', 'Arrival datetime')):
+			if key in pending:
+				mask &= flights_df[column].dt.hour.between(*pending[key])
+		# airlines are matched by IATA code in the URL, the results only have their names: not applied
+		return flights_df[mask.to_numpy()].reset_index(drop=True)
 
 	def _make_url(self, tfs: bool = False, max_stops: int = 2):
-		'''Make the URL for the query. If tfs is True, use TFSData to create a b64 encoded URL.'''
+		'''
+			Make the URL for the query. If tfs is True, use TFSData to create a b64 encoded URL (with the query filters).
+			Bundled queries (see bundle) encode all their legs in a single round-trip or multi-city TFS URL.
+		'''
 
 		urls = []
+		filters = {key: value for key, value in self._url_filters().items() if key != 'max_price'}
+		filters.setdefault('max_stops', max_stops)
 		if tfs and len(self._date) == 1:
 			flight_data=[
 				FlightData(
 					date=self._date[0],
                 	from_airport=self._origin,
-                	to_airport=self._dest
+                	to_airport=self._dest,
+					**filters
 					)
 				]
-			for fd in flight_data:
-				fd.max_stops = max_stops
+			trip = 'one-way'
+
+		elif tfs and self._bundled:
+			flight_data = [
+				FlightData(date=date, from_airport=[self._origin[i]], to_airport=[self._dest[i]], **filters)
+				for i, date in enumerate(self._date)
+			]
+			trip = 'round-trip' if self._type == 'round-trip' else 'multi-city'
 
+		if tfs and (len(self._date) == 1 or self._bundled):
 			filter = TFSData.from_interface(
 				explore_mode=self._explore,
-				flight_data=flight_data, trip='one-way', passengers=Passengers(adults=1), seat='economy'
+				flight_data=flight_data, trip=trip, passengers=Passengers(adults=1), seat='economy',
+				max_price=self._url_filters().get('max_price')
 			)
 			b64 = filter.as_b64().decode('utf-8')
 
@@ -493,6 +725,10 @@ class _Scrape:
 			logger.warning(f"Search date {search_date} is in the past")
 			flights = []
 		else:
+			cached_df = None if self._live else result_cache.get(url)
+			if cached_df is not None:
+				return cached_df
+
 			results = None
 			try:
 				results = self._make_url_request(url, driver)
@@ -505,20 +741,97 @@ class _Scrape:
 
 			if self._explore:
 				explore_df = self._process_explore(results)
+				result_cache.put(url, explore_df)
 				return explore_df
 			else:
 				flights = self._clean_results(results, date)
 				if not flights:
 					return -1
-				flights_df = Flight.dataframe(flights)
+				return self._store_results(url, Flight.dataframe(flights))
+
+	def _store_results(self, url, flights_df):
+		if self._bundled:
+			flights_df['Trip'] = self._type
 
-				# Save all results to database
-				if len(flights_df):
-					save_results(flights_df)
+		# Save all results to database (bundled prices are whole trips, not fares of a leg, pages filtered by
+		# their URL would thin the dataset to the fares of one job and live queries are not scheduled scrapes)
+		if len(flights_df):
+			if not self._bundled and not self._live and not self._pushed_filters():
+				save_results(flights_df)
+			result_cache.put(url, flights_df)
 
-				return flights_df
+		return flights_df
+
+	def _calendar_key(self, url):
+		# Calendars are cached apart from the flights of the same URL
+		return f'{url}#calendar={self._calendar}'
+
+	def _get_calendar(self, url, driver):
+		'''
+			Cheapest price of every day of the calendar query, from the calendar response (or the date grid cells).
+		'''
+		cached_df = None if self._live else result_cache.get(self._calendar_key(url))
+		if cached_df is not None:
+			return cached_df
+
+		drain_log(driver)
+		try:
+			self._load_page(url, driver, 'input[placeholder="Departure"]')
+		except TimeoutException:
+			logger.warning(f'TimeoutException while loading the price calendar of {self._origin} --> {self._dest}')
+			return pd.DataFrame(columns = ['Date', 'Price'])
+
+		prices = {}
+		if self._open_date_grid(driver):
+			try:
+				body = wait_for_response(driver, CALENDAR_PRICES, timeout = conf.NETWORK_TIMEOUT)
+				prices = parse_calendar_prices(body) if body else {}
+			except WebDriverException as e:
+				logger.warning(f'Price calendar capture failed, falling back to the date grid: {e.msg}')
+			if not prices:
+				prices = self._get_calendar_cells(driver)
+		resource_policy.measure(driver, url)
+
+		calendar_df = pd.DataFrame(sorted(prices.items()), columns = ['Date', 'Price'])
+		calendar_df = calendar_df[calendar_df['Date'].between(self._date[0], self._calendar)].reset_index(drop = True)
+		if calendar_df.empty:
+			logger.warning(f'No price calendar found for {self._date[0]} to {self._calendar}: {self._origin} --> {self._dest}')
+		else:
+			result_cache.put(self._calendar_key(url), calendar_df)
+		return calendar_df
+
+	@staticmethod
+	def _open_date_grid(driver):
+		# The date grid of the departure field requests the calendar prices of the months it shows
+		try:
+			field = WebDriverWait(driver, 10).until(
+				EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[placeholder="Departure"]'))
+			)
+			field.click()
+			return True
+		except (TimeoutException, WebDriverException):
+			logger.warning('Could not open the date grid (departure field not found)')
+			return False
+
+	@staticmethod
+	def _get_calendar_cells(driver):
+		try:
+			WebDriverWait(driver, 5).until(lambda d: len(d.find_elements(By.CSS_SELECTOR, '[data-iso]')) > 0)
+			cells = driver.execute_script(CALENDAR_CELLS_JS) or []
+		except (TimeoutException, WebDriverException):
+			logger.warning('No date grid cells found')
+			return {}
+		prices = {}
+		for date, text in cells:
+			match = re.search(r'€\s?([\d,]+)', text or '')
+			if match:
+				prices[date] = int(match.group(1).replace(',', ''))
+		return prices
 
 	def _clean_results(self, result, date):
+		if result and isinstance(result[0], dict):
+			return self._clean_records(result, date)
+
 		res2 = [x.encode("ascii", "ignore").decode().strip() for x in result]
 
 		if any("No results returned" in term for term in res2):
@@ -569,71 +882,90 @@ class _Scrape:
 
 		return flights
 	
+	def _clean_records(self, records, date):
+		'''
+			Build flights from the records of _get_flight_records (see Flight.from_records).
+		'''
+		flights = Flight.from_records(date, records)
+		if not flights:
+			logger.warning(f'No flights found for query {self}')
+		return flights
+
 	def _process_explore(self, results):
-		soup = BeautifulSoup(results, 'html.parser')
-		data = []
+		'''
+			Destinations of an explore page, from the card records of the in-page extractor or from the page source.
+		'''
+		records = results if isinstance(results, list) else explore_records(results)
+		return explore_dataframe(records)
 
-		# Iterate over each flight entry
-		for item in soup.select('div.tsAU4e'):
-			try:
-				# Check for car travel distance by counting <span> tags in o9JBjb sSHqwe
-				travel_info = item.select_one('div.o9JBjb.sSHqwe')
-				if travel_info:
-					spans = travel_info.find_all('span')
-					if len(spans) > 3:
-						continue  # Skip this entry
-				
-				info = {
-					'City': item.select_one('h3.W6bZuc.YMlIz'),
-					'Price': item.select_one('div.MJg7fb.QB2Jof span'),
-					'Stops': item.select_one('span.nx0jzf'),
-					'Flight time': item.select_one('span.Xq1DAb'),
-					'Flight time (td)': dt.timedelta(0)
-				}
-
-				for key, value in info.items():
-					if value:
-						info[key] = value.get_text(strip=True)
-					else:
-						info[key] = None
-
-				# Price is an essential attribute, skip if not present (some entries are just empty)
-				if info['Price']:
-					info['Price'] = int(info['Price'][1:].replace(',', ''))  # Convert price to integer
-				else:
-					continue
-
-				# Parse Travel_Time using regex to support '2 hr 30 min', '2 hr', or '30 min'
-				hours = 0
-				minutes = 0
-				if info['Flight time']:
-					match = re.search(r"(?:(\d+)\s*hr)?\s*(?:(\d+)\s*min)?", info['Flight time'])
-					if match:
-						if match.group(1):
-							hours = int(match.group(1))
-						if match.group(2):
-							minutes = int(match.group(2))
-					info['Flight time (td)'] = dt.timedelta(hours=hours, minutes=minutes)
-				else:
-					info['Flight time (td)'] = None
+	def _make_url_request(self, url, driver):
+		network_capture = conf.NETWORK_CAPTURE and not self._explore
+		if network_capture:
+			drain_log(driver)
+		timings = self._load_page(url, driver, 'div.tsAU4e' if self._explore else 'li.pIav2d')
+		start = time.perf_counter()
 
-				data.append({
-					'City': info['City'],
-					'Price': info['Price'],
-					'Stops': info['Stops'],
-					'Travel_Time': info['Flight time (td)'],
-				})
+		# try:
+		# 	x_path_cheapest = '//div[@class="eaO3rb yRaoXe"]'
+		# 	cheapest_button = driver.find_element(by=By.XPATH, value=x_path_cheapest)
+		# 	cheapest_button.click()
+		# 	random_wait(0.5, 1)
+		# except NoSuchElementException:
+		# 	logger.warning('Could not find "Cheapest flight" button, proceeding without clicking it.')
+		# 	pass
+		# links = self._get_flight_links(driver)
 
-			except Exception as e:
-				logger.error(f"Error parsing an exploration entry: {e}")
-				continue
+		# Waiting and initial XPATH cleaning
+		# WebDriverWait(driver, timeout = 10).until(lambda d: len(_Scrape._get_flight_elements(d)) > 100)
+		if network_capture:
+			# Results straight from the Flights response, without waiting for the cards to render
+			records = self._get_network_records(driver)
+			if records:
+				timings['extract'] = round(1000 * (time.perf_counter() - start))
+				resource_policy.measure(driver, url)
+				return records
+
+		ready = timings['state'] is not None  # Otherwise poll for the elements as before
+		if self._explore:
+			results = self._get_explore_records(driver) if ready else self._get_source_page(driver)
+		else:
+			# Structured flight records, or the page text when the cards can't be found (e.g. "No results returned")
+			results = self._read_flight_elements(driver) if ready else self._get_flight_elements(driver)
 
-		explore_df = pd.DataFrame(data)
-		return explore_df
+		timings['extract'] = round(1000 * (time.perf_counter() - start))
+		resource_policy.measure(driver, url)
+		return results
 
-	def _make_url_request(self, url, driver):
+	def _load_page(self, url, driver, selector):
+		'''
+			Load the page and wait until it is ready (see wait_until_ready), rejecting the consent dialog if it shows up.
+			Returns the latency of every stage, also kept in the timings of the query.
+		'''
+		start = time.perf_counter()
 		driver.get(url)
-		
+		timings = {'url': url, 'load': round(1000 * (time.perf_counter() - start))}
+
+		ready = wait_until_ready(driver, selector, timeout = conf.READY_TIMEOUT, quiet = conf.READY_QUIET)
+		if ready['state'] == CONSENT:
+			timings['consent'] = ready['ms']
+			try:
+				self._click_reject(driver)
+			except (IndexError, WebDriverException):
+				logger.warning('Could not find reject button while handling cookies')
+			ready = wait_until_ready(driver, selector, timeout = conf.READY_TIMEOUT, quiet = conf.READY_QUIET)
+		elif ready['state'] is None:
+			self._reject_cookies(driver)
+		timings.update(state = ready['state'], ready = ready['ms'])
+
+		if ready['state'] not in (RESULTS, None):
+			logger.debug(f"Page not showing results of {self} ({ready['state']} after {ready['ms']} ms)")
+		self._timings.append(timings)
+		logger.debug(f'Stage latencies (ms): {timings}')
+		return timings
+	
+
+	@staticmethod
+	def _reject_cookies(driver):
 		# Rejecting cookies
 		logger.debug('Checking cookies...')
 		x_path = '//body/c-wiz/div'
@@ -643,35 +975,19 @@ class _Scrape:
 			text = driver.find_element(by=By.XPATH, value=x_path).text
 
 			if 'Before you continue to Google' in text:
-				logger.debug('Rejecting cookies and proceeding to search page')
-				buttons = driver.find_elements(by=By.CSS_SELECTOR, value='button')
-				reject_button = [button for button in buttons if button.text == 'Reject all'][0]
-				# reject_button = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Reject all']")))
-				reject_button.click()
+				_Scrape._click_reject(driver)
 		
 		except Exception as e:
 			logger.warning('Could not find reject button while handling cookies')
 			logger.info('(Text node definition probably outdated)')
 
-		# try:
-		# 	x_path_cheapest = '//div[@class="eaO3rb yRaoXe"]'
-		# 	cheapest_button = driver.find_element(by=By.XPATH, value=x_path_cheapest)
-		# 	cheapest_button.click()
-		# 	random_wait(0.5, 1)
-		# except NoSuchElementException:
-		# 	logger.warning('Could not find "Cheapest flight" button, proceeding without clicking it.')
-		# 	pass
-		# links = self._get_flight_links(driver)
-
-		# Waiting and initial XPATH cleaning
-		# WebDriverWait(driver, timeout = 10).until(lambda d: len(_Scrape._get_flight_elements(d)) > 100)
-		if self._explore:
-			results = self._get_source_page(driver)
-		else:	
-			results = self._get_flight_elements(driver)
-
-		return results
-	
+	@staticmethod
+	def _click_reject(driver):
+		logger.debug('Rejecting cookies and proceeding to search page')
+		buttons = driver.find_elements(by=By.CSS_SELECTOR, value='button')
+		reject_button = [button for button in buttons if button.text == 'Reject all'][0]
+		# reject_button = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Reject all']")))
+		reject_button.click()
 
 	@staticmethod
 	def _get_flight_elements(driver):
@@ -685,8 +1001,43 @@ class _Scrape:
 			WebDriverWait(driver, 10).until(lambda d: len(d.find_elements(By.XPATH, value=flight_result_path)) > 0)
 		except TimeoutException:
 			pass
+		return _Scrape._read_flight_elements(driver)
+
+	@staticmethod
+	def _read_flight_elements(driver):
+		records = _Scrape._get_flight_records(driver)
+		if records:
+			return records
 		return driver.find_element(by = By.XPATH, value = '//body[@id = "yDmH0d"]').text.split('\n')
+
+	@staticmethod
+	def _get_network_records(driver):
+		try:
+			body = wait_for_response(driver, timeout=conf.NETWORK_TIMEOUT)
+		except WebDriverException as e:
+			logger.warning(f'Network capture failed, falling back to the page: {e.msg}')
+			return []
+		if body is None:
+			logger.warning('No flight results response captured --> Falling back to the page')
+			return []
+		return parse_shopping_results(body)
+
+	@staticmethod
+	def _get_flight_records(driver):
+		try:
+			return driver.execute_script(FLIGHT_RECORDS_JS) or []
+		except WebDriverException as e:
+			logger.warning(f'Structured flight extraction failed, falling back to page text: {e.msg}')
+			return []
 	
+	@staticmethod
+	def _get_explore_records(driver):
+		try:
+			return driver.execute_script(EXPLORE_RECORDS_JS) or []
+		except WebDriverException as e:
+			logger.warning(f'Structured explore extraction failed, falling back to page source: {e.msg}')
+			return driver.page_source
+
 	@staticmethod
 	def _get_source_page(driver):
 		# Wait until at least one flight card is present or timeout after 15 seconds
@@ -12,6 +12,7 @@ import os
 from config.setup_logging import init_logger
 from config.config import ReporterConfig
 from src.google_flight_analysis.airport import Airport
+from src.bargain_discovery.bargains_store import MAIN_ALIAS
 from src.bargain_discovery.discoverer import Discovery
 
 logger = init_logger(__name__)
@@ -77,9 +78,8 @@ class BargainReporter:
 
 
     def send_report(self):
-        discovery = Discovery()
-        with open("data/bargains.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
+        discovery = Discovery.from_store(MAIN_ALIAS)
+        data = discovery.bargains_dict()
 
         html_content = self.build_html_email(data)
         if not html_content:
@@ -233,9 +233,8 @@ class CustomBargainReporter:
 
 
     def send_report(self):
-        discovery = Discovery()
-        with open(f'data/bargains_{self.job["alias"]}.json', "r", encoding="utf-8") as f:
-            data = json.load(f)
+        discovery = Discovery.from_store(self.job['alias'])
+        data = discovery.bargains_dict()
 
         html_content = self.build_html_email(data)
         if not html_content:
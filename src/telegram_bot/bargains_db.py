@@ -0,0 +1,59 @@
+from contextlib import closing
+import os
+import sqlite3
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "bargains.sqlite")  # Bargains store written by the discovery workflows (see BargainsStore)
+MAIN_ALIAS = "main"  # Bargains of the daily discovery, not a custom job
+ATTRS = ['date', 'origin', 'destination', 'time', 'travel_time', 'airline', 'stops', 'price']
+
+
+def _connect(db_path: str):
+    # Read-only, the store is only written by the discovery workflows
+    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    con.row_factory = sqlite3.Row
+    return con
+
+
+def list_jobs(db_path: str = DB_PATH) -> list:
+    """Aliases of the custom jobs with stored bargains."""
+    try:
+        with closing(_connect(db_path)) as con:
+            rows = con.execute("SELECT DISTINCT alias FROM bargains WHERE alias <> ? ORDER BY alias", (MAIN_ALIAS,))
+            return [row["alias"] for row in rows]
+    except sqlite3.OperationalError:
+        return []
+
+
+def job_name(alias: str, db_path: str = DB_PATH):
+    """Name of a job (None if it has no bargains)."""
+    try:
+        with closing(_connect(db_path)) as con:
+            row = con.execute("SELECT job FROM bargains WHERE alias = ? LIMIT 1", (alias,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row["job"] if row else None
+
+
+def fetch_bargains(alias: str, max_price: int = None, limit: int = 30, offset: int = 0, db_path: str = DB_PATH) -> list:
+    """
+    Page of the bargains of a job in week order (cheapest first within a week), grouped by week as
+    [{'week': ..., 'combinations': [...]}].
+    Each combination has an [outbound, return] pair per flight field, as in the old bargains JSON files.
+    """
+    query, params = "SELECT * FROM bargains WHERE alias = ?", [alias]
+    if max_price is not None:
+        query += " AND total_price <= ?"
+        params.append(max_price)
+    query += " ORDER BY week, total_price LIMIT ? OFFSET ?"
+    params += [limit, offset]
+
+    weeks = []
+    with closing(_connect(db_path)) as con:
+        for row in con.execute(query, params):
+            if not weeks or weeks[-1]["week"] != row["week"]:
+                weeks.append({"week": row["week"], "combinations": []})
+            combination = {attr: [row[f"{attr}_out"], row[f"{attr}_return"]] for attr in ATTRS}
+            combination.update(job=row["job"], new=bool(row["new"]), price_change=row["price_change"],
+                               total_price=row["total_price"])
+            weeks[-1]["combinations"].append(combination)
+    return weeks
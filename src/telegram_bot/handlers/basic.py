@@ -5,6 +5,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text = (
         "¡Hola! Muchas gracias por usar nuestro bot de seguimiento de vuelos. ✈️✈️\n\n"
         "Usa /tracker para obtener información sobre tus vuelos seguidos.\n"
+        "Usa /precio ORIGEN DESTINO YYYY-MM-DD [HH:MM] para consultar el precio actual de un vuelo.\n"
         "Usa /buscador para encontrar las mejores ofertas de vuelos futuros.\n\n"
         "Para cualquier duda o sugerencia, no dudes en contactar con @DeividMay o @pilaar_fdeez :)"
     )
@@ -1,21 +1,18 @@
 import datetime as dt
-import glob
-import json
 import logging
-import os
 from telegram import Update, InlineKeyboardMarkup, ReplyKeyboardMarkup, ReplyKeyboardRemove, constants
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.error import BadRequest
 
+from bargains_db import fetch_bargains, job_name, list_jobs
 from utils import handle_error
 
-DATA_PATH = "../../data/"
 JOB_SELECTION, SHOW_DATA, DECISION_CONTINUE = range(3)
 price_filter = None
 
 @handle_error
 async def discovery_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    available_jobs = [[os.path.basename(f).replace("bargains_", "").replace(".json", "")] for f in glob.glob(f"{DATA_PATH}bargains_*.json")]
+    available_jobs = [[alias] for alias in list_jobs()]
     
     markup = ReplyKeyboardMarkup(available_jobs, one_time_keyboard=True)
     text = ("¡Bienvenido al buscador de vuelos!\n"
@@ -30,26 +27,17 @@ async def discovery_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 @handle_error
 async def select_job(update: Update, context: ContextTypes.DEFAULT_TYPE):
     selected_job = update.message.text.strip()
-    friendly_name = None
 
     context.user_data["selected_job"] = selected_job
 
-    # try to open the job file to validate existence and get a friendly name
-    try:
-        with open(f"{DATA_PATH}bargains_{selected_job}.json", "r", encoding="utf-8") as f:
-            job_info = json.load(f)
-    except FileNotFoundError:
-        available_jobs = [[os.path.basename(f).replace("bargains_", "").replace(".json", "")] for f in glob.glob(f"{DATA_PATH}bargains_*.json")]
+    # look the job up in the bargains store to validate existence and get a friendly name
+    friendly_name = job_name(selected_job)
+    if friendly_name is None:
+        available_jobs = [[alias] for alias in list_jobs()]
         markup = ReplyKeyboardMarkup(available_jobs, one_time_keyboard=True)
         error_text = "No se han encontrado resultados para el buscador seleccionado. Por favor, prueba con otro."
         await update.message.reply_text(error_text, reply_markup=markup)
         return JOB_SELECTION
-
-    if job_info and isinstance(job_info, list):
-        try:
-            friendly_name = job_info[0]["combinations"][0].get("job")
-        except Exception:
-            friendly_name = None
     context.user_data["friendly_name"] = friendly_name
 
 
@@ -88,20 +76,11 @@ async def discovery_show(update: Update, context: ContextTypes.DEFAULT_TYPE):
     price_filter = int(text) if text.isdigit() else None
 
     if not selected_job:
-        available_jobs = [[os.path.basename(f).replace("bargains_", "").replace(".json", "")] for f in glob.glob(f"{DATA_PATH}bargains_*.json")]
+        available_jobs = [[alias] for alias in list_jobs()]
         markup = ReplyKeyboardMarkup(available_jobs, one_time_keyboard=True)
         await update.message.reply_text("No se ha seleccionado un buscador. Por favor, selecciona uno:", reply_markup=markup)
         return JOB_SELECTION
 
-    try:
-        with open(f"{DATA_PATH}bargains_{selected_job}.json", "r", encoding="utf-8") as f:
-            job_info = json.load(f)
-    except FileNotFoundError:
-        available_jobs = [[os.path.basename(f).replace("bargains_", "").replace(".json", "")] for f in glob.glob(f"{DATA_PATH}bargains_*.json")]
-        markup = ReplyKeyboardMarkup(available_jobs, one_time_keyboard=True)
-        await update.message.reply_text("Fichero del buscador no encontrado. Por favor, selecciona otro.", reply_markup=markup)
-        return JOB_SELECTION
-
     # build and send one message per week
     header = f"📊 Resultados del buscador '{friendly_name or selected_job}'"
     if price_filter:
@@ -109,6 +88,8 @@ async def discovery_show(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     total_shown = 0
     max_show = 30
+    # only the page of bargains to show is read from the store, already filtered by price
+    job_info = fetch_bargains(selected_job, max_price=price_filter, limit=max_show)
     weekday_abbr = ['L', 'M', 'X', 'J', 'V', 'S', 'D']
 
     any_shown = False
@@ -204,7 +185,7 @@ async def discovery_show(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def discovery_decision(update: Update, context: ContextTypes.DEFAULT_TYPE):
     decision = update.message.text.lower()
     if decision in ['sí', 'si', 'yes']:
-        available_jobs = [[os.path.basename(f).replace("bargains_", "").replace(".json", "")] for f in glob.glob(f"{DATA_PATH}bargains_*.json")]
+        available_jobs = [[alias] for alias in list_jobs()]
         
         markup = ReplyKeyboardMarkup(available_jobs, one_time_keyboard=True)
         text = ("Para continuar, selecciona otro de los buscadores de vuelos disponibles:"
@@ -0,0 +1,59 @@
+import logging
+import re
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from utils import handle_error
+
+try:  # Needs the scraper requirements (requirements.txt at the repo root) and the repo root on sys.path (see telegram_main)
+    from src.google_flight_analysis.async_scrape import AsyncScraper
+    from src.google_flight_analysis.scrape import Scrape
+except ImportError as e:
+    logging.warning(f"Live prices disabled, the scraper could not be imported: {e}")
+    AsyncScraper = Scrape = None
+
+LIVE_LIMIT = 2  # Chrome instances scraping at once for all the chats, other requests wait their turn
+live_scraper = AsyncScraper(headless=True, limit=LIVE_LIMIT) if AsyncScraper else None
+USAGE = "Uso: /precio ORIGEN DESTINO YYYY-MM-DD [HH:MM] (por ejemplo, /precio MAD BCN 2026-11-05 08:30)"
+
+
+@handle_error
+async def live_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if live_scraper is None:
+        await update.message.reply_text("Los precios en directo no están disponibles en este servidor.")
+        return
+
+    args = [arg.upper() for arg in context.args]
+    if not (3 <= len(args) <= 4 and re.fullmatch("[A-Z]{3}", args[0]) and re.fullmatch("[A-Z]{3}", args[1])
+            and re.fullmatch(r"\d{4}-\d{2}-\d{2}", args[2]) and (len(args) == 3 or re.fullmatch(r"\d{2}:\d{2}", args[3]))):
+        await update.message.reply_text(USAGE)
+        return
+    origin, destination, date = args[:3]
+    time = args[3] if len(args) == 4 else None
+
+    await update.message.reply_text(f"🔎 Buscando precios de {origin} a {destination} el {date}...")
+    query = Scrape(origin, destination, date).live()  # Fresh prices, never served from the result cache
+    if time:  # Only the departure hour of the flight is requested
+        hour = int(time[:2])
+        query.set_filters(departure_window=(hour, min(hour + 1, 24)))
+    df = await live_scraper.scrape(query)
+
+    if time and not df.empty:
+        df = df[df['Departure datetime'].dt.strftime('%H:%M') == time]
+    if df.empty:
+        await update.message.reply_text("No se ha encontrado ningún vuelo con esos datos 😕")
+        return
+
+    flight = df.sort_values('Price').iloc[0]
+    await update.message.reply_text(
+        f"✈️ Vuelo de {origin} a {destination} 🛫\n"
+        f"🗓️ Fecha de vuelo: {date}\n"
+        f"⏰ Hora: {flight['Departure datetime'].strftime('%H:%M')}\n"
+        f"🛩️ Aerolínea: {flight['Airline(s)']}\n"
+        f"💰 Precio actual: {flight['Price']} €"
+    )
+
+
+async def close_live_scraper(application):
+    if live_scraper is not None:
+        await live_scraper.aclose()
@@ -1,4 +1,6 @@
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))  # Repo root, for the live scraper (handlers.live)
 from telegram.ext import (
     ApplicationBuilder,
     CommandHandler,
@@ -31,6 +33,7 @@ from handlers.discovery import (
     JOB_SELECTION, SHOW_DATA, DECISION_CONTINUE
 )
 from handlers.inline import inline_caps
+from handlers.live import live_price, close_live_scraper
 from utils import send_server_up
 
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
@@ -42,10 +45,11 @@ async def _post_init(app):
     await send_server_up(app.bot)
 
 if __name__ == '__main__':
-    application = ApplicationBuilder().token(BOT_TOKEN).post_init(_post_init).build()
+    application = ApplicationBuilder().token(BOT_TOKEN).post_init(_post_init).post_shutdown(close_live_scraper).build()
     
     start_handler = CommandHandler('start', start)
     tracker_handler = CommandHandler('tracker', send_tracker_updates)
+    live_price_handler = CommandHandler('precio', live_price)
     add_flight_handler = ConversationHandler(
         entry_points=[CommandHandler("nuevo_vuelo", addflight_start)],
         states={
@@ -88,6 +92,7 @@ if __name__ == '__main__':
 
     application.add_handler(start_handler)
     application.add_handler(tracker_handler)
+    application.add_handler(live_price_handler)
     application.add_handler(add_flight_handler)
     application.add_handler(remove_flight_handler)
     application.add_handler(discovery_handler)
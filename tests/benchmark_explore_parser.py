@@ -0,0 +1,40 @@
+import argparse
+import re
+import timeit
+
+from src.google_flight_analysis.explore_parser import BACKENDS, available_backends, explore_records
+
+'''
+	Benchmark of the explore page backends: python -m tests.benchmark_explore_parser [saved_page.html ...]
+	Without pages, the explore fixture is grown to a full page of destination cards.
+'''
+
+def fixture_page(cards = 300):
+	with open('tests/test_data/explore_page.html', encoding = 'utf-8') as f:
+		html = f.read()
+	body = re.search(r'<div class="FxWhJe">(.*)</div>\s*</body>', html, re.S).group(1)
+	return html.replace(body, body * (cards // 4))
+
+def main():
+	parser = argparse.ArgumentParser(description = 'Time explore_records on every installed HTML backend')
+	parser.add_argument('pages', nargs = '*', help = 'Saved explore page sources')
+	parser.add_argument('-n', '--number', type = int, default = 20, help = 'Parses per page and backend')
+	args = parser.parse_args()
+
+	pages = []
+	for path in args.pages:
+		with open(path, encoding = 'utf-8') as f:
+			pages.append(f.read())
+	pages = pages or [fixture_page()]
+
+	cards = sum(len(explore_records(page, 'bs4')) for page in pages)
+	print(f'{len(pages)} pages, {cards} cards, {sum(map(len, pages)) / 1024:.0f} kB')
+	baseline = None
+	for backend in available_backends()[::-1]:
+		assert all(explore_records(page, backend) == explore_records(page, 'bs4') for page in pages), f'{backend} records differ'
+		seconds = timeit.timeit(lambda: [BACKENDS[backend](page) for page in pages], number = args.number) / args.number
+		baseline = baseline or seconds
+		print(f'{backend:>10}: {1000 * seconds / len(pages):8.2f} ms/page  (x{baseline / seconds:.1f})')
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,35 @@
+import argparse
+import timeit
+
+from src.google_flight_analysis.flight import Flight
+from tests.test_flight import record
+
+'''
+	Micro-benchmark of the flight parsing of a result page: python -m tests.benchmark_flight [-c cards]
+	Times the structured records path (Flight.from_records), the card text lines path and the typed frame.
+'''
+
+def main():
+	parser = argparse.ArgumentParser(description = 'Time the parsing of a result page into flights')
+	parser.add_argument('-c', '--cards', type = int, default = 60, help = 'Flight cards per page')
+	parser.add_argument('-n', '--number', type = int, default = 200, help = 'Pages parsed per measure')
+	args = parser.parse_args()
+
+	# Different times and prices on every card, as on a real page
+	records = [dict(record, departure = f'{1 + i % 12}:{i % 60:02d} {"AM" if i % 24 < 12 else "PM"}', price = f'€{50 + i}')
+			   for i in range(args.cards)]
+	lines = [r['lines'][:-1] + [r['price'][1:]] for r in records]
+	flights = Flight.from_records('2026-11-05', records)
+
+	measures = {
+		'records': lambda: Flight.from_records('2026-11-05', records),
+		'text lines': lambda: [Flight('2026-11-05', card) for card in lines],
+		'dataframe': lambda: Flight.dataframe(flights),
+	}
+	print(f'{args.cards} cards per page')
+	for name, parse in measures.items():
+		seconds = timeit.timeit(parse, number = args.number) / args.number
+		print(f'{name:>10}: {1000 * seconds:7.3f} ms/page')
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+from src.google_flight_analysis.async_scrape import AsyncScraper
+
+'''
+	Async scraper: queries run off the event loop, within the concurrency limit, and identical queries are scraped once
+'''
+
+class FakePool:
+	size = 2
+
+	@contextmanager
+	def driver(self):
+		yield self
+
+	def set_page_load_timeout(self, timeout):
+		pass
+
+class FakeQuery:
+	running, peak, scraped = 0, 0, 0
+	lock = threading.Lock()
+
+	def __init__(self, url, seconds = 0.1, cached = False):
+		self.url, self.seconds, self.cached = [url], seconds, cached
+		self.data = None
+
+	def _scrape_cached(self):
+		if self.cached:
+			self.data = 'cached'
+		return self.cached
+
+	def _scrape_http(self):
+		return False
+
+	def _scrape_data(self, driver):
+		with FakeQuery.lock:
+			FakeQuery.running += 1
+			FakeQuery.scraped += 1
+			FakeQuery.peak = max(FakeQuery.peak, FakeQuery.running)
+		time.sleep(self.seconds)
+		with FakeQuery.lock:
+			FakeQuery.running -= 1
+		self.data = self.url[0]
+
+def reset():
+	FakeQuery.running, FakeQuery.peak, FakeQuery.scraped = 0, 0, 0
+
+def test_0():
+	reset()
+	async def main():
+		async with AsyncScraper(pool = FakePool()) as scraper:
+			return await scraper.scrape_many([FakeQuery(f'url{i}') for i in range(5)])
+	results = asyncio.run(main())
+	assert results == [f'url{i}' for i in range(5)] and FakeQuery.peak <= FakePool.size, "Test 0 Failed."
+
+def test_1():
+	reset()
+	queries = [FakeQuery('same'), FakeQuery('same'), FakeQuery('other')]
+	async def main():
+		async with AsyncScraper(pool = FakePool()) as scraper:
+			return await scraper.scrape_many(queries)
+	results = asyncio.run(main())
+	assert results == ['same', 'same', 'other'] and queries[1].data == 'same' and FakeQuery.scraped == 2, "Test 1 Failed."
+
+def test_2():
+	reset()
+	ticks = []
+	async def ticker():
+		for _ in range(5):
+			ticks.append(time.monotonic())
+			await asyncio.sleep(0.02)
+	async def main():
+		async with AsyncScraper(pool = FakePool()) as scraper:
+			await asyncio.gather(scraper.scrape(FakeQuery('slow', seconds = 0.2)), ticker())
+	asyncio.run(main())
+	# The loop keeps serving other coroutines while the query is scraped
+	assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.18, "Test 2 Failed."
+
+def test_3():
+	reset()
+	async def main():
+		async with AsyncScraper(pool = FakePool()) as scraper:
+			return await scraper.scrape(FakeQuery('cached', cached = True))
+	assert asyncio.run(main()) == 'cached' and FakeQuery.scraped == 0, "Test 3 Failed."
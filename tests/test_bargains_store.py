@@ -0,0 +1,50 @@
+import json
+import os
+
+from src.bargain_discovery.bargains_store import BargainsStore
+from src.telegram_bot import bargains_db
+
+'''
+	Bargains store: legacy JSON files are migrated once as saved, and readers get filtered pages of a job
+'''
+
+def combination(date_out, total_price):
+	return {
+		'date': [date_out, '2026-11-08'], 'origin': ['AGP', 'HAM'], 'destination': ['HAM', 'AGP'],
+		'time': ['08:00', '20:00'], 'travel_time': ['3 hr', '3 hr'], 'airline': ['Ryanair', 'Ryanair'],
+		'stops': ['0', '0'], 'price': [str(total_price - 50), '50'],
+		'job': 'Hamburgo', 'new': True, 'price_change': 0, 'total_price': str(total_price),
+	}
+
+data = [
+	{'week': '2026-11-02 to 2026-11-08', 'combinations': [combination('2026-11-05', 90), combination('2026-11-06', 120)]},
+	{'week': '2026-11-09 to 2026-11-15', 'combinations': [combination('2026-11-12', 100)]},
+]
+
+def migrated_store(tmp_path):
+	(tmp_path / 'bargains_hamburgo.json').write_text(json.dumps(data))
+	store = BargainsStore(str(tmp_path / 'bargains.sqlite'))
+	store.migrate_json(str(tmp_path))
+	return store
+
+def test_0(tmp_path):
+	store = migrated_store(tmp_path)
+	assert store.aliases() == ['hamburgo'] and not (tmp_path / 'bargains_hamburgo.json').exists(), "Test 0 Failed."
+	assert (tmp_path / 'bargains_hamburgo.json.migrated').exists(), "Test 0 Failed."
+	assert store.read('hamburgo')['total_price'].tolist() == [90, 120, 100], "Test 0 Failed."
+	assert store.read('hamburgo', max_price=100, limit=1, offset=1)['date_out'].tolist() == ['2026-11-12'], "Test 0 Failed."
+
+def test_1(tmp_path):
+	db_path = str(migrated_store(tmp_path).path)
+	assert bargains_db.list_jobs(db_path) == ['hamburgo'], "Test 1 Failed."
+	assert bargains_db.job_name('hamburgo', db_path) == 'Hamburgo', "Test 1 Failed."
+	weeks = bargains_db.fetch_bargains('hamburgo', max_price=110, db_path=db_path)
+	assert [week['week'] for week in weeks] == [data[0]['week'], data[1]['week']], "Test 1 Failed."
+	assert weeks[0]['combinations'][0]['date'] == ['2026-11-05', '2026-11-08'], "Test 1 Failed."
+	assert bargains_db.list_jobs(str(tmp_path / 'missing.sqlite')) == [], "Test 1 Failed."
+
+def test_2(tmp_path):
+	store = migrated_store(tmp_path)
+	(tmp_path / 'bargains_hamburgo.json').write_text(json.dumps(data))  # Restored by a checkout of an older tree
+	assert store.migrate_json(str(tmp_path)) == 0 and len(store.read('hamburgo')) == 3, "Test 2 Failed."
+	assert os.path.isabs(bargains_db.DB_PATH), "Test 2 Failed."
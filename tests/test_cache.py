@@ -0,0 +1,35 @@
+import datetime as dt
+import pandas as pd
+
+from src.google_flight_analysis.cache import ResultCache
+
+'''
+	Result cache: entries are reused within the TTL and ignored once expired or disabled
+'''
+
+df = pd.DataFrame({
+	'Departure datetime': [dt.datetime(2026, 11, 5, 6, 10)],
+	'Origin': ['AGP'],
+	'Destination': ['HAM'],
+	'Price': [95],
+})
+
+def test_0(tmp_path):
+	cache = ResultCache(str(tmp_path / 'cache.sqlite'), ttl = 6)
+	assert cache.get('https://www.google.com/travel/flights?tfs=abc') is None, "Test 0 Failed."
+
+def test_1(tmp_path):
+	cache = ResultCache(str(tmp_path / 'cache.sqlite'), ttl = 6)
+	cache.put('https://www.google.com/travel/flights?tfs=abc', df)
+	cached = cache.get('https://www.google.com/travel/flights?tfs=abc')
+	assert cached['Price'].tolist() == [95] and cached['Origin'].tolist() == ['AGP'], "Test 1 Failed."
+
+def test_2(tmp_path):
+	ResultCache(str(tmp_path / 'cache.sqlite'), ttl = 6).put('https://www.google.com/travel/flights?tfs=abc', df)
+	cache = ResultCache(str(tmp_path / 'cache.sqlite'), ttl = 1e-9)
+	assert cache.get('https://www.google.com/travel/flights?tfs=abc') is None, "Test 2 Failed."
+
+def test_3(tmp_path):
+	cache = ResultCache(str(tmp_path / 'cache.sqlite'), ttl = 0)
+	cache.put('https://www.google.com/travel/flights?tfs=abc', df)
+	assert cache.get('https://www.google.com/travel/flights?tfs=abc') is None, "Test 3 Failed."
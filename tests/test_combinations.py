@@ -0,0 +1,43 @@
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from src.bargain_discovery.combinations import combine_round_trips
+
+'''
+	Pruned round trip combinations must match the filtered cross join
+'''
+
+rng = np.random.default_rng(0)
+
+def flights(n, day):
+	departure = pd.Timestamp(day) + pd.to_timedelta(rng.integers(0, 4 * 24 * 60, n), unit='min')
+	return pd.DataFrame({
+		'Departure datetime': departure,
+		'Arrival datetime': departure + pd.to_timedelta(rng.integers(60, 600, n), unit='min'),
+		'Origin': rng.choice(['AGP', 'GRX'], n),
+		'Price': rng.integers(20, 200, n).astype('int32'),
+	})
+
+out_df, return_df = flights(60, '2026-11-05'), flights(50, '2026-11-07')
+
+def cross_join(max_price, min_stay=dt.timedelta(0), max_stay=None):
+	df = out_df.merge(return_df, how='cross', suffixes=('_out', '_return'))
+	df['Total Price'] = df['Price_out'] + df['Price_return']
+	stay = df['Departure datetime_return'] - df['Arrival datetime_out']
+	df = df[(df['Total Price'] <= max_price) & (stay >= min_stay) & ((stay <= max_stay) if max_stay else True)]
+	return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+def pruned(*args, **kwargs):
+	df = combine_round_trips(out_df, return_df, *args, **kwargs)
+	return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+def test_0():
+	assert pruned(150).equals(cross_join(150)), "Test 0 Failed."
+
+def test_1():
+	stays = dict(min_stay=dt.timedelta(days=1), max_stay=dt.timedelta(days=3))
+	assert pruned(200, **stays).equals(cross_join(200, **stays)), "Test 1 Failed."
+
+def test_2():
+	assert combine_round_trips(out_df, return_df, 10).empty, "Test 2 Failed."
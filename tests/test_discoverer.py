@@ -0,0 +1,51 @@
+import pandas as pd
+
+from src.bargain_discovery.bargains_store import BargainsStore
+from src.bargain_discovery.discoverer import Discovery
+
+'''
+	Columnar Discovery must keep the bargains JSON format, and flag new bargains and price changes through the store
+'''
+
+def bargain(week, job, date_out, total_price, origin='AGP'):
+	return {
+		'date_out': date_out, 'origin_out': origin, 'destination_out': 'HAM', 'time_out': '08:00',
+		'travel_time_out': '3 hr', 'airline_out': 'Ryanair', 'stops_out': '0', 'price_out': str(total_price - 50),
+		'date_return': '2026-11-08', 'origin_return': 'HAM', 'destination_return': 'AGP', 'time_return': '20:00',
+		'travel_time_return': '3 hr 5 min', 'airline_return': 'Ryanair', 'stops_return': '0', 'price_return': '50',
+		'job': job, 'week': week, 'total_price': total_price, 'new': False, 'price_change': 0,
+	}
+
+week_0, week_1 = '2026-11-02 to 2026-11-08', '2026-11-09 to 2026-11-15'
+records = pd.DataFrame([
+	bargain(week_1, 'David', '2026-11-12', 90),
+	bargain(week_0, 'Pilar', '2026-11-05', 120, origin='GRX'),
+	bargain(week_0, 'David', '2026-11-06', 100),
+	bargain(week_0, 'David', '2026-11-05', 80),
+])
+
+def test_0(tmp_path):
+	discovery = Discovery(BargainsStore(str(tmp_path / 'bargains.sqlite')))
+	discovery.add_bargains(records)
+	data = discovery.bargains_dict()
+	assert [week['week'] for week in data] == [week_0, week_1], "Test 0 Failed."
+	assert [c['total_price'] for c in data[0]['combinations']] == ['80', '100', '120'], "Test 0 Failed."
+	assert data[0]['combinations'][0]['date'] == ['2026-11-05', '2026-11-08'], "Test 0 Failed."
+	discovery.save_bargains('job')
+	assert Discovery.from_store('job', discovery.store).bargains_dict() == discovery.bargains_dict(), "Test 0 Failed."
+
+def test_1(tmp_path):
+	store = BargainsStore(str(tmp_path / 'bargains.sqlite'))
+	discovery = Discovery(store)
+	discovery.add_bargains(records)
+	discovery.save_bargains()
+
+	discovery = Discovery(store)
+	discovery.add_bargains(records.assign(total_price=[90, 130, 90, 80], date_out=['2026-11-13', *records['date_out'][1:]]))
+	discovery.save_bargains()
+	saved = {(c['date'][0], c['job']): (c['new'], c['price_change'])
+			 for week in Discovery.from_store(store=store).bargains_dict() for c in week['combinations']}
+	assert saved == {
+		('2026-11-05', 'David'): (False, 0), ('2026-11-06', 'David'): (False, 1),
+		('2026-11-05', 'Pilar'): (False, 2), ('2026-11-13', 'David'): (True, 0),
+	}, "Test 1 Failed."
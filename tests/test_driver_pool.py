@@ -0,0 +1,55 @@
+import threading
+import time
+
+from src.google_flight_analysis.driver_pool import DriverPool
+
+'''
+	Driver pool: no driver is spawned once the pool is closed, and failed spawns give their slot back
+'''
+
+class FakeDriver:
+	def execute_script(self, script):
+		return 1
+
+	def quit(self):
+		pass
+
+class FakePool(DriverPool):
+	def __init__(self, size, fail = 0):
+		super().__init__('local', size = size, warm_up = False)
+		self.spawned, self.fail = 0, fail
+
+	def _spawn(self):
+		if self.fail:
+			self.fail -= 1
+			raise RuntimeError('Chrome failed to start')
+		self.spawned += 1
+		return FakeDriver()
+
+def test_0():
+	pool = FakePool(size = 1)
+	errors = []
+	def waiter():
+		try:
+			with pool.driver():
+				pass
+		except RuntimeError as e:
+			errors.append(e)
+
+	with pool.driver():
+		thread = threading.Thread(target = waiter)
+		thread.start()
+		time.sleep(0.1)
+		pool.close()
+	thread.join(timeout = 2)
+	assert not thread.is_alive() and len(errors) == 1 and pool.spawned == 1, "Test 0 Failed."
+
+def test_1():
+	pool = FakePool(size = 2, fail = 1)
+	try:
+		pool.start()
+	except RuntimeError:
+		pass
+	pool.start()
+	assert pool._created == 2 and len(pool._idle) == 2, "Test 1 Failed."
+	pool.close()
@@ -0,0 +1,67 @@
+import datetime as dt
+import pandas as pd
+
+from src.bargain_discovery.discoverer import Discovery
+from src.bargain_discovery.engine import assign_legs, bargain_records, find_bargains
+from src.bargain_discovery.planner import QueryPlanner
+
+'''
+	Single pass discovery must tag legs and weeks as the per-week planner requests do
+'''
+
+airports = (['AGP', 'GRX'], ['HAM', 'BRE'])
+days_search = ([4, 5], [7, 8])
+date_ref = dt.date(2026, 11, 2)  # Monday
+
+def flight(departure, origin, dest, price, hours=3):
+	departure = pd.Timestamp(departure)
+	return {
+		'Departure datetime': departure, 'Arrival datetime': departure + pd.Timedelta(hours=hours),
+		'Origin': origin, 'Destination': dest, 'Airline(s)': 'Vueling',
+		'Travel_Time': pd.Timedelta(hours=hours), 'Num_Stops': 0, 'Price': price,
+	}
+
+results_df = pd.DataFrame([
+	flight('2026-11-05 08:00', 'AGP', 'HAM', 50),   # Thursday, week 0 outbound
+	flight('2026-11-09 20:00', 'BRE', 'GRX', 60),   # Next Monday (day 8), week 0 return
+	flight('2026-11-13 09:30', 'GRX', 'BRE', 40),   # Friday, week 1 outbound
+	flight('2026-11-15 18:00', 'HAM', 'AGP', 45),   # Sunday, week 1 return
+	flight('2026-11-06 10:00', 'AGP', 'MAD', 10),   # Not a searched route
+	flight('2026-11-04 10:00', 'AGP', 'HAM', 10),   # Wednesday, not a searched day
+	flight('2026-11-20 10:00', 'AGP', 'HAM', 10),   # Week 2, out of the horizon
+])
+
+def test_0():
+	legs_df = assign_legs(results_df, airports, days_search, date_ref, weeks_search=2)
+	planned = QueryPlanner()._add_weeks(airports, days_search, date_ref, 2, date_ref)
+	expected = {(week_str, leg, request.date[0]) for week_str, legs in planned.items()
+				for leg, requests in enumerate(legs) for request in requests}
+	tagged = set(zip(legs_df['Week'], legs_df['Leg'], legs_df['Departure datetime'].dt.strftime('%Y-%m-%d')))
+	assert len(legs_df) == 4 and tagged <= expected, "Test 0 Failed."
+
+def test_1():
+	legs_df = assign_legs(results_df, airports, days_search, date_ref, weeks_search=2).assign(Job='Pilar')
+	records = bargain_records(find_bargains(legs_df, price_threshold=120, max_travel_hours=5))
+	assert sorted(records['week']) == ['2026-11-02 to 2026-11-08', '2026-11-09 to 2026-11-15'], "Test 1 Failed."
+	assert records['travel_time_out'].eq('3 hr').all() and records['total_price'].tolist() == [110, 85], "Test 1 Failed."
+
+def test_2():
+	legs_df = assign_legs(results_df, airports, days_search, date_ref, weeks_search=2).assign(Job='Pilar')
+	records = bargain_records(find_bargains(legs_df, price_threshold=100, max_travel_hours=5))
+	bargains = Discovery.as_dicts(records)
+	assert len(bargains) == 1 and records['week'].tolist() == ['2026-11-09 to 2026-11-15'], "Test 2 Failed."
+	assert bargains[0]['origin'] == ['GRX', 'HAM'] and bargains[0]['total_price'] == '85', "Test 2 Failed."
+
+def test_3():
+	# A 10-day leg window: dates shared by two weeks are searched, and tagged, in both (as the per-week baseline did)
+	long_days = ([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [23, 24, 25, 26, 27, 28])
+	dates = pd.date_range('2026-11-02', periods=42, freq='D')
+	long_df = pd.DataFrame([flight(f'{day.date()} 08:00', 'AGP', 'HAM', 50) for day in dates]
+						   + [flight(f'{day.date()} 20:00', 'BRE', 'GRX', 60) for day in dates])
+	legs_df = assign_legs(long_df, airports, long_days, date_ref, weeks_search=3)
+	planned = QueryPlanner()._add_weeks(airports, long_days, date_ref, 3, date_ref)
+	expected = {(week_str, leg, request.date[0]) for week_str, legs in planned.items()
+				for leg, requests in enumerate(legs) for request in requests}
+	tagged = list(zip(legs_df['Week'], legs_df['Leg'], legs_df['Departure datetime'].dt.strftime('%Y-%m-%d')))
+	assert len(tagged) == len(set(tagged)) and set(tagged) == expected, "Test 3 Failed."
+	assert ('2026-11-02 to 2026-11-08', 0, '2026-11-10') in expected and ('2026-11-09 to 2026-11-15', 0, '2026-11-10') in expected, "Test 3 Failed."
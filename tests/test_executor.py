@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+
+from src.google_flight_analysis.executor import ScrapeExecutor
+
+'''
+	Scrape executor: objects are yielded as they complete, with a bounded number in flight
+'''
+
+class FakePool:
+	size = 2
+
+	@contextmanager
+	def driver(self):
+		yield self
+
+	def set_page_load_timeout(self, timeout):
+		pass
+
+class FakeQuery:
+	def __init__(self, name, seconds, cached = False):
+		self.name, self.seconds, self.cached = name, seconds, cached
+		self.data = None
+
+	def _scrape_data(self, driver):
+		time.sleep(self.seconds)
+		self.data = self.name
+
+def test_0():
+	queries = [FakeQuery('slow', 0.3), FakeQuery('fast', 0.05)]
+	order = [q.name for q in ScrapeExecutor(FakePool(), wait = (0, 0)).iter(queries)]
+	assert order == ['fast', 'slow'], "Test 0 Failed."
+
+def test_1():
+	created = []
+	def queries():
+		for i in range(20):
+			created.append(i)
+			yield FakeQuery(i, 0)
+	stream = ScrapeExecutor(FakePool(), wait = (0, 0)).iter(queries())
+	next(stream)
+	assert len(created) <= 2 * FakePool.size + 1, "Test 1 Failed."
+	stream.close()
+
+def test_2():
+	queries = [FakeQuery('cached', 1, cached = True), FakeQuery('scraped', 0)]
+	done = list(ScrapeExecutor(FakePool(), wait = (0, 0)).iter(queries, without_browser = lambda q: q.cached))
+	assert [q.data for q in queries] == [None, 'scraped'] and len(done) == 2, "Test 2 Failed."
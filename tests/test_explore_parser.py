@@ -0,0 +1,31 @@
+import datetime as dt
+
+from src.google_flight_analysis.explore_parser import available_backends, explore_dataframe, explore_records
+
+'''
+	Explore pages: destination cards of the page source or of the in-page extractor make the same frame
+'''
+
+with open('tests/test_data/explore_page.html', encoding = 'utf-8') as f:
+	html = f.read()
+
+def test_0():
+	records = explore_records(html)
+	assert len(records) == 4 and records[2]['spans'] == 5 and records[3]['price'] is None, "Test 0 Failed."
+
+def test_1():
+	df = explore_dataframe(explore_records(html))
+	assert list(df['City']) == ['Hamburg', 'Vienna'] and list(df['Price']) == [64, 1120], "Test 1 Failed."
+	assert df['Travel_Time'].tolist() == [dt.timedelta(hours = 3, minutes = 35), dt.timedelta(hours = 6)], "Test 1 Failed."
+
+def test_2():
+	# Records as EXPLORE_RECORDS_JS returns them
+	records = [{'city': 'Hamburg', 'price': '€64', 'stops': 'Nonstop', 'flight_time': '3 hr 35 min', 'spans': 3}]
+	assert explore_dataframe(records).equals(explore_dataframe(explore_records(html)).head(1)), "Test 2 Failed."
+
+def test_3():
+	records = [explore_records(html, backend) for backend in available_backends()]
+	assert all(r == records[-1] for r in records), "Test 3 Failed."
+
+def test_4():
+	assert explore_records(html, 'not-a-parser') == explore_records(html, 'bs4'), "Test 4 Failed."
@@ -0,0 +1,60 @@
+import datetime as dt
+
+from src.google_flight_analysis.flight import Flight, format_travel_time, parse_travel_time
+
+'''
+	Structured records and card text lines must give the same flight
+'''
+
+record = {
+	'departure': '6:05 AM',
+	'arrival': '1:30 AM',
+	'days_ahead': '+1',
+	'origin': 'AGP',
+	'dest': 'HAM',
+	'airline': 'VuelingOperated by Iberia',
+	'travel_time': '19 hr 25 min',
+	'stops': '1 stop',
+	'layover': '2 hr 10 min BCN',
+	'price': '€1,064',
+	'co2': '123 kg CO2e',
+	'emissions': '+12% emissions',
+	'lines': ['6:05 AM', '1:30 AM+1', 'VuelingOperated by Iberia', '19 hr 25 min', 'AGPHAM', '1 stop', '2 hr 10 min BCN',
+			  '123 kg CO2e', '+12% emissions', '1,064'],
+}
+
+def test_0():
+	flight = Flight.from_record('2026-11-05', record)
+	assert flight.time_leave == dt.datetime(2026, 11, 5, 6, 5), "Test 0 Failed."
+	assert flight.time_arrive == dt.datetime(2026, 11, 6, 1, 30), "Test 0 Failed."
+
+def test_1():
+	flight = Flight.from_record('2026-11-05', record)
+	assert int(flight.price) == 1064 and flight.num_stops == 1 and flight.co2 == 123 and flight.emissions == 12, "Test 1 Failed."
+
+def test_2():
+	assert Flight.from_record('2026-11-05', dict(record, price=None)) is None, "Test 2 Failed."
+
+def test_3():
+	from_record = Flight.dataframe([Flight.from_record('2026-11-05', record)])
+	from_text = Flight.dataframe([Flight('2026-11-05', [line.replace(',', '') if line == '1,064' else line for line in record['lines']])])
+	assert from_record.equals(from_text), "Test 3 Failed."
+
+def test_4():
+	df = Flight.dataframe([Flight.from_record('2026-11-05', record)])
+	assert str(df['Price'].dtype) == 'int32' and str(df['Origin'].dtype) == 'category', "Test 4 Failed."
+	assert df['Travel_Time'].iloc[0] == dt.timedelta(hours=19, minutes=25), "Test 4 Failed."
+
+def test_5():
+	assert format_travel_time(parse_travel_time('2 hr')) == '2 hr' and format_travel_time(95) == '1 hr 35 min', "Test 5 Failed."
+
+def test_6():
+	lines = [line.replace(',', '') if line == '1,064' else line for line in record['lines']] + ['round trip']
+	flight = Flight('2026-11-05', lines)
+	assert flight.airline == 'Vueling' and int(flight.price) == 1064, "Test 6 Failed."
+
+def test_7():
+	flight = Flight('2026-11-05', ['10:00 PM', '11:40 PM', 'Ryanair', '1 hr 40 min', 'AGPMAD', 'Nonstop', 'Change of airport', '€45'])
+	assert flight.price == 45 and flight.time_arrive == dt.datetime(2026, 11, 5, 23, 40) and flight.airline == 'Ryanair', "Test 7 Failed."
+	text_record = dict(record, departure=None, lines=record['lines'][:-1] + ['1064'])  # falls back to its text lines
+	assert [f.price for f in Flight.from_records('2026-11-05', [record, text_record])] == ['1064', '1064'], "Test 7 Failed."
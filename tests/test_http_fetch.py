@@ -0,0 +1,45 @@
+import datetime as dt
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.google_flight_analysis.flight import Flight
+from src.google_flight_analysis.http_fetch import HttpFetcher
+
+'''
+	Result pages fetched over HTTP (from a local stand-in server) are parsed into records that Flight.from_record understands
+'''
+
+class QuietHandler(SimpleHTTPRequestHandler):
+	def log_message(self, *args):
+		pass
+
+@pytest.fixture(scope = 'module')
+def server():
+	handler = functools.partial(QuietHandler, directory = 'tests/test_data')
+	httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+	thread = threading.Thread(target = httpd.serve_forever, daemon = True)
+	thread.start()
+	yield f'http://127.0.0.1:{httpd.server_address[1]}'
+	httpd.shutdown()
+	httpd.server_close()
+
+def test_0(server):
+	with HttpFetcher(timeout = 5) as fetcher:
+		records = fetcher.records(f'{server}/flights_page.html')
+	assert len(records) == 2, "Test 0 Failed."
+	assert records[0]['origin'] == 'AGP' and records[0]['dest'] == 'HAM' and records[0]['price'] == '€64', "Test 0 Failed."
+
+def test_1(server):
+	with HttpFetcher(timeout = 5) as fetcher:
+		record = fetcher.records(f'{server}/flights_page.html')[1]
+	flight = Flight.from_record('2026-11-05', record)
+	assert flight.time_arrive == dt.datetime(2026, 11, 6, 3, 10) and flight.num_stops == 1 and flight.stops == '1 hr 10 min BCN', "Test 1 Failed."
+	assert flight.price == '1064' and flight.co2 == 180 and flight.emissions == 0, "Test 1 Failed."
+
+def test_2(server):
+	with HttpFetcher(timeout = 5) as fetcher:
+		assert fetcher.records(f'{server}/missing_page.html') == [], "Test 2 Failed."
+		assert fetcher.records(f'{server}/CDG-IST.csv') == [], "Test 2 Failed."
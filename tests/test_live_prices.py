@@ -0,0 +1,50 @@
+import datetime as dt
+import os
+import pandas as pd
+import subprocess
+import sys
+
+from src.google_flight_analysis import scrape
+from src.google_flight_analysis.cache import ResultCache
+from src.google_flight_analysis.scrape import Scrape
+
+'''
+	The bot runs from src/telegram_bot: the live price handler must import the scraper from there,
+	with the scraper files resolved from the repo root. Its live queries skip the result cache and the results store
+'''
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOT_DIR = os.path.join(ROOT, 'src', 'telegram_bot')
+
+CHECK = '''
+import os
+import telegram_main  # Puts the repo root on sys.path, as when the bot starts
+from handlers import live
+from config.config import ScraperConfig
+from src.google_flight_analysis.analysis import results_store
+
+assert live.live_scraper is not None
+assert os.path.isabs(ScraperConfig().CACHE_PATH) and os.path.isabs(results_store.root)
+'''
+
+def test_0():
+	result = subprocess.run([sys.executable, '-c', CHECK], cwd = BOT_DIR, capture_output = True, text = True, timeout = 120)
+	assert result.returncode == 0, f"Test 0 Failed.\n{result.stderr}"
+	assert not os.path.exists(os.path.join(BOT_DIR, 'logging')) and not os.path.exists(os.path.join(BOT_DIR, 'data')), "Test 0 Failed."
+
+date = (dt.date.today() + dt.timedelta(days=30)).isoformat()
+df = pd.DataFrame({'Departure datetime': [pd.Timestamp(f'{date} 06:10')], 'Price': [95]})
+
+def test_1(tmp_path, monkeypatch):
+	monkeypatch.setattr(scrape, 'result_cache', ResultCache(str(tmp_path / 'cache.sqlite'), ttl = 6))
+	query = Scrape('AGP', 'HAM', date)
+	scrape.result_cache.put(query.url[0], df)
+	assert Scrape('AGP', 'HAM', date)._scrape_cached() and not query.live()._scrape_cached(), "Test 1 Failed."
+
+def test_2(tmp_path, monkeypatch):
+	saved = []
+	monkeypatch.setattr(scrape, 'result_cache', ResultCache(str(tmp_path / 'cache.sqlite'), ttl = 6))
+	monkeypatch.setattr(scrape, 'save_results', saved.append)
+	Scrape('AGP', 'HAM', date).live()._store_results('https://www.google.com/travel/flights?q=live', df.copy())
+	Scrape('AGP', 'HAM', date)._store_results('https://www.google.com/travel/flights?q=job', df.copy())
+	assert len(saved) == 1, "Test 2 Failed."
@@ -0,0 +1,50 @@
+import datetime as dt
+import json
+import pandas as pd
+
+from src.google_flight_analysis.master_dataset import MasterDataset
+
+'''
+	Master dataset: merges append partitioned files, small files get compacted in the background, the manifest prunes reads
+'''
+
+def week(n):
+	return pd.DataFrame({
+		'departure_datetime': [dt.datetime(2026, 11, 5 + n, 6, 10), dt.datetime(2026, 12, 5 + n, 9, 30)],
+		'origin': ['AGP', 'GRX'],
+		'destination': ['HAM', 'HAM'],
+		'airline': ['Vueling', 'Iberia'],
+		'price_eur': [64, 171],
+		'num_stops': [0, 1],
+		'travel_time_minutes': [215, 305],
+		'days_left': [18, 18],
+	})
+
+def test_0(tmp_path):
+	master = MasterDataset(str(tmp_path))
+	master.append(week(0))
+	manifest = json.loads((tmp_path / 'manifest.json').read_text())
+	assert sorted(entry['partition'] for entry in manifest['files'].values()) == ['2026-11', '2026-12'], "Test 0 Failed."
+
+def test_1(tmp_path):
+	master = MasterDataset(str(tmp_path), compact_threshold=3)
+	for n in range(3):
+		master.append(week(n))
+	master.wait()
+	assert len(master.manifest['files']) == 2 and master.rows == 6, "Test 1 Failed."
+	assert len(list(tmp_path.glob('departure_month=*/*.parquet'))) == 2, "Test 1 Failed."
+
+def test_2(tmp_path):
+	master = MasterDataset(str(tmp_path))
+	master.append(week(0))
+	master.append(week(1))
+	df = MasterDataset(str(tmp_path)).read(origins=['AGP'], departure_to='2026-11-30')
+	assert len(df) == 2 and set(df['origin']) == {'AGP'}, "Test 2 Failed."
+
+def test_3(tmp_path):
+	master = MasterDataset(str(tmp_path), compact_threshold=2)
+	master.append(week(0))
+	master.append(week(1))
+	df = master.read()  # Small or compacted files, never both
+	master.wait()
+	assert len(df) == 4 and len(master.manifest['files']) == 2 and len(master.read()) == 4, "Test 3 Failed."
@@ -0,0 +1,53 @@
+import datetime as dt
+import json
+
+from src.google_flight_analysis.flight import Flight
+from src.google_flight_analysis.network_capture import parse_calendar_prices, parse_shopping_results
+
+'''
+	GetShoppingResults payloads are parsed into records that Flight.from_record understands
+'''
+
+def leg(org, dest, dep_time, arr_time, dep_date, arr_date, minutes, airline, name = None):
+	leg = [None] * 23
+	leg[3], leg[6], leg[8], leg[10], leg[11], leg[20], leg[21], leg[22] = org, dest, dep_time, arr_time, minutes, dep_date, arr_date, [airline, '123']
+	if name:
+		leg[22] += [None, name]
+	return leg
+
+nonstop = [[None, ['Vueling'], [leg('AGP', 'HAM', [6, 5], [9, 40], [2026, 11, 5], [2026, 11, 5], 215, 'VY')], None, None, None, None, None, None, 215], [[None, 64]]]
+one_stop = [[None, None, [leg('AGP', 'BCN', [22], [23, 30], [2026, 11, 5], [2026, 11, 5], 90, 'VY'),
+						  leg('BCN', 'HAM', [None, 40], [3, 10], [2026, 11, 6], [2026, 11, 6], 150, 'EW', 'Eurowings')]], [[None, 1064]]]
+
+inner = [None, None, [[nonstop]], [[one_stop]]]
+body = ")]}'\n\n123\n" + json.dumps([['wrb.fr', None, json.dumps(inner)]]) + "\n25\n[[\"di\",42]]\n"
+
+def test_0():
+	records = parse_shopping_results(body)
+	assert len(records) == 2, "Test 0 Failed."
+
+def test_1():
+	record = parse_shopping_results(body)[0]
+	assert record['stops'] == 'Nonstop' and record['travel_time'] == '3 hr 35 min' and record['price'] == '64', "Test 1 Failed."
+
+def test_2():
+	flight = Flight.from_record('2026-11-05', parse_shopping_results(body)[1])
+	assert flight.time_leave == dt.datetime(2026, 11, 5, 22, 0) and flight.time_arrive == dt.datetime(2026, 11, 6, 3, 10), "Test 2 Failed."
+	assert flight.stops == '1 hr 10 min BCN' and flight.airline == 'Vueling, Eurowings' and flight.num_stops == 1, "Test 2 Failed."
+
+def test_3():
+	assert parse_shopping_results(")]}'\nnot json") == [], "Test 3 Failed."
+
+def test_4():
+	days = [['2026-11-05', None, [[None, 64]]], ['2026-11-06', None, [[None, 120]]], ['2026-11-07', None, None]]
+	chunk = lambda days: json.dumps([['wrb.fr', None, json.dumps([None, days])]])
+	calendar = ")]}'\n\n50\n" + chunk(days[:2]) + "\n50\n" + chunk(days[2:] + [['2026-11-06', None, [[None, 99]]]]) + "\n"
+	assert parse_calendar_prices(calendar) == {'2026-11-05': 64, '2026-11-06': 99}, "Test 4 Failed."
+	assert parse_calendar_prices(")]}'\nnot json") == {}, "Test 4 Failed."
+
+def test_5():
+	tight = [[None, None, [leg('AGP', 'BCN', [22], [23, 30], [2026, 11, 5], [2026, 11, 5], 90, 'VY'),
+						   leg('BCN', 'HAM', [23, 30], [2, 10], [2026, 11, 5], [2026, 11, 6], 160, 'XX')]], [[None, 99]]]
+	payload = ")]}'\n" + json.dumps([['wrb.fr', None, json.dumps([None, None, [[nonstop]], [[tight]]])]])
+	record = parse_shopping_results(payload)[1]
+	assert record['layover'] == '0 min BCN' and record['airline'] == 'Vueling, XX', "Test 5 Failed."
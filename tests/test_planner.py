@@ -0,0 +1,87 @@
+import pandas as pd
+
+from src.bargain_discovery.planner import QueryPlanner
+
+'''
+	Query planner: overlapping searches are scraped once and fanned out to every request
+'''
+
+class FakeQuery:
+	def __init__(self, origins, dests, date):
+		self.origin, self.dest, self.date = origins, dests, date
+		self.data = pd.DataFrame({
+			'Origin': [o for o in origins for d in dests],
+			'Destination': [d for o in origins for d in dests],
+			'Price': range(len(origins) * len(dests)),
+		})
+		self.filters = {}
+
+	def set_filters(self, **filters):
+		self.filters = filters
+		return self
+
+def make_planner():
+	planner = QueryPlanner()
+	requests = [
+		planner.add(['AGP'], ['HAM'], '2026-11-05'),
+		planner.add(['AGP'], ['HAM', 'BRE'], '2026-11-05'),  # contains the first one
+		planner.add(['GRX'], ['HAM', 'BRE'], '2026-11-05'),  # same destinations as the second one
+		planner.add(['AGP'], ['HAM'], '2026-11-06'),
+		planner.add(['MAD'], ['VIE'], '2026-11-05'),
+	]
+	return planner, requests
+
+def test_0():
+	planner, requests = make_planner()
+	queries = planner.plan(FakeQuery)
+	assert len(queries) == 3, "Test 0 Failed."
+
+def test_1():
+	planner, requests = make_planner()
+	queries = planner.plan(FakeQuery)
+	merged = [q for q in queries if q.date == '2026-11-05' and q.origin == ['AGP', 'GRX']]
+	assert len(merged) == 1 and merged[0].dest == ['BRE', 'HAM'], "Test 1 Failed."
+
+def test_2():
+	planner, requests = make_planner()
+	planner.plan(FakeQuery)
+	data = requests[0].data
+	assert set(zip(data['Origin'], data['Destination'])) == {('AGP', 'HAM')}, "Test 2 Failed."
+
+def test_3():
+	planner, requests = make_planner()
+	planner.plan(FakeQuery)
+	data = requests[2].data
+	assert set(zip(data['Origin'], data['Destination'])) == {('GRX', 'HAM'), ('GRX', 'BRE')}, "Test 3 Failed."
+
+def test_4():
+	planner = QueryPlanner()
+	planner.add(['AGP'], ['HAM'], '2026-11-05', max_price=90, max_duration=300, departure_window=(6, 12))
+	planner.add(['AGP'], ['BRE'], '2026-11-05', max_price=150, max_duration=240, departure_window=(10, 20))
+	planner.add(['GRX'], ['HAM'], '2026-11-06', max_price=90)
+	planner.add(['MAD'], ['VIE'], '2026-11-06')
+	queries = {(q.date, q.origin[0]): q for q in planner.plan(FakeQuery)}
+	assert queries[('2026-11-05', 'AGP')].filters == {'max_price': 150, 'max_duration': 300, 'departure_window': (6, 20)}, "Test 4 Failed."
+	assert queries[('2026-11-06', 'GRX')].filters == {'max_price': 90} and queries[('2026-11-06', 'MAD')].filters == {}, "Test 4 Failed."
+
+class FakeCalendar(FakeQuery):
+	prices = {'2026-11-05': 60, '2026-11-06': 200}
+
+	def calendar(self, date_to):
+		self.date_to = date_to
+		self.data = pd.DataFrame({'Date': list(self.prices), 'Price': list(self.prices.values())})
+		return self
+
+def test_5():
+	planner = QueryPlanner()
+	planner.add(['AGP'], ['HAM'], '2026-11-05', max_price=90)
+	planner.add(['AGP'], ['HAM'], '2026-11-06', max_price=90)
+	planner.add(['AGP'], ['HAM'], '2026-11-07', max_price=90)  # not in the calendar
+	planner.add(['AGP'], ['HAM'], '2027-02-01', max_price=90)
+	calendars = planner.calendars(FakeCalendar)
+	assert [(q.date, q.date_to) for q in calendars] == [('2026-11-05', '2026-12-30'), ('2027-02-01', '2027-03-28')], "Test 5 Failed."
+	assert planner.prescreen() == 1 and [r.date[0] for r in planner.requests] == ['2026-11-05', '2026-11-07', '2027-02-01'], "Test 5 Failed."
+
+def test_6():
+	# Only the price is pushed: find_bargains checks durations on local times, Google on the true flight duration
+	assert QueryPlanner.search_filters(price_threshold=900) == {'max_price': 810}, "Test 6 Failed."
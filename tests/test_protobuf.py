@@ -0,0 +1,42 @@
+import base64
+
+import src.google_flight_analysis.protobuf.schema_pb2 as PB
+from src.google_flight_analysis.protobuf.protobuf_construc import FlightData, Passengers, TFSData
+
+'''
+	TFS builder: filters are encoded in the query, unfiltered queries keep their previous encoding
+'''
+
+def tfs(max_price=None, **filters):
+	flight_data = [FlightData(date='2026-11-05', from_airport=['AGP', 'GRX'], to_airport=['HAM'], max_stops=2, **filters)]
+	data = TFSData.from_interface(
+		explore_mode=False, flight_data=flight_data, trip='one-way', passengers=Passengers(adults=1), seat='economy',
+		max_price=max_price
+	)
+	return PB.Info.FromString(base64.b64decode(data.as_b64()))
+
+def test_0():
+	info = tfs()
+	assert not info.HasField('price_limit') and not info.data[0].HasField('time_window'), "Test 0 Failed."
+	assert not info.data[0].HasField('max_duration') and not info.data[0].airlines, "Test 0 Failed."
+	assert tfs().SerializeToString() == base64.b64decode('CBwQAhopEgoyMDI2LTExLTA1KAJqBwgBEgNBR1BqBwgBEgNHUlhyBwgBEgNIQU1AAUgBcAGYAQI='), "Test 0 Failed."
+
+def test_1():
+	info = tfs(max_price=180, max_duration=300, airlines=['FR', 'VY'], departure_window=(6, 14), arrival_window=(10, 24))
+	data = info.data[0]
+	assert info.price_limit.max_price == 180 and data.max_duration == 300 and list(data.airlines) == ['FR', 'VY'], "Test 1 Failed."
+	assert (data.time_window.earliest_departure, data.time_window.latest_departure) == (6, 14), "Test 1 Failed."
+	assert (data.time_window.earliest_arrival, data.time_window.latest_arrival) == (10, 24), "Test 1 Failed."
+	assert data.max_stops == 2 and [a.airport for a in data.from_flight] == ['AGP', 'GRX'], "Test 1 Failed."
+
+def test_2():
+	flight_data = [
+		FlightData(date='2026-11-05', from_airport=['AGP'], to_airport=['HAM'], max_stops=2),
+		FlightData(date='2026-11-08', from_airport=['HAM'], to_airport=['AGP'], max_stops=2),
+	]
+	data = TFSData.from_interface(
+		explore_mode=False, flight_data=flight_data, trip='round-trip', passengers=Passengers(adults=1), seat='economy'
+	)
+	info = PB.Info.FromString(base64.b64decode(data.as_b64()))
+	assert info.trip == PB.Trip.ROUND_TRIP and [d.date for d in info.data] == ['2026-11-05', '2026-11-08'], "Test 2 Failed."
+	assert [(d.from_flight[0].airport, d.to_flight[0].airport) for d in info.data] == [('AGP', 'HAM'), ('HAM', 'AGP')], "Test 2 Failed."
@@ -0,0 +1,30 @@
+from selenium.common.exceptions import WebDriverException
+
+from src.google_flight_analysis.readiness import wait_until_ready, RESULTS
+
+'''
+	Readiness: one async script call per wait, with a None state when the script can't run
+'''
+
+class FakeDriver:
+	def __init__(self, result = None, error = None):
+		self.result, self.error = result, error
+		self.calls = []
+
+	def set_script_timeout(self, timeout):
+		self.script_timeout = timeout
+
+	def execute_async_script(self, script, *args):
+		self.calls.append(args)
+		if self.error:
+			raise self.error
+		return self.result
+
+def test_0():
+	driver = FakeDriver({'state': RESULTS, 'ms': 850, 'count': 12})
+	ready = wait_until_ready(driver, 'li.pIav2d', timeout = 10, quiet = 0.3)
+	assert ready['state'] == RESULTS and driver.calls == [('li.pIav2d', 10000, 300)] and driver.script_timeout == 15, "Test 0 Failed."
+
+def test_1():
+	driver = FakeDriver(error = WebDriverException('script timeout'))
+	assert wait_until_ready(driver, 'div.tsAU4e')['state'] is None, "Test 1 Failed."
@@ -0,0 +1,36 @@
+from src.google_flight_analysis.resource_policy import ResourcePolicy
+
+'''
+	Resource policy: blocked URL patterns applied through CDP and per-page transfer stats
+'''
+
+class FakeDriver:
+	def __init__(self, stats = None):
+		self.commands = []
+		self.stats = stats or {}
+
+	def execute_cdp_cmd(self, cmd, params):
+		self.commands.append((cmd, params))
+		return {}
+
+	def execute_script(self, script):
+		return self.stats
+
+def test_0():
+	policy = ResourcePolicy(['*.png', '*fonts.gstatic.com*', '*/maps/vt*'], allowed = ['https://www.gstatic.com/flights/logo.png'])
+	driver = FakeDriver()
+	assert policy.apply(driver), "Test 0 Failed."
+	assert driver.commands[-1] == ('Network.setBlockedURLs', {'urls': ['*fonts.gstatic.com*', '*/maps/vt*']}), "Test 0 Failed."
+
+def test_1():
+	policy = ResourcePolicy(['*.png'], enabled = False)
+	driver = FakeDriver({'bytes': 1000})
+	assert not policy.apply(driver) and not driver.commands, "Test 1 Failed."
+	assert policy.measure(driver)['bytes'] == 1000 and policy.summary()['pages'] == 1, "Test 1 Failed."
+
+def test_2():
+	policy = ResourcePolicy(['*.png'])
+	policy.measure(FakeDriver({'bytes': 300000, 'requests': 40, 'load_ms': 1200}), 'url1')
+	policy.measure(FakeDriver({'bytes': 100000, 'requests': 20, 'load_ms': 800}), 'url2')
+	assert policy.summary(reset = True) == {'pages': 2, 'bytes': 400000, 'mean_bytes': 200000, 'mean_load_ms': 1000}, "Test 2 Failed."
+	assert policy.summary()['pages'] == 0, "Test 2 Failed."
@@ -0,0 +1,68 @@
+import datetime as dt
+import os
+import pandas as pd
+
+from src.google_flight_analysis import analysis
+from src.google_flight_analysis.dedup_index import DedupIndex
+from src.google_flight_analysis.results_store import ResultsStore
+
+'''
+	Results store: appends only write new rows, partitioned by search date and route
+'''
+
+df = pd.DataFrame({
+	'departure_datetime': [dt.datetime(2026, 11, 5, 6, 10), dt.datetime(2026, 11, 5, 9, 30)],
+	'origin': ['AGP', 'GRX'],
+	'destination': ['HAM', 'HAM'],
+	'airline': ['Vueling', 'Iberia'],
+	'price_eur': [64, 171],
+	'num_stops': [0, 1],
+	'travel_time_minutes': [215, 305],
+	'days_left': [18, 18],
+})
+
+def test_0(tmp_path):
+	store = ResultsStore(str(tmp_path))
+	store.append(df, search_date='2026-10-18')
+	assert os.path.isdir(tmp_path / 'search_date=2026-10-18' / 'route=AGP-HAM'), "Test 0 Failed."
+	assert len(store.read()) == 2, "Test 0 Failed."
+
+def test_1(tmp_path):
+	store = ResultsStore(str(tmp_path))
+	store.append(df, search_date='2026-10-18')
+	new = store.append(df.assign(price_eur=[70, 171]), search_date='2026-10-18')
+	assert new.empty and len(store.read()) == 2, "Test 1 Failed."
+
+def test_2(tmp_path):
+	ResultsStore(str(tmp_path)).append(df.iloc[:1], search_date='2026-10-18')
+	new = ResultsStore(str(tmp_path)).append(df, search_date='2026-10-18')  # Keys reloaded from disk
+	assert list(new['origin']) == ['GRX'], "Test 2 Failed."
+
+def test_3(tmp_path):
+	store = ResultsStore(str(tmp_path))
+	store.append(df, search_date='2026-10-18')
+	store.append(df.assign(days_left=[17, 17]), search_date='2026-10-19')
+	assert len(store.read()) == 4 and len(pd.read_csv(tmp_path / 'preview.csv')) == 2, "Test 3 Failed."
+
+def test_4(tmp_path):
+	index = DedupIndex(str(tmp_path / 'index.bin'))
+	index.add(df.iloc[:1])
+	reloaded = DedupIndex(str(tmp_path / 'index.bin'))
+	assert list(reloaded.new_rows(pd.concat([df, df]))) == [False, True, False, False], "Test 4 Failed."
+
+def test_5(tmp_path):
+	index = DedupIndex(str(tmp_path / 'index.bin'))
+	index.add(df)
+	index.rebuild(df.iloc[1:])
+	assert len(index) == 1 and len(DedupIndex(str(tmp_path / 'index.bin'))) == 1, "Test 5 Failed."
+
+def test_6(tmp_path, monkeypatch):
+	monkeypatch.setattr(analysis, 'results_store', ResultsStore(str(tmp_path)))
+	analysis.save_results(pd.DataFrame({
+		'Departure datetime': [dt.datetime(2026, 11, 5, 6, 10), dt.datetime(2026, 11, 5, 9, 30)],
+		'Origin': ['AGP', 'GRX'], 'Destination': ['HAM', 'HAM'], 'Airline(s)': ['Vueling', 'Iberia'],
+		'Travel_Time': pd.to_timedelta(['3h35min', '5h5min']), 'Price': [64, 171], 'Num_Stops': pd.array([0, 1], dtype='Int8'),
+		'Search Date': ['2026-10-18', '2026-10-18'], 'Price (€)': pd.array([64, None], dtype='Int32'),
+	}))
+	# Flights without a converted price are saved too
+	assert len(analysis.results_store.read()) == 2, "Test 6 Failed."
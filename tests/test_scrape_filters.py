@@ -0,0 +1,30 @@
+import datetime as dt
+import pandas as pd
+
+from src.google_flight_analysis.scrape import Scrape
+
+'''
+	Query filters: only the verified tfs fields are pushed into the URL by default, the others filter the results
+'''
+
+date = (dt.date.today() + dt.timedelta(days=30)).isoformat()
+
+def flight(departure, price, hours, stops=0):
+	departure = pd.Timestamp(f'{date} {departure}')
+	return {
+		'Departure datetime': departure, 'Arrival datetime': departure + pd.Timedelta(hours=hours),
+		'Travel_Time': pd.Timedelta(hours=hours), 'Price': price, 'Num_Stops': stops,
+	}
+
+def test_0():
+	filtered = Scrape('AGP', 'HAM', date).set_filters(max_price=100, max_duration=300, departure_window=(6, 12))
+	assert filtered.url == Scrape('AGP', 'HAM', date).url and not filtered._pushed_filters(), "Test 0 Failed."
+
+def test_1():
+	filtered = Scrape('AGP', 'HAM', date).set_filters(max_stops=0, max_price=100)
+	assert 'tfs=' in filtered.url[0] and filtered._pushed_filters() == {'max_stops': 0}, "Test 1 Failed."
+
+def test_2():
+	query = Scrape('AGP', 'HAM', date).set_filters(max_price=100, max_duration=300, departure_window=(6, 12))
+	df = pd.DataFrame([flight('08:00', 90, 3), flight('08:00', 150, 3), flight('09:00', 90, 6), flight('13:30', 50, 2), flight('12:45', 80, 5)])
+	assert query._apply_filters(df)['Price'].tolist() == [90, 80], "Test 2 Failed."